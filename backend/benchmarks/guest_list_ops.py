@@ -0,0 +1,67 @@
+"""Guest list write latency as the list grows.
+
+Compares toggling one guest through the whole-document PUT path
+(create_or_update_guest_list) with the granular update_guest path.
+Run from backend/ against a disposable database:
+
+    MONGO_URL=mongodb://localhost:27017 DB_NAME=hallbook_bench \\
+        python -m benchmarks.guest_list_ops --sizes 100 1000 5000 20000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from database import Database
+from models import Guest, GuestList, GuestUpdate
+
+
+def _guests(count: int):
+    return [
+        Guest(name=f"Guest {i}", relation="Family", phone=f"+91 9{i:09d}", category="Family")
+        for i in range(count)
+    ]
+
+
+async def _timed(operation, repeats: int):
+    samples = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        await operation(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+async def run(sizes, repeats: int):
+    db = Database(os.environ["MONGO_URL"], os.environ.get("DB_NAME", "hallbook_bench"))
+    await db.ensure_indexes()
+    print(f"{'guests':>8} {'PUT p50 ms':>11} {'PUT max ms':>11} {'PATCH p50 ms':>13} {'PATCH max ms':>13}")
+    try:
+        for size in sizes:
+            user_id = f"bench-guests-{size}"
+            guest_list = GuestList(user_id=user_id, guests=_guests(size))
+            await db.guest_lists.delete_many({"user_id": user_id})
+            await db.create_or_update_guest_list(guest_list)
+            target = guest_list.guests[size // 2]
+
+            async def whole_document(i):
+                target.confirmed = bool(i % 2)
+                await db.create_or_update_guest_list(GuestList(**guest_list.dict()))
+
+            async def granular(i):
+                await db.update_guest(user_id, target.id, GuestUpdate(confirmed=bool(i % 2)))
+
+            put_p50, put_max = await _timed(whole_document, repeats)
+            patch_p50, patch_max = await _timed(granular, repeats)
+            print(f"{size:>8} {put_p50:>11.2f} {put_max:>11.2f} {patch_p50:>13.2f} {patch_max:>13.2f}")
+            await db.guest_lists.delete_many({"user_id": user_id})
+    finally:
+        await db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000, 20000])
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.repeats))
@@ -0,0 +1,512 @@
+"""Load test: seed a synthetic dataset and drive every /api route with concurrent clients.
+
+Each endpoint scenario runs on its own for --requests requests spread over
+--concurrency workers. The report gives p50/p95/p99 latency and throughput
+per endpoint, and --baseline compares the run against a stored result file,
+exiting non-zero when an endpoint regresses beyond --threshold. Run from
+backend/:
+
+    # in-process app against a local mongod
+    MONGO_URL=mongodb://localhost:27017 DB_NAME=hallbook_bench \\
+        python -m benchmarks.load --venues 100000 --output results.json
+
+    # in-process app against the in-memory Motor stand-in (mongomock-motor)
+    python -m benchmarks.load --mongo memory --venues 2000 --requests 100
+
+    # a running server; seeding drops and refills its database, here hallbook_bench
+    python -m benchmarks.load --url http://localhost:8001 --bench-db hallbook_bench --baseline baseline.json
+
+The in-memory stand-in lacks $geoNear, $setIntersection and arrayFilters, so
+the geo, text-search and bulk guest update scenarios report errors there.
+benchmarks/baselines/memory.json is a stored run of the in-memory example
+above. Latencies depend on the machine, so compare against it only with the
+same settings on comparable hardware, and record a new baseline otherwise.
+The server-sent events stream is not benchmarked, since it never completes.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+from pagination import ASCENDING, encode_cursor
+from seed_data import DEFAULT_BATCH_SIZE, Scale, SyntheticDataset, seed_synthetic
+
+DEFAULT_THRESHOLD = 0.2
+# Database seeded when DB_NAME is unset; seeding drops its collections first
+BENCH_DB_NAME = "hallbook_bench"
+
+
+class Scenario(NamedTuple):
+    name: str
+    method: str
+    # (context, request number) -> (path, request kwargs)
+    build: Callable[["Context", int], Tuple[str, Dict[str, Any]]]
+    expect: Tuple[int, ...] = (200,)
+    write: bool = False
+
+
+class Context:
+    """Picks existing ids from the seeded dataset, deterministically per request"""
+
+    def __init__(self, dataset: SyntheticDataset):
+        self.dataset = dataset
+        self.scale = dataset.scale
+        self.etags: Dict[str, str] = {}
+        self.run_id = int(time.time())
+
+    def venue_id(self, i: int) -> str:
+        return self.dataset.id("venue", (i * 7919) % self.scale.venues)
+
+    def user_id(self, i: int) -> str:
+        return self.dataset.id("user", (i * 104729) % self.scale.users)
+
+    def guest_list_owner(self, i: int) -> int:
+        return i % max(1, min(self.scale.guest_lists, self.scale.users))
+
+    def ticket_id(self, i: int) -> str:
+        return self.dataset.id("ticket", i % max(1, self.scale.tickets))
+
+
+def _venue_body(ctx: Context, i: int) -> Dict[str, Any]:
+    return {
+        "name": f"Bench Hall {ctx.run_id}-{i}",
+        "location": "Gachibowli",
+        "pincode": "500032",
+        "coordinates": {"lat": 17.44, "lng": 78.35},
+        "price": 90000,
+        "capacity": 600,
+        "images": [],
+        "amenities": ["Parking"],
+        "description": "Load test venue",
+        "contact": {"phone": "+91 9000000000", "email": "bench@example.com"},
+    }
+
+
+def _booking_body(ctx: Context, i: int) -> Dict[str, Any]:
+    # Days beyond the seeded range, unique per request, so no booking conflicts
+    day = ctx.dataset.epoch + timedelta(days=20000 + ctx.run_id % 1000 * 1000 + i)
+    return {
+        "user_id": ctx.user_id(i),
+        "venue_id": ctx.venue_id(i),
+        "event_date": day.isoformat(),
+        "guest_count": 300,
+        "services": [],
+    }
+
+
+def _venue_cursor(ctx: Context, i: int) -> str:
+    # Resume a price-ordered listing just after a seeded venue
+    venue = ctx.dataset.venue((i * 7919) % ctx.scale.venues)
+    return encode_cursor("price", ASCENDING, venue["price"], venue["id"])
+
+
+def _replaced_list_owner(ctx: Context, i: int) -> str:
+    # Lists only the PUT and DELETE guest scenarios touch, so the seeded lists
+    # keep the guest ids the other guest scenarios address
+    return f"bench-replace-{ctx.run_id}-{i % 50}"
+
+
+def _replaced_guest_id(ctx: Context, owner: int, n: int) -> str:
+    return f"bench-guest-{ctx.run_id}-{owner}-{n}"
+
+
+def _guest_list_body(ctx: Context, i: int) -> Dict[str, Any]:
+    owner = i % 50
+    return {
+        "user_id": _replaced_list_owner(ctx, i),
+        "guests": [
+            {"id": _replaced_guest_id(ctx, owner, n), "name": f"Bench Guest {n}", "relation": "Family"}
+            for n in range(ctx.scale.guests_per_list)
+        ],
+    }
+
+
+def _timeline_body(ctx: Context, i: int) -> Dict[str, Any]:
+    return {
+        "user_id": ctx.user_id(i),
+        "items": [
+            {
+                "date": (ctx.dataset.epoch + timedelta(days=60 + n)).isoformat(),
+                "time": "10:00",
+                "event": f"Step {n}",
+                "description": "Load test timeline item",
+                "status": "pending",
+            }
+            for n in range(10)
+        ],
+    }
+
+
+def _guest_csv(i: int) -> bytes:
+    rows = "".join(f"Bench Guest {i}-{n},Friend,+91 8{i:04d}{n:05d}\n" for n in range(20))
+    return ("name,relation,phone\n" + rows).encode()
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("GET /api/", "GET", lambda ctx, i: ("/api/", {})),
+    Scenario("GET /api/health", "GET", lambda ctx, i: ("/api/health", {})),
+    Scenario("GET /api/ready", "GET", lambda ctx, i: ("/api/ready", {})),
+    Scenario("GET /api/metrics", "GET", lambda ctx, i: ("/api/metrics", {})),
+    # Venues
+    Scenario("GET /api/venues/", "GET", lambda ctx, i: (f"/api/venues/?page={i % 20 + 1}&per_page=20", {})),
+    Scenario("GET /api/venues/ cursor", "GET", lambda ctx, i: (
+        f"/api/venues/?sort_by=price&per_page=20&cursor={_venue_cursor(ctx, i)}", {}
+    )),
+    Scenario("GET /api/venues/ card", "GET", lambda ctx, i: ("/api/venues/?per_page=50&view=card", {})),
+    Scenario("GET /api/venues/ filtered", "GET", lambda ctx, i: (
+        f"/api/venues/?budget={50000 + i % 20 * 10000}&capacity=300&sort_by=price&per_page=20", {}
+    )),
+    Scenario("GET /api/venues/ search", "GET", lambda ctx, i: (
+        f"/api/venues/?search_query={['gold', 'sri', 'banj', 'royal palace'][i % 4]}&per_page=20", {}
+    )),
+    Scenario("GET /api/venues/ available_on", "GET", lambda ctx, i: (
+        f"/api/venues/?available_on={(ctx.dataset.epoch + timedelta(days=30 + i % 60)).date()}&per_page=20", {}
+    )),
+    Scenario("GET /api/venues/nearby", "GET", lambda ctx, i: ("/api/venues/nearby?lat=17.41&lng=78.44&radius_km=5", {})),
+    Scenario("GET /api/venues/viewport", "GET", lambda ctx, i: (
+        "/api/venues/viewport?south=17.36&west=78.38&north=17.46&east=78.50", {}
+    )),
+    Scenario("GET /api/venues/{id}", "GET", lambda ctx, i: (f"/api/venues/{ctx.venue_id(i)}", {})),
+    Scenario("GET /api/venues/{id} 304", "GET", lambda ctx, i: (
+        f"/api/venues/{ctx.venue_id(0)}", {"headers": {"If-None-Match": ctx.etags.get("venue", "*")}}
+    ), expect=(304,)),
+    Scenario("GET /api/venues/{id}/availability", "GET", lambda ctx, i: (
+        f"/api/venues/{ctx.venue_id(i)}/availability?from=2025-02-01&to=2025-04-30", {}
+    )),
+    Scenario("POST /api/venues/", "POST", lambda ctx, i: ("/api/venues/", {"json": _venue_body(ctx, i)}), write=True),
+    # Users
+    Scenario("GET /api/users/{id}", "GET", lambda ctx, i: (f"/api/users/{ctx.user_id(i)}", {})),
+    Scenario("POST /api/users/", "POST", lambda ctx, i: ("/api/users/", {"json": {
+        "name": f"Bench User {i}", "phone": "+91 9000000001", "email": f"bench{ctx.run_id}-{i}@example.com"
+    }}), write=True),
+    Scenario("PUT /api/users/{id}", "PUT", lambda ctx, i: (
+        f"/api/users/{ctx.user_id(i)}", {"json": {"profile_image": f"https://images.example.com/u/{i}.jpg"}}
+    ), write=True),
+    # Bookings
+    Scenario("GET /api/bookings/user/{id}", "GET", lambda ctx, i: (f"/api/bookings/user/{ctx.user_id(i)}?limit=20", {})),
+    Scenario("GET /api/bookings/{id}", "GET", lambda ctx, i: (
+        f"/api/bookings/{ctx.dataset.id('booking', i % max(1, ctx.scale.bookings))}", {}
+    )),
+    Scenario("POST /api/bookings/", "POST", lambda ctx, i: ("/api/bookings/", {"json": _booking_body(ctx, i)}), write=True),
+    Scenario("PUT /api/bookings/{id}/status", "PUT", lambda ctx, i: (
+        f"/api/bookings/{ctx.dataset.id('booking', i % max(1, ctx.scale.bookings))}/status"
+        f"?status={['confirmed', 'completed'][i % 2]}", {}
+    ), expect=(200, 409), write=True),
+    # Services
+    Scenario("GET /api/services/", "GET", lambda ctx, i: ("/api/services/", {})),
+    Scenario("GET /api/services/ card", "GET", lambda ctx, i: ("/api/services/?view=card", {})),
+    Scenario("POST /api/services/", "POST", lambda ctx, i: ("/api/services/", {"json": {
+        "name": f"Bench Service {ctx.run_id}-{i}", "icon": "star", "providers": []
+    }}), write=True),
+    # Wedding tools
+    Scenario("GET /api/wedding-tools/budget/{id}", "GET", lambda ctx, i: (f"/api/wedding-tools/budget/{ctx.user_id(i)}", {})),
+    Scenario("PUT /api/wedding-tools/budget/{id}", "PUT", lambda ctx, i: (
+        f"/api/wedding-tools/budget/{ctx.user_id(i)}",
+        {"json": {"user_id": ctx.user_id(i), "total_budget": 900000 + i, "categories": [
+            {"name": "Venue", "budgeted": 400000, "spent": 0, "color": "#f00"}
+        ]}}
+    ), write=True),
+    Scenario("GET /api/wedding-tools/guests/{id}", "GET", lambda ctx, i: (
+        f"/api/wedding-tools/guests/{ctx.dataset.id('user', ctx.guest_list_owner(i))}", {}
+    )),
+    Scenario("PUT /api/wedding-tools/guests/{id}", "PUT", lambda ctx, i: (
+        f"/api/wedding-tools/guests/{_replaced_list_owner(ctx, i)}", {"json": _guest_list_body(ctx, i)}
+    ), write=True),
+    Scenario("DELETE /api/wedding-tools/guests/{id}/items/{guest}", "DELETE", lambda ctx, i: (
+        f"/api/wedding-tools/guests/{_replaced_list_owner(ctx, i)}/items/"
+        f"{_replaced_guest_id(ctx, i % 50, i // 50 % max(1, ctx.scale.guests_per_list))}", {}
+    ), expect=(200, 404), write=True),
+    Scenario("POST /api/wedding-tools/guests/{id}/items", "POST", lambda ctx, i: (
+        f"/api/wedding-tools/guests/{ctx.dataset.id('user', ctx.guest_list_owner(i))}/items",
+        {"json": [{"name": f"Bench Guest {i}", "relation": "Friend"}]}
+    ), write=True),
+    Scenario("PATCH /api/wedding-tools/guests/{id}/items/{guest}", "PATCH", lambda ctx, i: (
+        f"/api/wedding-tools/guests/{ctx.dataset.id('user', ctx.guest_list_owner(i))}/items/"
+        f"{ctx.dataset.id(f'guest:{ctx.guest_list_owner(i)}', i % max(1, ctx.scale.guests_per_list))}",
+        {"json": {"confirmed": bool(i % 2)}}
+    ), write=True),
+    Scenario("POST /api/wedding-tools/guests/{id}/bulk-update", "POST", lambda ctx, i: (
+        f"/api/wedding-tools/guests/{ctx.dataset.id('user', ctx.guest_list_owner(i))}/bulk-update",
+        {"json": {"guest_ids": [
+            ctx.dataset.id(f"guest:{ctx.guest_list_owner(i)}", n) for n in range(min(10, ctx.scale.guests_per_list))
+        ], "invited": True}}
+    ), write=True),
+    Scenario("POST /api/wedding-tools/guests/{id}/import", "POST", lambda ctx, i: (
+        f"/api/wedding-tools/guests/bench-import-{ctx.run_id}-{i % 50}/import?format=csv",
+        {"content": _guest_csv(i), "headers": {"Content-Type": "text/csv"}}
+    ), write=True),
+    Scenario("GET /api/wedding-tools/guests/{id}/export", "GET", lambda ctx, i: (
+        f"/api/wedding-tools/guests/{ctx.dataset.id('user', ctx.guest_list_owner(i))}/export?format=csv", {}
+    )),
+    Scenario("GET /api/wedding-tools/timeline/{id}", "GET", lambda ctx, i: (f"/api/wedding-tools/timeline/{ctx.user_id(i)}", {})),
+    Scenario("PUT /api/wedding-tools/timeline/{id}", "PUT", lambda ctx, i: (
+        f"/api/wedding-tools/timeline/{ctx.user_id(i)}", {"json": _timeline_body(ctx, i)}
+    ), write=True),
+    # Support
+    Scenario("POST /api/support/tickets", "POST", lambda ctx, i: ("/api/support/tickets", {"json": {
+        "user_id": ctx.user_id(i), "subject": "Cancellation", "message": "Can I cancel my booking?"
+    }}), write=True),
+    Scenario("POST /api/support/tickets/{id}/messages", "POST", lambda ctx, i: (
+        f"/api/support/tickets/{ctx.ticket_id(i)}/messages",
+        {"json": {"message": f"Follow-up {i}", "sender_type": "user"}}
+    ), write=True),
+    Scenario("GET /api/support/tickets/{id}/messages", "GET", lambda ctx, i: (
+        f"/api/support/tickets/{ctx.ticket_id(i)}/messages?limit=20", {}
+    )),
+    Scenario("GET /api/support/faqs", "GET", lambda ctx, i: ("/api/support/faqs", {})),
+    Scenario("GET /api/support/faqs/search", "GET", lambda ctx, i: (
+        f"/api/support/faqs/search?q={['cancel booking', 'payment methods', 'parking at venue'][i % 3]}", {}
+    )),
+    Scenario("POST /api/support/faqs", "POST", lambda ctx, i: ("/api/support/faqs", {"json": {
+        "question": f"Bench question {ctx.run_id}-{i}?", "answer": "Bench answer.", "order": 1000 + i
+    }}), write=True),
+    # Admin
+    Scenario("GET /api/admin/indexes", "GET", lambda ctx, i: ("/api/admin/indexes", {})),
+    Scenario("GET /api/admin/cache", "GET", lambda ctx, i: ("/api/admin/cache", {})),
+    Scenario("GET /api/admin/realtime", "GET", lambda ctx, i: ("/api/admin/realtime", {})),
+    Scenario("GET /api/admin/slow-queries", "GET", lambda ctx, i: ("/api/admin/slow-queries?limit=20", {})),
+]
+
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted samples"""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+async def run_scenario(client, ctx: Context, scenario: Scenario, requests: int, concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            path, kwargs = scenario.build(ctx, i)
+            started = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, path, **kwargs)
+                await response.aread()
+                status = str(response.status_code)
+                if response.status_code not in scenario.expect:
+                    errors += 1
+            except Exception as e:
+                status = type(e).__name__
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": statuses,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Endpoints whose p95 grew, or throughput fell, by more than threshold; and new errors"""
+    regressions = []
+    for name, base in baseline.get("endpoints", {}).items():
+        current = results["endpoints"].get(name)
+        if current is None:
+            continue
+        if base["p95_ms"] and current["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {base['p95_ms']}ms -> {current['p95_ms']}ms")
+        if base["throughput_rps"] and current["throughput_rps"] < base["throughput_rps"] * (1 - threshold):
+            regressions.append(f"{name}: throughput {base['throughput_rps']} -> {current['throughput_rps']} req/s")
+        if current["errors"] > base.get("errors", 0):
+            regressions.append(f"{name}: errors {base.get('errors', 0)} -> {current['errors']}")
+    return regressions
+
+
+def select_bench_database(bench_db: str, drop: bool, seeding: bool) -> str:
+    """Point DB_NAME at the benchmark database and return its name.
+
+    Seeding drops every application collection first, so it only goes ahead
+    for a database named with --bench-db, one whose name contains "bench",
+    or with an explicit --drop.
+    """
+    if bench_db:
+        os.environ["DB_NAME"] = bench_db
+    db_name = os.environ.setdefault("DB_NAME", BENCH_DB_NAME)
+    if seeding and not (bench_db or drop or "bench" in db_name.lower()):
+        sys.exit(
+            f"Refusing to seed DB_NAME={db_name}: seeding drops its collections. "
+            "Name a benchmark database with --bench-db, pass --drop, or reuse existing data with --skip-seed"
+        )
+    return db_name
+
+
+def _use_memory_mongo():
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        sys.exit("--mongo memory requires mongomock-motor (pip install -r benchmarks/requirements.txt)")
+    import database
+    import motor.motor_asyncio
+    motor.motor_asyncio.AsyncIOMotorClient = AsyncMongoMockClient
+    # database was imported with seed_data, before the patch
+    database.AsyncIOMotorClient = AsyncMongoMockClient
+    os.environ.setdefault("MONGO_URL", "mongodb://in-memory")
+
+
+async def _prime(client, ctx: Context):
+    # Capture a validator so the 304 scenario revalidates a known entity
+    response = await client.get(f"/api/venues/{ctx.venue_id(0)}")
+    if "etag" in response.headers:
+        ctx.etags["venue"] = response.headers["etag"]
+
+
+async def run_scenarios(
+    client,
+    ctx: Context,
+    scenarios: List[Scenario],
+    requests: int,
+    concurrency: int
+) -> Dict[str, Dict[str, Any]]:
+    """Run each scenario in turn, printing a results row per endpoint"""
+    await _prime(client, ctx)
+    endpoints = {}
+    print(f"{'endpoint':<58} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>8} {'err':>5}")
+    for scenario in scenarios:
+        stats = await run_scenario(client, ctx, scenario, requests, concurrency)
+        endpoints[scenario.name] = stats
+        print(
+            f"{scenario.name:<58} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} "
+            f"{stats['p99_ms']:>8.2f} {stats['throughput_rps']:>8.0f} {stats['errors']:>5}"
+        )
+    return endpoints
+
+
+async def run(args) -> Dict[str, Any]:
+    import httpx
+
+    if args.mongo == "memory":
+        _use_memory_mongo()
+    elif "MONGO_URL" not in os.environ:
+        sys.exit("Set MONGO_URL (and DB_NAME) or use --mongo memory")
+    select_bench_database(args.bench_db, args.drop, seeding=args.mongo != "memory" and not args.skip_seed)
+
+    scale = Scale(
+        venues=args.venues,
+        users=args.users or args.venues,
+        bookings=args.bookings or args.venues,
+        guest_lists=args.guest_lists,
+        guests_per_list=args.guests_per_list,
+        tickets=args.tickets,
+    )
+    dataset = SyntheticDataset(scale, seed=args.seed)
+
+    # httpx logs every request at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    ctx = Context(dataset)
+    scenarios = [
+        s for s in SCENARIOS
+        if (not args.read_only or not s.write) and (not args.only or any(f in s.name for f in args.only))
+    ]
+    results = {
+        "meta": {
+            "target": args.url or "in-process",
+            "mongo": "memory" if args.mongo == "memory" else "mongod",
+            "scale": scale._asdict(),
+            "seed": args.seed,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+            "started_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        },
+        "endpoints": {},
+    }
+
+    if args.url:
+        if not args.skip_seed:
+            from database import database_from_env
+            db = database_from_env()
+            try:
+                await seed_synthetic(db, dataset, batch_size=args.batch_size, drop=True)
+            finally:
+                await db.close()
+        async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+            results["endpoints"] = await run_scenarios(client, ctx, scenarios, args.requests, args.concurrency)
+        return results
+
+    import server
+    # Seed through the app's own Database: the in-memory stand-in is per client
+    async with server.app.router.lifespan_context(server.app):
+        db = server.app.state.db
+        if not args.skip_seed:
+            await seed_synthetic(db, dataset, batch_size=args.batch_size, drop=True)
+            # The lifespan indexed FAQs before the dataset was loaded
+            await db.build_faq_index()
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=args.timeout) as client:
+            results["endpoints"] = await run_scenarios(client, ctx, scenarios, args.requests, args.concurrency)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--mongo", choices=["mongod", "memory"], default="mongod",
+                        help="mongod uses MONGO_URL; memory uses the mongomock-motor stand-in (in-process only)")
+    parser.add_argument("--venues", type=int, default=1000, help="Venues to seed (1k to 1M)")
+    parser.add_argument("--users", type=int, help="Users to seed (default: same as venues)")
+    parser.add_argument("--bookings", type=int, help="Bookings to seed (default: same as venues)")
+    parser.add_argument("--guest-lists", type=int, default=100)
+    parser.add_argument("--guests-per-list", type=int, default=100)
+    parser.add_argument("--tickets", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic dataset")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Documents per insert_many")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the data from a previous run with the same seed")
+    parser.add_argument("--bench-db", help="Database to seed and benchmark, overriding DB_NAME")
+    parser.add_argument("--drop", action="store_true",
+                        help="Allow seeding to drop the collections of a DB_NAME without \"bench\" in its name")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients per endpoint")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--read-only", action="store_true", help="Skip scenarios that write")
+    parser.add_argument("--only", nargs="+", help="Run only scenarios whose name contains one of these")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against a previous --output file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed relative regression in p95 and throughput (default 0.2)")
+    args = parser.parse_args()
+    if args.url and args.mongo == "memory":
+        parser.error("--mongo memory only works with the in-process app")
+
+    results = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"results written to {args.output}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print("Regressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Response serialization throughput per route payload.
+
+Compares the legacy path (APIResponse/PaginatedResponse built from .dict()
+data, then FastAPI's response_model validation and jsonable_encoder) with
+the orjson envelope used by the routes now, and for services with the
+pre-serialized cache path. No database is needed. Run from backend/:
+
+    python -m benchmarks.serialization --venues 50 --services 8 --providers 6
+"""
+import argparse
+import asyncio
+import time
+import orjson
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from cache import dump_json
+from models import (
+    APIResponse, ContactInfo, Coordinates, PaginatedResponse, Service, ServiceProvider, Venue
+)
+from serialization import envelope, json_envelope, paginated_envelope
+
+
+def _venues(count: int):
+    return [
+        Venue(
+            name=f"Venue {i}",
+            location="Banjara Hills",
+            pincode="500034",
+            coordinates=Coordinates(lat=17.41 + i / 1000, lng=78.44),
+            price=50000.0 + i * 1000,
+            capacity=300 + i,
+            rating=4.5,
+            reviews=120,
+            images=[f"https://images.example.com/venue-{i}-{n}.jpg" for n in range(3)],
+            amenities=["Air Conditioning", "Parking", "Sound System", "Stage"],
+            description="Spacious hall for weddings and receptions with in-house decor.",
+            contact=ContactInfo(phone="+91 9876543210", email=f"venue{i}@example.com")
+        )
+        for i in range(count)
+    ]
+
+
+def _services(count: int, providers: int):
+    return [
+        Service(
+            name=f"Service {i}",
+            icon="utensils",
+            providers=[
+                ServiceProvider(
+                    name=f"Provider {i}-{p}",
+                    rating=4.2,
+                    price_range="₹500-₹1500 per plate",
+                    speciality="Hyderabadi cuisine",
+                    services=["Buffet", "Live counters", "Desserts"],
+                    contact=ContactInfo(phone="+91 9876543210", email=f"p{i}{p}@example.com")
+                )
+                for p in range(providers)
+            ]
+        )
+        for i in range(count)
+    ]
+
+
+async def _legacy(field, content):
+    # What FastAPI does for a route declaring response_model and returning a model
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+async def _ops_per_second(render, seconds: float) -> float:
+    count = 0
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    while time.perf_counter() < deadline:
+        await render()
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+async def run(args):
+    venues = _venues(args.venues)
+    services = _services(args.services, args.providers)
+    services_json = dump_json(services)
+    paginated_field = create_response_field(name="paginated", type_=PaginatedResponse)
+    api_field = create_response_field(name="api", type_=APIResponse)
+
+    async def venues_legacy():
+        return await _legacy(paginated_field, PaginatedResponse(
+            success=True,
+            message="Venues retrieved successfully",
+            data=[venue.model_dump() for venue in venues],
+            total=len(venues),
+            per_page=len(venues),
+            total_pages=1
+        ))
+
+    async def venues_envelope():
+        return paginated_envelope(
+            "Venues retrieved successfully", venues, total=len(venues), per_page=len(venues)
+        ).body
+
+    async def services_legacy():
+        return await _legacy(api_field, APIResponse(
+            success=True,
+            message="Services retrieved successfully",
+            data=[service.model_dump() for service in services]
+        ))
+
+    async def services_envelope():
+        return envelope("Services retrieved successfully", services).body
+
+    async def services_cached():
+        return json_envelope("Services retrieved successfully", services_json).body
+
+    # Every path must produce the same document
+    assert orjson.loads(await venues_legacy()) == orjson.loads(await venues_envelope())
+    assert orjson.loads(await services_legacy()) == orjson.loads(await services_envelope())
+    cases = [
+        (f"GET /api/venues/ ({args.venues} venues)", venues_legacy, venues_envelope, None),
+        (
+            f"GET /api/services/ ({args.services}x{args.providers} providers)",
+            services_legacy,
+            services_envelope,
+            services_cached
+        ),
+    ]
+
+    print(f"{'route':<44} {'legacy/s':>10} {'orjson/s':>10} {'speedup':>8} {'cached/s':>10}")
+    for name, legacy, fast, cached in cases:
+        legacy_rate = await _ops_per_second(legacy, args.seconds)
+        fast_rate = await _ops_per_second(fast, args.seconds)
+        cached_rate = f"{await _ops_per_second(cached, args.seconds):>10.0f}" if cached else f"{'-':>10}"
+        print(f"{name:<44} {legacy_rate:>10.0f} {fast_rate:>10.0f} {fast_rate / legacy_rate:>7.1f}x {cached_rate}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--venues", type=int, default=50, help="Venues per listing page")
+    parser.add_argument("--services", type=int, default=8, help="Services in the catalog")
+    parser.add_argument("--providers", type=int, default=6, help="Providers per service")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Measurement time per case")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
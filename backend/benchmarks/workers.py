@@ -0,0 +1,256 @@
+"""Throughput scaling with server worker count.
+
+For each --workers value this starts the API with that many worker processes,
+waits for /api/ready, then drives a read-mostly request mix from several
+client processes for --duration seconds and records throughput and latency
+percentiles. Needs a real mongod (MONGO_URL, DB_NAME), since every worker
+opens its own connection pool. Run from backend/:
+
+    MONGO_URL=mongodb://localhost:27017 DB_NAME=hallbook_bench \\
+        python -m benchmarks.workers --workers 1 2 4 8 --venues 10000
+
+    # gunicorn with the app preloaded in the master before forking
+    python -m benchmarks.workers --server gunicorn --workers 1 2 4
+
+Client processes share the machine with the server; for numbers that are not
+client-bound, give the clients their own cores (--client-processes) or run
+benchmarks.load --url from another host.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+from seed_data import DEFAULT_BATCH_SIZE, Scale, SyntheticDataset, seed_synthetic
+from benchmarks.load import SCENARIOS, Context, percentile, select_bench_database
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Request mix each client cycles through; all reads, so runs are repeatable
+DEFAULT_MIX = [
+    "GET /api/venues/",
+    "GET /api/venues/ card",
+    "GET /api/venues/{id}",
+    "GET /api/venues/{id}/availability",
+    "GET /api/users/{id}",
+    "GET /api/bookings/user/{id}",
+    "GET /api/services/",
+    "GET /api/support/faqs/search",
+    "GET /api/wedding-tools/guests/{id}",
+]
+
+
+def server_command(server: str, workers: int, port: int, graceful_timeout: int) -> List[str]:
+    if server == "gunicorn":
+        return [
+            sys.executable, "-m", "gunicorn", "server:app",
+            "--worker-class", "uvicorn.workers.UvicornWorker",
+            "--workers", str(workers),
+            "--preload",
+            "--bind", f"127.0.0.1:{port}",
+            "--graceful-timeout", str(graceful_timeout),
+            "--log-level", "warning",
+        ]
+    return [
+        sys.executable, "-m", "uvicorn", "server:app",
+        "--host", "127.0.0.1",
+        "--port", str(port),
+        "--workers", str(workers),
+        "--timeout-graceful-shutdown", str(graceful_timeout),
+        "--log-level", "warning",
+    ]
+
+
+async def wait_until_ready(url: str, process: subprocess.Popen, timeout: float) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=url, timeout=2.0) as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"server exited with status {process.returncode} before becoming ready")
+            try:
+                if (await client.get("/api/ready")).status_code == 200:
+                    return
+            except Exception:
+                pass
+            await asyncio.sleep(0.25)
+    raise RuntimeError(f"server not ready after {timeout}s")
+
+
+async def _drive(
+    url: str,
+    scale: Scale,
+    seed: int,
+    mix: List[str],
+    duration: float,
+    concurrency: int,
+    offset: int
+) -> Tuple[int, int, List[float]]:
+    import httpx
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    ctx = Context(SyntheticDataset(scale, seed=seed))
+    scenarios = [scenario for scenario in SCENARIOS if scenario.name in mix]
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(offset, sys.maxsize))
+    deadline = time.perf_counter() + duration
+
+    async def worker(client):
+        nonlocal errors
+        for i in counter:
+            if time.perf_counter() >= deadline:
+                return
+            scenario = scenarios[i % len(scenarios)]
+            path, kwargs = scenario.build(ctx, i)
+            started = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, path, **kwargs)
+                await response.aread()
+                if response.status_code not in scenario.expect:
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=30.0, limits=limits) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return len(latencies), errors, latencies
+
+
+def _drive_process(*args) -> Tuple[int, int, List[float]]:
+    return asyncio.run(_drive(*args))
+
+
+def measure(args, url: str, scale: Scale, mix: List[str]) -> Dict[str, Any]:
+    """Load the server from --client-processes processes at once and merge their samples"""
+    with ProcessPoolExecutor(max_workers=args.client_processes) as pool:
+        started = time.perf_counter()
+        futures = [
+            pool.submit(
+                _drive_process, url, scale, args.seed, mix, args.duration, args.concurrency,
+                n * 1_000_000
+            )
+            for n in range(args.client_processes)
+        ]
+        results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - started
+    requests = sum(count for count, _, _ in results)
+    latencies = sorted(ms for _, _, samples in results for ms in samples)
+    return {
+        "requests": requests,
+        "errors": sum(errors for _, errors, _ in results),
+        "throughput_rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+    }
+
+
+def stop(process: subprocess.Popen, timeout: float) -> None:
+    """SIGTERM, as an orchestrator would, so workers drain and close their clients"""
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+async def seed(scale: Scale, seed_value: int, batch_size: int) -> None:
+    from database import database_from_env
+
+    db = database_from_env()
+    try:
+        await seed_synthetic(db, SyntheticDataset(scale, seed=seed_value), batch_size=batch_size, drop=True)
+    finally:
+        await db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to compare")
+    parser.add_argument("--server", choices=["uvicorn", "gunicorn"], default="uvicorn")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--venues", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic dataset")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the data from a previous run with the same seed")
+    parser.add_argument("--bench-db", help="Database to seed and benchmark, overriding DB_NAME")
+    parser.add_argument("--drop", action="store_true",
+                        help="Allow seeding to drop the collections of a DB_NAME without \"bench\" in its name")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds of load per worker count")
+    parser.add_argument("--client-processes", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent requests per client process")
+    parser.add_argument("--mix", nargs="+", default=DEFAULT_MIX, help="Scenario names from benchmarks.load")
+    parser.add_argument("--ready-timeout", type=float, default=60.0)
+    parser.add_argument("--graceful-timeout", type=int, default=10, help="Server shutdown grace period in seconds")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    if "MONGO_URL" not in os.environ:
+        sys.exit("Set MONGO_URL (and DB_NAME): each worker connects to Mongo on its own")
+    # The workers inherit DB_NAME, so they serve the database that was seeded
+    select_bench_database(args.bench_db, args.drop, seeding=not args.skip_seed)
+    unknown = set(args.mix) - {scenario.name for scenario in SCENARIOS}
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    scale = Scale(venues=args.venues, users=args.venues, bookings=args.venues)
+    if not args.skip_seed:
+        asyncio.run(seed(scale, args.seed, DEFAULT_BATCH_SIZE))
+
+    url = f"http://127.0.0.1:{args.port}"
+    runs = []
+    print(f"{'workers':>7} {'req/s':>9} {'speedup':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7}")
+    for workers in args.workers:
+        process = subprocess.Popen(
+            server_command(args.server, workers, args.port, args.graceful_timeout),
+            cwd=BACKEND_DIR
+        )
+        try:
+            asyncio.run(wait_until_ready(url, process, args.ready_timeout))
+            stats = measure(args, url, scale, args.mix)
+        finally:
+            stop(process, args.graceful_timeout + 5)
+        stats["workers"] = workers
+        runs.append(stats)
+        speedup = stats["throughput_rps"] / runs[0]["throughput_rps"] if runs[0]["throughput_rps"] else 0.0
+        stats["speedup"] = round(speedup, 2)
+        print(
+            f"{workers:>7} {stats['throughput_rps']:>9.0f} {speedup:>7.2f}x {stats['p50_ms']:>8.2f} "
+            f"{stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats['errors']:>7}"
+        )
+
+    if args.output:
+        results = {
+            "meta": {
+                "server": args.server,
+                "cpus": os.cpu_count(),
+                "client_processes": args.client_processes,
+                "concurrency": args.concurrency,
+                "duration": args.duration,
+                "mix": args.mix,
+                "scale": scale._asdict(),
+                "python": platform.python_version(),
+                "started_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            },
+            "runs": runs,
+        }
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
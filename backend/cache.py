@@ -0,0 +1,174 @@
+import os
+import time
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 300
+DEFAULT_MAX_ENTRIES = 1024
+
+
+def dump_json(value) -> bytes:
+    """Serialize a model or list of models to JSON bytes once, for caching"""
+    if isinstance(value, BaseModel):
+        return value.model_dump_json().encode()
+    return b"[" + b",".join(item.model_dump_json().encode() for item in value) + b"]"
+
+
+class CachedJSON(NamedTuple):
+    """Serialized JSON plus the validators HTTP conditional requests need.
+
+    The ETag is a hash of the body, so it only changes when the content does;
+    last_modified is when the body was built (Unix seconds).
+    """
+
+    body: bytes
+    etag: str
+    last_modified: int
+
+    @classmethod
+    def build(cls, body: bytes) -> "CachedJSON":
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        return cls(body, etag, int(time.time()))
+
+    def pack(self) -> bytes:
+        return f"{self.etag} {self.last_modified}\n".encode() + self.body
+
+    @classmethod
+    def unpack(cls, payload: bytes) -> "CachedJSON":
+        header, _, body = payload.partition(b"\n")
+        etag, last_modified = header.decode().split(" ")
+        return cls(body, etag, int(last_modified))
+
+
+class CacheBackend(ABC):
+    """Byte-oriented cache interface shared by the local and shared backends.
+
+    Values are pre-serialized JSON so a hit can be written straight to the
+    response without rebuilding Pydantic models.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        ...
+
+    def _record(self, value: Optional[bytes]) -> Optional[bytes]:
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+class LRUCacheBackend(CacheBackend):
+    """In-process LRU cache with a per-entry TTL"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, default_ttl: float = DEFAULT_TTL_SECONDS):
+        super().__init__()
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return self._record(None)
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            return self._record(None)
+        self._entries.move_to_end(key)
+        return self._record(value)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.default_ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def stats(self) -> Dict[str, float]:
+        stats = super().stats()
+        stats.update({"entries": len(self._entries), "max_entries": self.max_entries})
+        return stats
+
+
+class RedisCacheBackend(CacheBackend):
+    """Shared cache across workers over any client with the redis.asyncio API.
+
+    Evictions and expirations happen inside Redis and are not counted here.
+    """
+
+    def __init__(self, client, default_ttl: float = DEFAULT_TTL_SECONDS, prefix: str = "hallbook:"):
+        super().__init__()
+        self.client = client
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._record(await self.client.get(self.prefix + key))
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        ttl = ttl if ttl is not None else self.default_ttl
+        await self.client.set(self.prefix + key, value, px=int(ttl * 1000))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            self.invalidations += await self.client.delete(*(self.prefix + key for key in keys))
+
+
+def build_cache_backend() -> CacheBackend:
+    """Create the cache backend selected by CACHE_BACKEND (memory or redis)"""
+    backend = os.environ.get("CACHE_BACKEND", "memory").lower()
+    ttl = float(os.environ.get("CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+
+    if backend == "redis":
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+        client = redis.from_url(os.environ.get("REDIS_URL", "redis://localhost:6379/0"))
+        logger.info("Using Redis catalog cache")
+        return RedisCacheBackend(client, default_ttl=ttl)
+
+    max_entries = int(os.environ.get("CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+    return LRUCacheBackend(max_entries=max_entries, default_ttl=ttl)
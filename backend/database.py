@@ -1,28 +1,262 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import date, datetime, timedelta, timezone
+import asyncio
 import os
+import time
+import uuid
 from models import *
+from search import build_search_fields, query_terms, search_filter, relevance_stage
+from indexes import USER_UNIQUE_INDEXES, apply_indexes, index_drift
+from cache import CacheBackend, CachedJSON, build_cache_backend, dump_json
+from pubsub import PubSubBackend, build_pubsub, ticket_channel
+from faq_index import DEFAULT_AUTO_REPLY_CONFIDENCE, FAQIndex
+from geo import geo_point, viewport_circle, viewport_match
+from documents import Row, from_document, from_documents
+from projections import SERVICE_CARD, Projection
+from serialization import dumps
+from metrics import command_listeners, traced_methods
+from pool import DEFAULT_MAX_POOL_SIZE, PoolStats, client_options_from_env
+from slow_queries import SlowQueryLog, build_slow_query_log
+from pagination import ASCENDING, DESCENDING, decode_cursor, keyset_filter, next_cursor, sort_spec
 
+# Longest window a single availability lookup may cover
+MAX_AVAILABILITY_DAYS = 366
+
+class BookingConflictError(ValueError):
+    """The venue is already reserved for the requested day"""
+
+class VersionConflictError(ValueError):
+    """An optimistic-concurrency write was based on a stale version"""
+
+# Venues are in Hyderabad, so a reservation's day is the India calendar day
+EVENT_TIMEZONE = timezone(timedelta(hours=5, minutes=30), "IST")
+
+def event_day(event_date: datetime) -> str:
+    """The calendar day an event falls on in EVENT_TIMEZONE.
+
+    Naive datetimes are UTC, which is how Mongo stores and returns them, so a
+    booking gets the same day from the client's aware value at creation and
+    from the stored value on reactivation or backfill.
+    """
+    if event_date.tzinfo is None:
+        event_date = event_date.replace(tzinfo=timezone.utc)
+    return event_date.astimezone(EVENT_TIMEZONE).date().isoformat()
+
+# Catalog cache keys
+SERVICES_CACHE_KEY = "services:all"
+SERVICES_CARD_CACHE_KEY = "services:card"
+FAQS_CACHE_KEY = "faqs:all"
+
+def venue_cache_key(venue_id: str) -> str:
+    return f"venue:{venue_id}"
+
+def venue_document(venue: Venue) -> Dict[str, Any]:
+    """A venue as stored: the model plus its search fields and GeoJSON point"""
+    venue_doc = venue.dict()
+    venue_doc.update(build_search_fields(venue.name, venue.location))
+    venue_doc["location_geo"] = geo_point(venue.coordinates.lat, venue.coordinates.lng)
+    return venue_doc
+
+# Venue listing order when neither sort_by nor a relevance search applies
+DEFAULT_VENUE_SORT = "created_at"
+
+# Reads leave out Mongo's _id and the venue fields that exist only to serve
+# search and geo queries, so they are never sent over the wire or decoded
+READ_PROJECTION = {"_id": 0}
+VENUE_PROJECTION = {
+    "_id": 0, "search_terms": 0, "search_name": 0, "search_location": 0, "location_geo": 0
+}
+
+@traced_methods
 class Database:
-    def __init__(self, mongo_url: str, db_name: str):
-        self.client = AsyncIOMotorClient(mongo_url)
+    def __init__(
+        self,
+        mongo_url: str,
+        db_name: str,
+        cache: Optional[CacheBackend] = None,
+        pubsub: Optional[PubSubBackend] = None,
+        slow_queries: Optional[SlowQueryLog] = None
+    ):
+        options = client_options_from_env()
+        self.pool_stats = PoolStats(max_pool_size=options.get("maxPoolSize", DEFAULT_MAX_POOL_SIZE))
+        self.slow_queries = slow_queries or build_slow_query_log()
+        listeners = command_listeners() + [self.pool_stats]
+        if self.slow_queries.enabled:
+            listeners.append(self.slow_queries)
+        self.mongo_url = mongo_url
+        self.client = AsyncIOMotorClient(mongo_url, event_listeners=listeners, **options)
+        # Explains run on their own thread through the underlying synchronous client
+        self.slow_queries.client = getattr(self.client, "delegate", None)
         self.db = self.client[db_name]
+        self.cache = cache or build_cache_backend()
+        self.pubsub = pubsub or build_pubsub()
+        self.faq_index = FAQIndex()
+        self.faq_bot_confidence = float(
+            os.environ.get("FAQ_BOT_MIN_CONFIDENCE", DEFAULT_AUTO_REPLY_CONFIDENCE)
+        )
         
         # Collections
         self.users = self.db.users
         self.venues = self.db.venues
         self.bookings = self.db.bookings
+        self.venue_reservations = self.db.venue_reservations
         self.services = self.db.services
         self.wedding_budgets = self.db.wedding_budgets
         self.guest_lists = self.db.guest_lists
         self.wedding_timelines = self.db.wedding_timelines
         self.support_tickets = self.db.support_tickets
+        self.support_messages = self.db.support_messages
         self.faqs = self.db.faqs
 
-    async def close(self):
+    async def ping(self, timeout: float) -> float:
+        """Round-trip a ping to the primary within timeout seconds; returns milliseconds.
+
+        Raises asyncio.TimeoutError past the deadline, or the driver's error
+        if no primary can be selected.
+        """
+        started = time.perf_counter()
+        await asyncio.wait_for(self.client.admin.command("ping"), timeout)
+        return (time.perf_counter() - started) * 1000
+
+    async def close(self, drain_timeout: float = 0.0):
+        """Release the client, first waiting up to drain_timeout seconds for in-flight commands.
+
+        Commands can outlive their request: a request cancelled at the server's
+        graceful-shutdown deadline leaves its command running on Motor's
+        executor thread until Mongo replies.
+        """
+        await self.pubsub.close()
+        deadline = time.monotonic() + drain_timeout
+        while self.pool_stats.in_use() and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        self.slow_queries.close()
         self.client.close()
 
+    async def _update_and_return(
+        self,
+        collection,
+        query: Dict[str, Any],
+        update: Dict[str, Any],
+        projection: Optional[Dict[str, Any]] = None,
+        upsert: bool = False,
+        array_filters: Optional[List[Dict[str, Any]]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Apply an update and return the post-update document in one round trip.
+
+        projection limits what comes back, e.g. only the fields the caller
+        changed; _id is always dropped.
+        """
+        return await collection.find_one_and_update(
+            query,
+            update,
+            projection={"_id": 0, **(projection or {})},
+            upsert=upsert,
+            array_filters=array_filters,
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _read_through(self, key: str, load) -> Optional[CachedJSON]:
+        """Return cached JSON for key, loading and caching it on a miss"""
+        payload = await self.cache.get(key)
+        if payload is not None:
+            try:
+                return CachedJSON.unpack(payload)
+            except ValueError:
+                pass  # written by a release that cached bare bodies; rebuild it
+        value = await load()
+        if value is None:
+            return None
+        entry = CachedJSON.build(value if isinstance(value, bytes) else dump_json(value))
+        await self.cache.set(key, entry.pack())
+        return entry
+
+    async def ensure_indexes(self, unique_only: bool = False) -> Dict[str, List[str]]:
+        return await apply_indexes(self.db, unique_only=unique_only)
+
+    async def index_drift(self) -> Dict[str, Dict[str, List[str]]]:
+        return await index_drift(self.db)
+
+    async def archive_duplicate_user_documents(self) -> Dict[str, int]:
+        """Keep the most recently updated planning document per user, archiving the rest.
+
+        Duplicates left by the old find-then-insert saves block the unique
+        user_id indexes that versioned writes depend on. The losing documents
+        are copied to `<collection>_duplicates` before they are removed, so
+        they can be reviewed and merged by hand; rerunning after an
+        interruption finishes the move.
+        """
+        archived = {}
+        for collection_name in USER_UNIQUE_INDEXES:
+            collection = self.db[collection_name]
+            pipeline = [
+                {"$sort": {"updated_at": -1}},
+                {"$group": {"_id": "$user_id", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+                {"$match": {"count": {"$gt": 1}}},
+            ]
+            stale = []
+            async for group in collection.aggregate(pipeline, allowDiskUse=True):
+                stale.extend(group["ids"][1:])
+            if not stale:
+                continue
+            archived_at = datetime.utcnow()
+            stale_docs = await collection.find({"_id": {"$in": stale}}).to_list(length=None)
+            try:
+                await self.db[f"{collection_name}_duplicates"].insert_many(
+                    [{**doc, "archived_at": archived_at} for doc in stale_docs], ordered=False
+                )
+            except BulkWriteError as e:
+                # Archived by an earlier run that stopped before removing them
+                if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+                    raise
+            result = await collection.delete_many({"_id": {"$in": stale}})
+            archived[collection_name] = result.deleted_count
+        return archived
+
+    async def backfill_venue_derived_fields(self) -> int:
+        """Populate search and GeoJSON fields on venues written before they existed"""
+        updated = 0
+        cursor = self.venues.find(
+            {"$or": [{"search_terms": {"$exists": False}}, {"location_geo": {"$exists": False}}]},
+            {"_id": 1, "name": 1, "location": 1, "coordinates": 1}
+        )
+        async for venue_doc in cursor:
+            derived = build_search_fields(venue_doc.get("name", ""), venue_doc.get("location", ""))
+            coordinates = venue_doc.get("coordinates")
+            if coordinates:
+                derived["location_geo"] = geo_point(coordinates["lat"], coordinates["lng"])
+            await self.venues.update_one({"_id": venue_doc["_id"]}, {"$set": derived})
+            updated += 1
+        return updated
+
+    async def backfill_venue_reservations(self) -> Dict[str, int]:
+        """Create day reservations for active bookings that do not hold one.
+
+        Covers bookings made before reservations existed, bookings written by
+        older workers during a rolling deploy, and a backfill that stopped
+        partway. Existing double bookings cannot both hold the day; the later
+        ones are counted as conflicts and left for manual resolution.
+        """
+        claimed = conflicts = 0
+        pipeline = [
+            {"$match": {"status": {"$ne": BookingStatus.CANCELLED}}},
+            {"$project": {"_id": 0, "id": 1, "venue_id": 1, "event_date": 1, "created_at": 1}},
+            {"$lookup": {
+                "from": "venue_reservations", "localField": "id", "foreignField": "booking_id", "as": "reservation"
+            }},
+            {"$match": {"reservation": {"$size": 0}}},
+            {"$sort": {"created_at": 1}},
+        ]
+        async for booking_doc in self.bookings.aggregate(pipeline, allowDiskUse=True):
+            try:
+                await self._claim_reservation(booking_doc["venue_id"], booking_doc["event_date"], booking_doc["id"])
+                claimed += 1
+            except BookingConflictError:
+                conflicts += 1
+        return {"claimed": claimed, "conflicts": conflicts}
+
     # User Operations
     async def create_user(self, user: UserCreate) -> User:
         user_dict = user.dict()
@@ -31,34 +265,30 @@ class Database:
         return user_obj
 
     async def get_user(self, user_id: str) -> Optional[User]:
-        user_doc = await self.users.find_one({"id": user_id})
+        user_doc = await self.users.find_one({"id": user_id}, READ_PROJECTION)
         if user_doc:
-            return User(**user_doc)
+            return from_document(User, user_doc)
         return None
 
     async def update_user(self, user_id: str, user_update: UserUpdate) -> Optional[User]:
         update_data = {k: v for k, v in user_update.dict().items() if v is not None}
         update_data["updated_at"] = datetime.utcnow()
         
-        result = await self.users.update_one(
-            {"id": user_id},
-            {"$set": update_data}
-        )
-        
-        if result.modified_count:
-            return await self.get_user(user_id)
+        user_doc = await self._update_and_return(self.users, {"id": user_id}, {"$set": update_data})
+        if user_doc:
+            return from_document(User, user_doc)
         return None
 
     # Venue Operations
     async def create_venue(self, venue: VenueCreate) -> Venue:
         venue_dict = venue.dict()
         venue_obj = Venue(**venue_dict)
-        await self.venues.insert_one(venue_obj.dict())
+        await self.venues.insert_one(venue_document(venue_obj))
+        await self.cache.delete(venue_cache_key(venue_obj.id))
         return venue_obj
 
-    async def get_venues(self, filters: VenueFilters, skip: int = 0, limit: int = 50) -> List[Venue]:
+    async def _build_venue_query(self, filters: VenueFilters) -> Dict[str, Any]:
         query = {}
-        
         if filters.budget:
             query["price"] = {"$lte": filters.budget}
         if filters.capacity:
@@ -68,40 +298,199 @@ class Database:
         if filters.pincode:
             query["pincode"] = filters.pincode
         if filters.search_query:
-            query["$or"] = [
-                {"name": {"$regex": filters.search_query, "$options": "i"}},
-                {"location": {"$regex": filters.search_query, "$options": "i"}}
+            query.update(search_filter(query_terms(filters.search_query)))
+        if filters.available_on:
+            booked = await self._venues_booked_between(
+                filters.available_on, filters.available_until or filters.available_on
+            )
+            if booked:
+                query["id"] = {"$nin": booked}
+        return query
+
+    async def _venues_booked_between(self, start: date, end: date) -> List[str]:
+        """Ids of venues holding a reservation on any day in [start, end].
+
+        Answered from the (event_day, venue_id) index alone, so the cost tracks
+        the reservations in the window rather than the size of the catalog.
+        """
+        if start == end:
+            day_filter = start.isoformat()
+        else:
+            day_filter = {"$gte": start.isoformat(), "$lte": end.isoformat()}
+        return await self.venue_reservations.distinct("venue_id", {"event_day": day_filter})
+
+    def _venue_page_stages(
+        self,
+        filters: VenueFilters,
+        skip: int,
+        limit: int,
+        sort_by: Optional[str] = None,
+        direction: int = ASCENDING,
+        projection: Optional[Projection] = None
+    ) -> List[Dict[str, Any]]:
+        terms = query_terms(filters.search_query) if filters.search_query else []
+        stages = []
+        if terms and not sort_by:
+            # Rank matches by whole-word hits, best first
+            stages.append(relevance_stage(terms))
+            stages.append({"$sort": {"_score": -1, "rating": -1, "id": 1}})
+        else:
+            stages.append({"$sort": sort_spec(sort_by or DEFAULT_VENUE_SORT, direction)})
+        stages.append({"$skip": skip})
+        stages.append({"$limit": limit})
+        if projection:
+            stages.append(projection.stage())
+        else:
+            stages.append({"$project": {**VENUE_PROJECTION, "_score": 0}})
+        return stages
+
+    async def get_venues_page(
+        self,
+        filters: VenueFilters,
+        skip: int = 0,
+        limit: int = 50,
+        estimate_total: bool = False,
+        sort_by: Optional[str] = None,
+        direction: int = ASCENDING,
+        cursor: Optional[str] = None,
+        projection: Optional[Projection] = None
+    ) -> Tuple[List[Row[Venue]], int, Optional[str]]:
+        """Fetch one page of venues, the total match count and the next-page cursor.
+
+        With a cursor the page is an indexed keyset range scan, so every page
+        costs the same; the count runs concurrently. Offset pages use a single
+        $facet aggregation so the filter is evaluated once in one round trip.
+        With estimate_total, unfiltered listings take the total from collection
+        metadata instead of counting. Relevance-ranked searches (no sort_by)
+        only support offset pages and never return a cursor. A projection
+        limits the returned fields (plus the sort field the cursor needs).
+        """
+        query = await self._build_venue_query(filters)
+        relevance = bool(filters.search_query and query_terms(filters.search_query)) and not sort_by
+        sort_field = sort_by or DEFAULT_VENUE_SORT
+        # Fetch one extra row to learn whether another page exists
+        fetch = limit if relevance else limit + 1
+        if projection and not relevance:
+            projection = projection.including(sort_field)
+
+        def count_total():
+            if estimate_total and not query:
+                return self.venues.estimated_document_count()
+            return self.venues.count_documents(query)
+
+        if cursor is not None:
+            if relevance:
+                raise ValueError("Cursor pagination requires sort_by when searching")
+            position = decode_cursor(cursor, sort_field, direction)
+            after = keyset_filter(sort_field, direction, position["value"], position["id"])
+            page_query = {"$and": [query, after]} if query else after
+            find_cursor = self.venues.find(page_query, projection.find() if projection else VENUE_PROJECTION).sort(
+                list(sort_spec(sort_field, direction).items())
+            ).limit(fetch)
+            venue_docs, total = await asyncio.gather(find_cursor.to_list(length=fetch), count_total())
+        elif estimate_total and not query:
+            pipeline = [{"$match": query}] + self._venue_page_stages(
+                filters, skip, fetch, sort_by, direction, projection
+            )
+            venue_docs, total = await asyncio.gather(
+                self.venues.aggregate(pipeline).to_list(length=fetch), count_total()
+            )
+        else:
+            pipeline = [
+                {"$match": query},
+                {"$facet": {
+                    "items": self._venue_page_stages(filters, skip, fetch, sort_by, direction, projection),
+                    "total": [{"$count": "count"}]
+                }}
             ]
+            result = await self.venues.aggregate(pipeline).to_list(length=1)
+            facet = result[0] if result else {"items": [], "total": []}
+            venue_docs = facet["items"]
+            total = facet["total"][0]["count"] if facet["total"] else 0
 
-        cursor = self.venues.find(query).skip(skip).limit(limit)
-        venues = []
-        async for venue_doc in cursor:
-            venues.append(Venue(**venue_doc))
-        return venues
+        cursor_out = None if relevance else next_cursor(venue_docs, limit, sort_field, direction)
+        venues = from_documents(Venue, venue_docs, partial=projection is not None)
+        return venues, total, cursor_out
 
-    async def get_venue(self, venue_id: str) -> Optional[Venue]:
-        venue_doc = await self.venues.find_one({"id": venue_id})
+    async def get_venues_nearby(
+        self,
+        lat: float,
+        lng: float,
+        radius_km: float,
+        filters: VenueFilters,
+        limit: int = 100,
+        projection: Optional[Projection] = None
+    ) -> List[Row[VenueWithDistance]]:
+        """Venues within radius_km of a point, nearest first, via the 2dsphere index"""
+        pipeline = [
+            {"$geoNear": {
+                "near": geo_point(lat, lng),
+                "key": "location_geo",
+                "distanceField": "distance_m",
+                "maxDistance": radius_km * 1000,
+                "spherical": True,
+                "query": await self._build_venue_query(filters)
+            }},
+            {"$limit": limit},
+            projection.including("distance_m").stage() if projection else {"$project": VENUE_PROJECTION}
+        ]
+        return await self._venues_with_distance(pipeline, partial=projection is not None)
+
+    async def get_venues_in_viewport(
+        self,
+        south: float,
+        west: float,
+        north: float,
+        east: float,
+        filters: VenueFilters,
+        limit: int = 100,
+        projection: Optional[Projection] = None
+    ) -> List[Row[VenueWithDistance]]:
+        """Venues inside a map viewport, nearest to its centre first.
+
+        $geoNear is bounded to the circle enclosing the box so it stays on the
+        index; the exact box test then drops the corners outside the viewport.
+        """
+        center_lat, center_lng, radius_m = viewport_circle(south, west, north, east)
+        pipeline = [
+            {"$geoNear": {
+                "near": geo_point(center_lat, center_lng),
+                "key": "location_geo",
+                "distanceField": "distance_m",
+                "maxDistance": radius_m,
+                "spherical": True,
+                "query": await self._build_venue_query(filters)
+            }},
+            {"$match": viewport_match(south, west, north, east)},
+            {"$limit": limit},
+            projection.including("distance_m").stage() if projection else {"$project": VENUE_PROJECTION}
+        ]
+        return await self._venues_with_distance(pipeline, partial=projection is not None)
+
+    async def _venues_with_distance(
+        self,
+        pipeline: List[Dict[str, Any]],
+        partial: bool = False
+    ) -> List[Row[VenueWithDistance]]:
+        venue_docs = await self.venues.aggregate(pipeline).to_list(length=None)
+        for venue_doc in venue_docs:
+            venue_doc["distance_km"] = round(venue_doc.pop("distance_m") / 1000, 3)
+        return from_documents(VenueWithDistance, venue_docs, partial=partial)
+
+    async def _load_venue(self, venue_id: str) -> Optional[Venue]:
+        venue_doc = await self.venues.find_one({"id": venue_id}, VENUE_PROJECTION)
         if venue_doc:
-            return Venue(**venue_doc)
+            return from_document(Venue, venue_doc)
         return None
 
-    async def get_venues_count(self, filters: VenueFilters) -> int:
-        query = {}
-        if filters.budget:
-            query["price"] = {"$lte": filters.budget}
-        if filters.capacity:
-            query["capacity"] = {"$gte": filters.capacity}
-        if filters.availability:
-            query["availability"] = filters.availability
-        if filters.pincode:
-            query["pincode"] = filters.pincode
-        if filters.search_query:
-            query["$or"] = [
-                {"name": {"$regex": filters.search_query, "$options": "i"}},
-                {"location": {"$regex": filters.search_query, "$options": "i"}}
-            ]
-        
-        return await self.venues.count_documents(query)
+    async def get_venue_json(self, venue_id: str) -> Optional[CachedJSON]:
+        return await self._read_through(venue_cache_key(venue_id), lambda: self._load_venue(venue_id))
+
+    async def get_venue(self, venue_id: str) -> Optional[Venue]:
+        entry = await self.get_venue_json(venue_id)
+        if entry:
+            return Venue.model_validate_json(entry.body)
+        return None
 
     # Booking Operations
     async def create_booking(self, booking: BookingCreate) -> Booking:
@@ -123,106 +512,372 @@ class Database:
         })
         
         booking_obj = Booking(**booking_dict)
-        await self.bookings.insert_one(booking_obj.dict())
+        # Claim the day first; the unique index rejects a concurrent double booking
+        await self._claim_reservation(booking_obj.venue_id, booking_obj.event_date, booking_obj.id)
+        try:
+            await self.bookings.insert_one(booking_obj.dict())
+        except Exception:
+            await self._release_reservation(booking_obj.id)
+            raise
         return booking_obj
 
-    async def get_user_bookings(self, user_id: str) -> List[Booking]:
-        cursor = self.bookings.find({"user_id": user_id}).sort("created_at", -1)
-        bookings = []
-        async for booking_doc in cursor:
-            bookings.append(Booking(**booking_doc))
-        return bookings
+    async def _claim_reservation(self, venue_id: str, event_date: datetime, booking_id: str):
+        day = event_day(event_date)
+        try:
+            await self.venue_reservations.insert_one({
+                "venue_id": venue_id,
+                "event_day": day,
+                "booking_id": booking_id,
+                "created_at": datetime.utcnow()
+            })
+        except DuplicateKeyError:
+            raise BookingConflictError(f"Venue is already booked on {day}")
+
+    async def _release_reservation(self, booking_id: str):
+        await self.venue_reservations.delete_one({"booking_id": booking_id})
+
+    async def get_venue_availability(self, venue_id: str, start: date, end: date) -> VenueAvailability:
+        """Per-day availability for a venue between start and end inclusive.
+
+        Reads only the reservations inside the window through the
+        (venue_id, event_day) index, so the cost is bounded by the days asked for.
+        """
+        days = (end - start).days + 1
+        if days < 1:
+            raise ValueError("'to' must not be before 'from'")
+        if days > MAX_AVAILABILITY_DAYS:
+            raise ValueError(f"Availability window is limited to {MAX_AVAILABILITY_DAYS} days")
+
+        cursor = self.venue_reservations.find(
+            {"venue_id": venue_id, "event_day": {"$gte": start.isoformat(), "$lte": end.isoformat()}},
+            {"_id": 0, "event_day": 1}
+        )
+        bitmap = ["0"] * days
+        async for reservation in cursor:
+            bitmap[(date.fromisoformat(reservation["event_day"]) - start).days] = "1"
+
+        booked_ranges = []
+        for offset, flag in enumerate(bitmap):
+            if flag != "1":
+                continue
+            day = start + timedelta(days=offset)
+            if booked_ranges and booked_ranges[-1][1] == day - timedelta(days=1):
+                booked_ranges[-1][1] = day
+            else:
+                booked_ranges.append([day, day])
+
+        return VenueAvailability(
+            venue_id=venue_id,
+            from_date=start,
+            to_date=end,
+            booked="".join(bitmap),
+            booked_ranges=booked_ranges
+        )
+
+    async def get_user_bookings_page(
+        self,
+        user_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        projection: Optional[Projection] = None
+    ) -> Tuple[List[Row[Booking]], int, Optional[str]]:
+        """Newest-first page of a user's bookings with total and next-page cursor"""
+        query = {"user_id": user_id}
+        page_query = query
+        if cursor is not None:
+            position = decode_cursor(cursor, "created_at", DESCENDING)
+            page_query = {
+                **query,
+                **keyset_filter("created_at", DESCENDING, position["value"], position["id"])
+            }
+
+        fields = projection.including("created_at").find() if projection else READ_PROJECTION
+        find_cursor = self.bookings.find(page_query, fields).sort(
+            list(sort_spec("created_at", DESCENDING).items())
+        ).limit(limit + 1)
+        booking_docs, total = await asyncio.gather(
+            find_cursor.to_list(length=limit + 1),
+            self.bookings.count_documents(query)
+        )
+
+        cursor_out = next_cursor(booking_docs, limit, "created_at", DESCENDING)
+        bookings = from_documents(Booking, booking_docs, partial=projection is not None)
+        return bookings, total, cursor_out
 
     async def get_booking(self, booking_id: str) -> Optional[Booking]:
-        booking_doc = await self.bookings.find_one({"id": booking_id})
+        booking_doc = await self.bookings.find_one({"id": booking_id}, READ_PROJECTION)
         if booking_doc:
-            return Booking(**booking_doc)
+            return from_document(Booking, booking_doc)
         return None
 
     async def update_booking_status(self, booking_id: str, status: BookingStatus) -> Optional[Booking]:
-        result = await self.bookings.update_one(
-            {"id": booking_id},
-            {"$set": {"status": status, "updated_at": datetime.utcnow()}}
-        )
-        
-        if result.modified_count:
-            return await self.get_booking(booking_id)
+        update = {"$set": {"status": status, "updated_at": datetime.utcnow()}}
+
+        if status == BookingStatus.CANCELLED:
+            booking_doc = await self._update_and_return(self.bookings, {"id": booking_id}, update)
+            if booking_doc:
+                await self._release_reservation(booking_id)
+        else:
+            booking_doc = await self._update_and_return(
+                self.bookings,
+                {"id": booking_id, "status": {"$ne": BookingStatus.CANCELLED}},
+                update
+            )
+            if booking_doc is None:
+                # Missing, or cancelled: reactivation must win the day back first
+                current = await self.bookings.find_one(
+                    {"id": booking_id},
+                    {"_id": 0, "venue_id": 1, "event_date": 1}
+                )
+                if not current:
+                    return None
+                await self._claim_reservation(current["venue_id"], current["event_date"], booking_id)
+                booking_doc = await self._update_and_return(self.bookings, {"id": booking_id}, update)
+
+        if booking_doc:
+            return from_document(Booking, booking_doc)
         return None
 
     # Service Operations
-    async def get_services(self) -> List[Service]:
-        cursor = self.services.find({})
+    async def _load_services(self) -> List[Service]:
+        cursor = self.services.find({}, READ_PROJECTION)
         services = []
         async for service_doc in cursor:
-            services.append(Service(**service_doc))
+            services.append(from_document(Service, service_doc))
         return services
 
+    async def _load_services_projected(self, projection: Projection) -> bytes:
+        return dumps(await self.services.find({}, projection.find()).to_list(length=None))
+
+    async def get_services_json(self, projection: Optional[Projection] = None) -> CachedJSON:
+        """Serialized service catalog; the full list and the card view are cached"""
+        if projection is None:
+            return await self._read_through(SERVICES_CACHE_KEY, self._load_services)
+        if projection is SERVICE_CARD:
+            return await self._read_through(
+                SERVICES_CARD_CACHE_KEY, lambda: self._load_services_projected(projection)
+            )
+        return CachedJSON.build(await self._load_services_projected(projection))
+
+    async def get_services(self) -> List[Service]:
+        return ServiceList.validate_json((await self.get_services_json()).body)
+
     async def create_service(self, service: Service) -> Service:
         await self.services.insert_one(service.dict())
+        await self.cache.delete(SERVICES_CACHE_KEY, SERVICES_CARD_CACHE_KEY)
         return service
 
     # Wedding Planning Operations
+    async def _upsert_user_document(
+        self,
+        collection,
+        model: BaseModel,
+        expected_version: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Atomically create or replace a user's single planning document.
+
+        One upsert keyed on the unique user_id index replaces the old
+        find-then-insert/update pair. Every write bumps `version`; when
+        expected_version is given the write only applies to that version, and
+        a stale one surfaces as VersionConflictError instead of a lost update.
+        Documents saved before versioning have no `version` and read back as
+        0, so expected version 0 also matches a missing field.
+        """
+        doc = model.dict()
+        fields = {k: v for k, v in doc.items() if k not in ("id", "user_id", "created_at", "version")}
+        fields["updated_at"] = datetime.utcnow()
+        update = {
+            "$set": fields,
+            "$setOnInsert": {"id": doc["id"], "created_at": doc["created_at"]},
+            "$inc": {"version": 1}
+        }
+
+        query = {"user_id": model.user_id}
+        if expected_version == 0:
+            query["version"] = {"$in": [0, None]}
+        elif expected_version is not None:
+            query["version"] = expected_version
+
+        for attempt in range(2):
+            try:
+                return await self._update_and_return(collection, query, update, upsert=True)
+            except DuplicateKeyError:
+                # With a version check the document exists at another version.
+                # Without one, a concurrent first save won the insert: retry as an update.
+                if expected_version is not None or attempt:
+                    raise VersionConflictError(
+                        f"Document was modified concurrently; expected version {expected_version}"
+                    )
+
     async def get_user_wedding_budget(self, user_id: str) -> Optional[WeddingBudget]:
-        budget_doc = await self.wedding_budgets.find_one({"user_id": user_id})
+        budget_doc = await self.wedding_budgets.find_one({"user_id": user_id}, READ_PROJECTION)
         if budget_doc:
-            return WeddingBudget(**budget_doc)
+            return from_document(WeddingBudget, budget_doc)
         return None
 
-    async def create_or_update_wedding_budget(self, budget: WeddingBudget) -> WeddingBudget:
-        existing = await self.get_user_wedding_budget(budget.user_id)
-        
-        if existing:
-            budget.updated_at = datetime.utcnow()
-            await self.wedding_budgets.update_one(
-                {"user_id": budget.user_id},
-                {"$set": budget.dict()}
-            )
-        else:
-            await self.wedding_budgets.insert_one(budget.dict())
-        
-        return budget
+    async def create_or_update_wedding_budget(
+        self,
+        budget: WeddingBudget,
+        expected_version: Optional[int] = None
+    ) -> WeddingBudget:
+        budget_doc = await self._upsert_user_document(self.wedding_budgets, budget, expected_version)
+        return from_document(WeddingBudget, budget_doc)
 
     async def get_user_guest_list(self, user_id: str) -> Optional[GuestList]:
-        guest_list_doc = await self.guest_lists.find_one({"user_id": user_id})
+        guest_list_doc = await self.guest_lists.find_one({"user_id": user_id}, READ_PROJECTION)
         if guest_list_doc:
-            return GuestList(**guest_list_doc)
+            return from_document(GuestList, guest_list_doc)
         return None
 
-    async def create_or_update_guest_list(self, guest_list: GuestList) -> GuestList:
-        existing = await self.get_user_guest_list(guest_list.user_id)
-        
-        if existing:
-            guest_list.updated_at = datetime.utcnow()
-            await self.guest_lists.update_one(
-                {"user_id": guest_list.user_id},
-                {"$set": guest_list.dict()}
-            )
-        else:
-            await self.guest_lists.insert_one(guest_list.dict())
-        
-        return guest_list
+    async def create_or_update_guest_list(
+        self,
+        guest_list: GuestList,
+        expected_version: Optional[int] = None
+    ) -> GuestList:
+        guest_list_doc = await self._upsert_user_document(self.guest_lists, guest_list, expected_version)
+        return from_document(GuestList, guest_list_doc)
+
+    # Guest operations touch only the affected array elements, so payload and
+    # write size scale with the guests changed rather than the list length.
+    async def add_guests(self, user_id: str, guests: List[Guest]) -> List[Guest]:
+        update = {
+            "$push": {"guests": {"$each": [guest.dict() for guest in guests]}},
+            "$set": {"updated_at": datetime.utcnow()},
+            "$inc": {"version": 1},
+            "$setOnInsert": {"id": str(uuid.uuid4()), "created_at": datetime.utcnow()}
+        }
+        try:
+            await self.guest_lists.update_one({"user_id": user_id}, update, upsert=True)
+        except DuplicateKeyError:
+            # A concurrent first write created the list; append to it instead
+            await self.guest_lists.update_one({"user_id": user_id}, update)
+        return guests
+
+    async def update_guest(self, user_id: str, guest_id: str, guest_update: GuestUpdate) -> Optional[Guest]:
+        fields = {k: v for k, v in guest_update.dict().items() if v is not None}
+        if not fields:
+            raise ValueError("No guest fields to update")
+
+        update = {f"guests.$.{k}": v for k, v in fields.items()}
+        update["updated_at"] = datetime.utcnow()
+        guest_list_doc = await self._update_and_return(
+            self.guest_lists,
+            {"user_id": user_id, "guests.id": guest_id},
+            {"$set": update, "$inc": {"version": 1}},
+            projection={"guests": {"$elemMatch": {"id": guest_id}}}
+        )
+        if guest_list_doc and guest_list_doc.get("guests"):
+            return from_document(Guest, guest_list_doc["guests"][0])
+        return None
+
+    async def remove_guest(self, user_id: str, guest_id: str) -> bool:
+        result = await self.guest_lists.update_one(
+            {"user_id": user_id, "guests.id": guest_id},
+            {
+                "$pull": {"guests": {"id": guest_id}},
+                "$set": {"updated_at": datetime.utcnow()},
+                "$inc": {"version": 1}
+            }
+        )
+        return result.modified_count > 0
+
+    async def bulk_update_guests(self, user_id: str, bulk_update: GuestBulkUpdate) -> bool:
+        """Set invited/confirmed on many guests in one array-filtered update"""
+        fields = {
+            k: v for k, v in bulk_update.dict(exclude={"guest_ids"}).items() if v is not None
+        }
+        if not fields or not bulk_update.guest_ids:
+            raise ValueError("Nothing to update")
+
+        update = {f"guests.$[g].{k}": v for k, v in fields.items()}
+        update["updated_at"] = datetime.utcnow()
+        result = await self.guest_lists.update_one(
+            {"user_id": user_id},
+            {"$set": update, "$inc": {"version": 1}},
+            array_filters=[{"g.id": {"$in": bulk_update.guest_ids}}]
+        )
+        return result.matched_count > 0
+
+    async def get_guest_phones(self, user_id: str) -> List[Dict[str, str]]:
+        """Id and phone of every guest that has a phone, for import dedupe"""
+        pipeline = [
+            {"$match": {"user_id": user_id}},
+            {"$unwind": "$guests"},
+            {"$match": {"guests.phone": {"$nin": [None, ""]}}},
+            {"$project": {"_id": 0, "id": "$guests.id", "phone": "$guests.phone"}}
+        ]
+        return await self.guest_lists.aggregate(pipeline).to_list(length=None)
+
+    async def apply_guest_import_batch(
+        self,
+        user_id: str,
+        new_guests: List[Guest],
+        updates: List[Tuple[str, Guest]]
+    ):
+        """Write one import chunk: append new guests, merge rows matching existing ones"""
+        now = datetime.utcnow()
+        operations = []
+        if new_guests:
+            operations.append(UpdateOne(
+                {"user_id": user_id},
+                {
+                    "$push": {"guests": {"$each": [guest.dict() for guest in new_guests]}},
+                    "$set": {"updated_at": now},
+                    "$setOnInsert": {"id": str(uuid.uuid4()), "created_at": now}
+                },
+                upsert=True
+            ))
+        for guest_id, guest in updates:
+            fields = {
+                f"guests.$[g].{k}": v for k, v in guest.dict(exclude_unset=True).items() if k != "id"
+            }
+            if fields:
+                operations.append(UpdateOne(
+                    {"user_id": user_id},
+                    {"$set": fields},
+                    array_filters=[{"g.id": guest_id}]
+                ))
+        if operations:
+            operations.append(UpdateOne({"user_id": user_id}, {"$inc": {"version": 1}}))
+            await self.guest_lists.bulk_write(operations, ordered=True)
+
+    async def iter_guest_batches(self, user_id: str, batch_size: int = 500):
+        """Yield a user's guests as plain dicts, batch_size at a time, without loading the list"""
+        pipeline = [
+            {"$match": {"user_id": user_id}},
+            {"$unwind": "$guests"},
+            {"$replaceRoot": {"newRoot": "$guests"}}
+        ]
+        cursor = self.guest_lists.aggregate(pipeline, batchSize=batch_size)
+        batch = []
+        async for guest_doc in cursor:
+            batch.append(guest_doc)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
 
     async def get_user_wedding_timeline(self, user_id: str) -> Optional[WeddingTimeline]:
-        timeline_doc = await self.wedding_timelines.find_one({"user_id": user_id})
+        timeline_doc = await self.wedding_timelines.find_one({"user_id": user_id}, READ_PROJECTION)
         if timeline_doc:
-            return WeddingTimeline(**timeline_doc)
+            return from_document(WeddingTimeline, timeline_doc)
         return None
 
-    async def create_or_update_wedding_timeline(self, timeline: WeddingTimeline) -> WeddingTimeline:
-        existing = await self.get_user_wedding_timeline(timeline.user_id)
-        
-        if existing:
-            timeline.updated_at = datetime.utcnow()
-            await self.wedding_timelines.update_one(
-                {"user_id": timeline.user_id},
-                {"$set": timeline.dict()}
-            )
-        else:
-            await self.wedding_timelines.insert_one(timeline.dict())
-        
-        return timeline
+    async def create_or_update_wedding_timeline(
+        self,
+        timeline: WeddingTimeline,
+        expected_version: Optional[int] = None
+    ) -> WeddingTimeline:
+        timeline_doc = await self._upsert_user_document(self.wedding_timelines, timeline, expected_version)
+        return from_document(WeddingTimeline, timeline_doc)
 
     # Support Operations
+    # Messages live in support_messages, one document each, indexed by
+    # (ticket_id, seq); tickets only keep counters so appends stay O(1).
+    # seq comes from the ticket's last_seq counter rather than the timestamp,
+    # which Mongo truncates to the millisecond: a bot reply stored with the
+    # question it answers would otherwise tie with it.
     async def create_support_ticket(self, ticket: SupportTicketCreate) -> SupportTicket:
         # Create initial message
         initial_message = ChatMessage(
@@ -231,46 +886,220 @@ class Database:
             sender_type="user"
         )
         
+        messages = [initial_message]
+
+        # Answer straight away when an FAQ clearly covers the question
+        faq = self.faq_index.best_answer(
+            f"{ticket.subject} {ticket.message}", min_confidence=self.faq_bot_confidence
+        )
+        if faq:
+            messages.append(ChatMessage(message=faq.answer, sender_type="bot"))
+        for seq, message in enumerate(messages, start=1):
+            message.seq = seq
+
         support_ticket = SupportTicket(
             user_id=ticket.user_id,
             subject=ticket.subject,
-            messages=[initial_message]
+            message_count=len(messages)
         )
         
-        await self.support_tickets.insert_one(support_ticket.dict())
+        await self.support_tickets.insert_one({**support_ticket.dict(), "last_seq": len(messages)})
+        await self.support_messages.insert_many(
+            [{**message.dict(), "ticket_id": support_ticket.id} for message in messages]
+        )
+        support_ticket.messages = messages
         return support_ticket
 
-    async def add_message_to_ticket(self, ticket_id: str, message: ChatMessage) -> Optional[SupportTicket]:
-        result = await self.support_tickets.update_one(
+    async def add_message_to_ticket(self, ticket_id: str, message: ChatMessage) -> Optional[ChatMessage]:
+        """Append a message and return just that message, not the whole ticket.
+
+        A retried post carrying the same message id returns the stored message
+        instead of failing. The seq is reserved before the insert, so a retry
+        leaves a gap in the numbering but never a wrong message_count.
+        """
+        ticket_doc = await self._update_and_return(
+            self.support_tickets,
             {"id": ticket_id},
+            {"$inc": {"last_seq": 1}},
+            projection={"last_seq": 1}
+        )
+        if not ticket_doc:
+            return None
+
+        message.seq = ticket_doc["last_seq"]
+        try:
+            await self.support_messages.insert_one({**message.dict(), "ticket_id": ticket_id})
+        except DuplicateKeyError:
+            stored = await self.support_messages.find_one(
+                {"id": message.id, "ticket_id": ticket_id}, {"_id": 0, "ticket_id": 0}
+            )
+            if stored is None:
+                # The id belongs to a message on another ticket
+                raise
+            return from_document(ChatMessage, stored)
+
+        await self.support_tickets.update_one(
+            {"id": ticket_id},
+            {"$inc": {"message_count": 1}, "$set": {"updated_at": datetime.utcnow()}}
+        )
+        await self.pubsub.publish(ticket_channel(ticket_id), message.model_dump_json().encode())
+        return message
+
+    async def ticket_exists(self, ticket_id: str) -> bool:
+        return await self.support_tickets.find_one({"id": ticket_id}, {"_id": 1}) is not None
+
+    async def get_ticket_messages(
+        self,
+        ticket_id: str,
+        before: Optional[str] = None,
+        limit: int = 50
+    ) -> Optional[Tuple[List[Row[ChatMessage]], int, Optional[str]]]:
+        """One page of a ticket's history ending just before the `before` cursor.
+
+        Pages walk backwards from the newest message; each page is returned in
+        chronological order along with the message count and the cursor for
+        the next older page. Returns None when the ticket does not exist.
+        """
+        query = {"ticket_id": ticket_id}
+        if before is not None:
+            position = decode_cursor(before, "seq", DESCENDING)
+            query.update(keyset_filter("seq", DESCENDING, position["value"], position["id"]))
+
+        find_cursor = self.support_messages.find(query, {"_id": 0, "ticket_id": 0}).sort(
+            list(sort_spec("seq", DESCENDING).items())
+        ).limit(limit + 1)
+        message_docs, ticket_doc = await asyncio.gather(
+            find_cursor.to_list(length=limit + 1),
+            self.support_tickets.find_one({"id": ticket_id}, {"_id": 0, "message_count": 1})
+        )
+        if not ticket_doc:
+            return None
+
+        cursor_out = next_cursor(message_docs, limit, "seq", DESCENDING)
+        message_docs.reverse()
+        messages = from_documents(ChatMessage, message_docs)
+        return messages, ticket_doc.get("message_count", 0), cursor_out
+
+    async def get_ticket_messages_after(self, ticket_id: str, after_seq: int, limit: int) -> List[ChatMessage]:
+        """Up to limit messages following after_seq, oldest first; replays a reconnecting stream"""
+        cursor = self.support_messages.find(
+            {"ticket_id": ticket_id, "seq": {"$gt": after_seq}}, {"_id": 0, "ticket_id": 0}
+        ).sort([("seq", 1), ("id", 1)]).limit(limit)
+        return [from_document(ChatMessage, message_doc) async for message_doc in cursor]
+
+    async def migrate_embedded_ticket_messages(self) -> int:
+        """Move messages embedded in tickets by older releases into support_messages.
+
+        Safe to rerun, and to run while older workers still append embedded
+        messages: each pass copies the messages not yet copied, numbering them
+        after the ticket's highest seq, then pulls exactly the messages it saw
+        from the ticket and counts them in the same update. A pass that stopped
+        after copying is finished by the next one.
+        """
+        migrated = 0
+        cursor = self.support_tickets.find(
+            {"messages.0": {"$exists": True}},
+            {"_id": 0, "id": 1, "messages": 1}
+        )
+        async for ticket_doc in cursor:
+            migrated += await self._migrate_ticket_messages(ticket_doc["id"], ticket_doc["messages"])
+        return migrated
+
+    async def _migrate_ticket_messages(self, ticket_id: str, embedded: List[Dict[str, Any]]) -> int:
+        message_ids = [message["id"] for message in embedded]
+        copied = set(await self.support_messages.distinct(
+            "id", {"ticket_id": ticket_id, "id": {"$in": message_ids}}
+        ))
+        pending = [message for message in embedded if message["id"] not in copied]
+        if pending:
+            # Continue after any seq already used, including by an interrupted
+            # pass that copied messages before the ticket recorded last_seq
+            newest = await self.support_messages.find_one(
+                {"ticket_id": ticket_id}, {"_id": 0, "seq": 1}, sort=[("seq", -1)]
+            )
+            if newest and newest.get("seq"):
+                await self.support_tickets.update_one({"id": ticket_id}, {"$max": {"last_seq": newest["seq"]}})
+            ticket_doc = await self._update_and_return(
+                self.support_tickets,
+                {"id": ticket_id},
+                {"$inc": {"last_seq": len(pending)}},
+                projection={"last_seq": 1}
+            )
+            first_seq = ticket_doc["last_seq"] - len(pending) + 1
+            try:
+                await self.support_messages.insert_many([
+                    {**message, "ticket_id": ticket_id, "seq": seq}
+                    for seq, message in enumerate(pending, start=first_seq)
+                ], ordered=False)
+            except BulkWriteError as e:
+                # A concurrent pass on another worker copied them first
+                if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+                    raise
+        # Only the pass that still finds every message embedded counts them
+        result = await self.support_tickets.update_one(
+            {"id": ticket_id, "messages.id": {"$all": message_ids}},
             {
-                "$push": {"messages": message.dict()},
-                "$set": {"updated_at": datetime.utcnow()}
+                "$pull": {"messages": {"id": {"$in": message_ids}}},
+                "$inc": {"message_count": len(message_ids)}
             }
         )
-        
-        if result.modified_count:
-            ticket_doc = await self.support_tickets.find_one({"id": ticket_id})
-            if ticket_doc:
-                return SupportTicket(**ticket_doc)
-        return None
+        return len(message_ids) if result.modified_count else 0
 
-    async def get_faqs(self) -> List[FAQ]:
-        cursor = self.faqs.find({}).sort("order", 1)
+    async def backfill_message_seq(self) -> int:
+        """Number the messages of tickets stored before messages carried a seq.
+
+        Messages are ordered by timestamp, with bot replies after the
+        question they tie with; the ticket's last_seq continues from there.
+        """
+        numbered = 0
+        ticket_ids = await self.support_messages.distinct("ticket_id", {"seq": {"$exists": False}})
+        for ticket_id in ticket_ids:
+            message_docs = await self.support_messages.find(
+                {"ticket_id": ticket_id}, {"_id": 1, "timestamp": 1, "sender_type": 1}
+            ).to_list(length=None)
+            message_docs.sort(key=lambda doc: (doc["timestamp"], doc.get("sender_type") == "bot"))
+            await self.support_messages.bulk_write([
+                UpdateOne({"_id": doc["_id"]}, {"$set": {"seq": seq}})
+                for seq, doc in enumerate(message_docs, start=1)
+            ], ordered=False)
+            await self.support_tickets.update_one({"id": ticket_id}, {"$set": {"last_seq": len(message_docs)}})
+            numbered += len(message_docs)
+        return numbered
+
+    async def _load_faqs(self) -> List[FAQ]:
+        cursor = self.faqs.find({}, READ_PROJECTION).sort("order", 1)
         faqs = []
         async for faq_doc in cursor:
-            faqs.append(FAQ(**faq_doc))
+            faqs.append(from_document(FAQ, faq_doc))
         return faqs
 
+    async def get_faqs_json(self) -> CachedJSON:
+        return await self._read_through(FAQS_CACHE_KEY, self._load_faqs)
+
+    async def get_faqs(self) -> List[FAQ]:
+        return FAQList.validate_json((await self.get_faqs_json()).body)
+
     async def create_faq(self, faq: FAQ) -> FAQ:
         await self.faqs.insert_one(faq.dict())
+        await self.cache.delete(FAQS_CACHE_KEY)
+        self.faq_index.add(faq)
         return faq
 
-# Database instance will be initialized in server.py
-db = None
+    async def build_faq_index(self) -> int:
+        """(Re)build the in-memory FAQ search index from the collection"""
+        self.faq_index.build(await self.get_faqs())
+        return len(self.faq_index)
+
+    def search_faqs(self, query: str, limit: int = 5) -> List[FAQMatch]:
+        return [
+            FAQMatch(faq=faq, score=score, confidence=confidence)
+            for faq, score, confidence in self.faq_index.search(query, limit)
+        ]
+
+def database_from_env() -> Database:
+    """A new Database for MONGO_URL / DB_NAME.
 
-def initialize_database():
-    global db
-    if db is None:
-        db = Database(os.environ.get('MONGO_URL'), os.environ.get('DB_NAME'))
-    return db
\ No newline at end of file
+    The Motor client is not fork-safe, so each worker process creates its own
+    from the app lifespan (see server.py) rather than inheriting one.
+    """
+    return Database(os.environ.get('MONGO_URL'), os.environ.get('DB_NAME'))
\ No newline at end of file
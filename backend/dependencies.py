@@ -0,0 +1,10 @@
+from fastapi import Request
+from database import Database
+
+
+async def get_db(request: Request) -> Database:
+    """The worker's Database, created by the app lifespan after the process has forked.
+
+    Async so FastAPI calls it inline instead of hopping to its threadpool.
+    """
+    return request.app.state.db
@@ -0,0 +1,105 @@
+import os
+import inspect
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable, Dict, Generic, List, Optional, Type, TypeVar, Union, get_args, get_origin
+from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# List reads hand out read-only views over the documents this service wrote
+# instead of validated models. Set DB_STRICT_VALIDATION=1 to validate every
+# row, e.g. when debugging data written by another tool or an older release.
+STRICT_VALIDATION = os.environ.get("DB_STRICT_VALIDATION", "").lower() in ("1", "true", "yes")
+
+
+class ReadView(Generic[ModelT]):
+    """Read-only, attribute-style view over a trusted document.
+
+    Costs one slotted object per row; nested models and enums are wrapped
+    lazily on attribute access. The response serializer writes the
+    underlying dict directly, so a listing never builds Pydantic models.
+    """
+
+    __slots__ = ("model", "doc")
+
+    def __init__(self, model: Type[ModelT], doc: Dict[str, Any]):
+        object.__setattr__(self, "model", model)
+        object.__setattr__(self, "doc", doc)
+
+    def __getattr__(self, name: str) -> Any:
+        if name in ReadView.__slots__:
+            # Only reached before __init__ ran, e.g. while copying
+            raise AttributeError(name)
+        fields = _fields(self.model)
+        if name not in fields:
+            raise AttributeError(f"{self.model.__name__} has no field '{name}'")
+        field, convert = fields[name]
+        if name not in self.doc:
+            return field.get_default(call_default_factory=True)
+        value = self.doc[name]
+        return convert(value) if convert is not None else value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self.model.__name__} read views are immutable")
+
+    def __repr__(self) -> str:
+        return f"ReadView[{self.model.__name__}]({self.doc!r})"
+
+    def model_dump(self) -> Dict[str, Any]:
+        return self.doc
+
+    def to_model(self) -> ModelT:
+        return self.model.model_validate(self.doc)
+
+
+# What a list read returns: a read view, or the model under DB_STRICT_VALIDATION.
+# Views only offer attribute access, model_dump() and to_model().
+Row = Union[ModelT, ReadView[ModelT]]
+
+
+def _converter(annotation: Any) -> Optional[Callable[[Any], Any]]:
+    """How to present a raw BSON value as this annotation, or None if it is usable as-is"""
+    origin = get_origin(annotation)
+    if origin is Union:
+        members = [arg for arg in get_args(annotation) if arg is not type(None)]
+        convert = _converter(members[0]) if len(members) == 1 else None
+        if convert is None:
+            return None
+        return lambda value: None if value is None else convert(value)
+    if origin in (list, List):
+        args = get_args(annotation)
+        convert = _converter(args[0]) if args else None
+        if convert is None:
+            return None
+        return lambda value: [convert(item) for item in value]
+    if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+        return lambda value: ReadView(annotation, value) if isinstance(value, dict) else value
+    if inspect.isclass(annotation) and issubclass(annotation, Enum):
+        return lambda value: value if isinstance(value, annotation) else annotation(value)
+    return None
+
+
+@lru_cache(maxsize=None)
+def _fields(model: Type[BaseModel]) -> Dict[str, Any]:
+    return {
+        name: (field, _converter(field.annotation))
+        for name, field in model.model_fields.items()
+    }
+
+
+def from_document(model: Type[ModelT], doc: Dict[str, Any]) -> ModelT:
+    """Single-document reads keep full model semantics; callers may mutate the result"""
+    return model.model_validate(doc)
+
+
+def from_documents(model: Type[ModelT], docs: List[Dict[str, Any]], partial: bool = False) -> List[Row[ModelT]]:
+    """Wrap a page of trusted, projected documents for serialization.
+
+    Returns read views unless DB_STRICT_VALIDATION is set, in which case every
+    row is validated into a model. Partial documents (a field projection) are
+    always returned as views, since they cannot validate as the full model.
+    """
+    if STRICT_VALIDATION and not partial:
+        return [model.model_validate(doc) for doc in docs]
+    return [ReadView(model, doc) for doc in docs]
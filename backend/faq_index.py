@@ -0,0 +1,118 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from models import FAQ
+from search import tokenize
+
+# Standard BM25 saturation and length-normalization parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Question tokens are counted this many times so they outweigh answer text
+QUESTION_WEIGHT = 2
+# Minimum confidence (0-1) for the bot to answer a ticket on its own
+DEFAULT_AUTO_REPLY_CONFIDENCE = 0.5
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by can do does for from how i if in is it me my "
+    "of on or our so that the this to was we what when where which who why will "
+    "with you your".split()
+)
+
+
+def faq_tokens(text: str) -> List[str]:
+    return [token for token in tokenize(text) if token not in STOPWORDS]
+
+
+class FAQIndex:
+    """In-memory BM25 index over the FAQ collection.
+
+    Term counts live in a dense (faqs x vocabulary) NumPy matrix and the BM25
+    weights are precomputed from it, so scoring a query against every FAQ is
+    one column gather and a row sum. The FAQ set is small enough that
+    recomputing the weights on each added FAQ costs well under a millisecond.
+    """
+
+    def __init__(self):
+        self.faqs: List[FAQ] = []
+        self.vocabulary: Dict[str, int] = {}
+        self._counts = np.zeros((0, 0), dtype=np.float32)
+        self._weights = np.zeros((0, 0), dtype=np.float32)
+        self._idf = np.zeros(0, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.faqs)
+
+    def build(self, faqs: List[FAQ]) -> None:
+        self.faqs = []
+        self.vocabulary = {}
+        self._counts = np.zeros((0, 0), dtype=np.float32)
+        for faq in faqs:
+            self._append(faq)
+        self._reweight()
+
+    def add(self, faq: FAQ) -> None:
+        self._append(faq)
+        self._reweight()
+
+    def _append(self, faq: FAQ) -> None:
+        tokens = faq_tokens(faq.question) * QUESTION_WEIGHT + faq_tokens(faq.answer)
+        for token in tokens:
+            self.vocabulary.setdefault(token, len(self.vocabulary))
+
+        rows, cols = self._counts.shape
+        counts = np.zeros((rows + 1, len(self.vocabulary)), dtype=np.float32)
+        counts[:rows, :cols] = self._counts
+        for token in tokens:
+            counts[rows, self.vocabulary[token]] += 1
+        self._counts = counts
+        self.faqs.append(faq)
+
+    def _reweight(self) -> None:
+        n_docs = len(self.faqs)
+        if not n_docs:
+            self._weights = self._counts
+            self._idf = np.zeros(0, dtype=np.float32)
+            return
+        doc_freq = np.count_nonzero(self._counts, axis=0)
+        idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+        lengths = self._counts.sum(axis=1, keepdims=True)
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(float(lengths.mean()), 1.0))
+        tf = self._counts * (BM25_K1 + 1) / (self._counts + norm)
+        self._idf = idf
+        self._weights = (tf * idf).astype(np.float32)
+
+    def search(self, text: str, limit: int = 5) -> List[Tuple[FAQ, float, float]]:
+        """Rank FAQs for a free-text query.
+
+        Returns (faq, bm25_score, confidence) for the best matches with a
+        positive score. Confidence is the score as a fraction of the best
+        score any FAQ could reach for this query, so it is comparable across
+        queries of different lengths.
+        """
+        terms = set(faq_tokens(text))
+        columns = sorted(self.vocabulary[t] for t in terms if t in self.vocabulary)
+        if not columns or not self.faqs:
+            return []
+
+        scores = self._weights[:, columns].sum(axis=1)
+        # Terms no FAQ contains count against confidence at the rarest-term idf
+        unknown_idf = (len(terms) - len(columns)) * float(self._idf.max())
+        ceiling = (float(self._idf[columns].sum()) + unknown_idf) * (BM25_K1 + 1)
+        if ceiling <= 0:
+            return []
+
+        limit = min(limit, len(scores))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [
+            (self.faqs[i], round(float(scores[i]), 4), round(min(float(scores[i]) / ceiling, 1.0), 4))
+            for i in top
+            if scores[i] > 0
+        ]
+
+    def best_answer(self, text: str, min_confidence: float = DEFAULT_AUTO_REPLY_CONFIDENCE) -> Optional[FAQ]:
+        """The top FAQ if it clears the confidence bar, else None"""
+        matches = self.search(text, limit=1)
+        if matches and matches[0][2] >= min_confidence:
+            return matches[0][0]
+        return None
+
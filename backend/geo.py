@@ -0,0 +1,41 @@
+import math
+from typing import Any, Dict, Tuple
+
+EARTH_RADIUS_M = 6371008.8
+
+
+def geo_point(lat: float, lng: float) -> Dict[str, Any]:
+    """GeoJSON point as stored in `location_geo` (GeoJSON orders lng before lat)"""
+    return {"type": "Point", "coordinates": [lng, lat]}
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in metres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def viewport_circle(south: float, west: float, north: float, east: float) -> Tuple[float, float, float]:
+    """Smallest circle around the viewport centre that covers the whole box.
+
+    Returns (center_lat, center_lng, radius_m).
+    """
+    center_lat = (south + north) / 2
+    center_lng = (west + east) / 2
+    radius = max(
+        haversine_m(center_lat, center_lng, lat, lng)
+        for lat in (south, north)
+        for lng in (west, east)
+    )
+    return center_lat, center_lng, radius
+
+
+def viewport_match(south: float, west: float, north: float, east: float) -> Dict[str, Any]:
+    """Exact box test on the stored lat/lng, applied after the indexed $geoNear"""
+    return {
+        "coordinates.lat": {"$gte": south, "$lte": north},
+        "coordinates.lng": {"$gte": west, "$lte": east}
+    }
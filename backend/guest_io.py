@@ -0,0 +1,185 @@
+import codecs
+import csv
+import io
+import json
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from models import Guest, GuestImportReport, GuestImportError
+
+IMPORT_FORMATS = ("csv", "ndjson")
+DEFAULT_CHUNK_SIZE = 500
+# Per-row errors beyond this are counted but not listed
+MAX_REPORTED_ERRORS = 100
+
+EXPORT_FIELDS = ["id", "name", "relation", "phone", "address", "category", "invited", "confirmed"]
+_TRUE_VALUES = {"1", "true", "yes", "y", "x"}
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """Dedupe key for a phone number: its last ten digits"""
+    if not phone:
+        return None
+    digits = re.sub(r"\D", "", phone)
+    return digits[-10:] or None
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode a byte stream into lines without buffering the whole body"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_csv_records(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, Any]]:
+    """Yield (row_number, dict) per CSV record keyed by the lowercased header.
+
+    Quoted fields may span lines; a record is complete once its quotes balance.
+    """
+    header = None
+    record = ""
+    row_number = 0
+    async for line in lines:
+        record = f"{record}\n{line}" if record else line
+        if record.count('"') % 2:
+            continue
+        if not record.strip():
+            record = ""
+            continue
+        values = next(csv.reader([record]))
+        record = ""
+        if header is None:
+            header = [value.strip().lower() for value in values]
+            continue
+        row_number += 1
+        yield row_number, dict(zip(header, (value.strip() for value in values)))
+    if record.strip():
+        row_number += 1
+        yield row_number, ValueError("Unterminated quoted field")
+
+
+async def iter_ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, Any]]:
+    """Yield (row_number, dict) per non-empty NDJSON line, or the parse error"""
+    row_number = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield row_number, ValueError(f"Invalid JSON: {e}")
+            continue
+        if not isinstance(record, dict):
+            yield row_number, ValueError("Each line must be a JSON object")
+            continue
+        yield row_number, record
+
+
+def record_to_guest(record: Dict[str, Any]) -> Guest:
+    """Validate one imported record, accepting spreadsheet-style booleans"""
+    data = {key: value for key, value in record.items() if key in EXPORT_FIELDS and value not in ("", None)}
+    data.pop("id", None)
+    for flag in ("invited", "confirmed"):
+        if isinstance(data.get(flag), str):
+            data[flag] = data[flag].strip().lower() in _TRUE_VALUES
+    return Guest(**data)
+
+
+def _error_message(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors()
+        )
+    return str(error)
+
+
+async def import_guests(
+    db,
+    user_id: str,
+    chunks: AsyncIterator[bytes],
+    file_format: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> GuestImportReport:
+    """Stream-parse an upload and write it to the guest list in batches.
+
+    Rows are validated into Guest objects and flushed every chunk_size rows,
+    so memory is bounded by the chunk rather than the file. Rows whose phone
+    matches an existing guest update that guest; repeats within the upload
+    are skipped as duplicates.
+    """
+    if file_format not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported format '{file_format}'")
+
+    parse = iter_csv_records if file_format == "csv" else iter_ndjson_records
+    existing = {}
+    for guest in await db.get_guest_phones(user_id):
+        phone_key = normalize_phone(guest["phone"])
+        if phone_key:
+            existing.setdefault(phone_key, guest["id"])
+    seen_phones = set()
+    report = GuestImportReport()
+    new_guests: List[Guest] = []
+    updates: List[Tuple[str, Guest]] = []
+
+    async def flush():
+        if new_guests or updates:
+            await db.apply_guest_import_batch(user_id, new_guests, updates)
+            report.imported += len(new_guests)
+            report.updated += len(updates)
+            new_guests.clear()
+            updates.clear()
+
+    async for row_number, record in parse(iter_lines(chunks)):
+        report.received += 1
+        try:
+            if isinstance(record, Exception):
+                raise record
+            guest = record_to_guest(record)
+        except (ValueError, TypeError) as e:
+            report.error_count += 1
+            if len(report.errors) < MAX_REPORTED_ERRORS:
+                report.errors.append(GuestImportError(row=row_number, error=_error_message(e)))
+            continue
+
+        phone_key = normalize_phone(guest.phone)
+        if phone_key:
+            if phone_key in seen_phones:
+                report.duplicates += 1
+                continue
+            seen_phones.add(phone_key)
+
+        if phone_key in existing:
+            updates.append((existing[phone_key], guest))
+        else:
+            new_guests.append(guest)
+
+        if len(new_guests) + len(updates) >= chunk_size:
+            await flush()
+
+    await flush()
+    return report
+
+
+async def export_guests(db, user_id: str, file_format: str) -> AsyncIterator[bytes]:
+    """Stream a guest list as CSV or NDJSON, one cursor batch at a time"""
+    if file_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        yield buffer.getvalue().encode()
+        async for guests in db.iter_guest_batches(user_id):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(guests)
+            yield buffer.getvalue().encode()
+    else:
+        async for guests in db.iter_guest_batches(user_id):
+            yield "".join(json.dumps(guest, default=str) + "\n" for guest in guests).encode()
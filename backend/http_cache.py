@@ -0,0 +1,102 @@
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import Request, Response
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from cache import CachedJSON
+from serialization import json_envelope
+
+# Browsers and CDNs may reuse catalog responses this long before revalidating
+CATALOG_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+# Bodies smaller than this are sent uncompressed
+GZIP_MINIMUM_SIZE = 1024
+
+
+def _etag(entry: CachedJSON) -> str:
+    # Weak: the same entity is served gzipped and identity-encoded
+    return f'W/"{entry.etag}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:]
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in header.split(",")
+    )
+
+
+def _not_modified_since(header: str, last_modified: int) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    return since is not None and last_modified <= since.timestamp()
+
+
+def is_not_modified(request: Request, entry: CachedJSON) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since as RFC 9110 requires"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, _etag(entry))
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        return _not_modified_since(if_modified_since, entry.last_modified)
+    return False
+
+
+def conditional_envelope(
+    request: Request,
+    message: str,
+    entry: CachedJSON,
+    cache_control: str = CATALOG_CACHE_CONTROL
+) -> Response:
+    """APIResponse envelope for cached JSON, or an empty 304 if the client's copy is current"""
+    headers = {
+        "ETag": _etag(entry),
+        "Last-Modified": formatdate(entry.last_modified, usegmt=True),
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+    }
+    if is_not_modified(request, entry):
+        return Response(status_code=304, headers=headers)
+    response = json_envelope(message, entry.body)
+    response.headers.update(headers)
+    return response
+
+
+class _StreamAwareGZipResponder(GZipResponder):
+    """Passes text/event-stream responses through uncompressed"""
+
+    stream = False
+
+    async def send_with_gzip(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            self.stream = content_type.startswith("text/event-stream")
+        if self.stream:
+            await self.send(message)
+        else:
+            await super().send_with_gzip(message)
+
+
+class CompressionMiddleware:
+    """GZip for response bodies, except server-sent event streams.
+
+    Starlette's GZipMiddleware buffers streamed bodies inside the compressor,
+    which would hold back SSE messages and keepalives. Streams are recognised
+    by the response's content type, since clients such as fetch() send
+    Accept: */* rather than text/event-stream.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = GZIP_MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("accept-encoding", ""):
+            responder = _StreamAwareGZipResponder(self.app, self.minimum_size)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
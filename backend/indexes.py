@@ -0,0 +1,151 @@
+import logging
+from typing import Dict, List, Any
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+
+def _id_index(collection: str) -> IndexModel:
+    return IndexModel([("id", ASCENDING)], name=f"{collection}_id", unique=True)
+
+
+# Declarative index registry: collection name -> indexes the application relies on.
+# Index names are part of the contract; drift detection compares by name and keys.
+INDEX_REGISTRY: Dict[str, List[IndexModel]] = {
+    "users": [
+        _id_index("users"),
+    ],
+    "venues": [
+        _id_index("venues"),
+        IndexModel([("search_terms", ASCENDING)], name="venues_search_terms"),
+        IndexModel([("location_geo", GEOSPHERE)], name="venues_location_geo"),
+        # Equality filters first, then the price range (budget filter)
+        IndexModel([("pincode", ASCENDING), ("price", ASCENDING)], name="venues_pincode_price"),
+        IndexModel([("availability", ASCENDING), ("price", ASCENDING)], name="venues_availability_price"),
+        IndexModel([("capacity", ASCENDING), ("price", ASCENDING)], name="venues_capacity_price"),
+        # Keyset pagination orders: sort field plus the id tie-breaker
+        IndexModel([("price", ASCENDING), ("id", ASCENDING)], name="venues_price_id"),
+        IndexModel([("capacity", ASCENDING), ("id", ASCENDING)], name="venues_capacity_id"),
+        IndexModel([("created_at", ASCENDING), ("id", ASCENDING)], name="venues_created_id"),
+    ],
+    "bookings": [
+        _id_index("bookings"),
+        IndexModel(
+            [("user_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="bookings_user_created_id"
+        ),
+    ],
+    "venue_reservations": [
+        # One reservation per venue per day; doubles as the availability range index
+        IndexModel(
+            [("venue_id", ASCENDING), ("event_day", ASCENDING)],
+            name="venue_reservations_venue_day",
+            unique=True
+        ),
+        IndexModel([("booking_id", ASCENDING)], name="venue_reservations_booking"),
+        # Covers "which venues are taken on these days" for the available_on filter
+        IndexModel([("event_day", ASCENDING), ("venue_id", ASCENDING)], name="venue_reservations_day_venue"),
+    ],
+    "services": [
+        _id_index("services"),
+    ],
+    "wedding_budgets": [
+        _id_index("wedding_budgets"),
+        IndexModel([("user_id", ASCENDING)], name="wedding_budgets_user_unique", unique=True),
+    ],
+    "guest_lists": [
+        _id_index("guest_lists"),
+        IndexModel([("user_id", ASCENDING)], name="guest_lists_user_unique", unique=True),
+    ],
+    "wedding_timelines": [
+        _id_index("wedding_timelines"),
+        IndexModel([("user_id", ASCENDING)], name="wedding_timelines_user_unique", unique=True),
+    ],
+    "support_tickets": [
+        _id_index("support_tickets"),
+        IndexModel([("user_id", ASCENDING)], name="support_tickets_user"),
+    ],
+    "support_messages": [
+        _id_index("support_messages"),
+        IndexModel(
+            [("ticket_id", ASCENDING), ("seq", DESCENDING), ("id", DESCENDING)],
+            name="support_messages_ticket_seq"
+        ),
+    ],
+    "faqs": [
+        _id_index("faqs"),
+        IndexModel([("order", ASCENDING)], name="faqs_order"),
+    ],
+}
+
+# Unique user_id indexes the versioned planning-document writes rely on
+USER_UNIQUE_INDEXES = {
+    "wedding_budgets": "wedding_budgets_user_unique",
+    "guest_lists": "guest_lists_user_unique",
+    "wedding_timelines": "wedding_timelines_user_unique",
+}
+
+
+def missing_user_unique(failed: Dict[str, List[str]]) -> List[str]:
+    """The USER_UNIQUE_INDEXES among apply_indexes() failures"""
+    return [
+        name for collection, name in USER_UNIQUE_INDEXES.items()
+        if name in failed.get(collection, ())
+    ]
+
+
+def _key_spec(key: Any) -> List[List[Any]]:
+    return [[field, direction] for field, direction in key.items()]
+
+
+async def apply_indexes(database, unique_only: bool = False) -> Dict[str, List[str]]:
+    """Create every registered index, or only the unique ones; safe to run on each startup.
+
+    Returns the index names that failed to build per collection, e.g. when an
+    index with the same name but different keys already exists.
+    """
+    failures = {}
+    for collection_name, index_models in INDEX_REGISTRY.items():
+        collection = database[collection_name]
+        for index_model in index_models:
+            if unique_only and not index_model.document.get("unique"):
+                continue
+            name = index_model.document["name"]
+            try:
+                await collection.create_indexes([index_model])
+            except OperationFailure as e:
+                logger.error(f"Failed to create index {collection_name}.{name}: {e}")
+                failures.setdefault(collection_name, []).append(name)
+    return failures
+
+
+async def index_drift(database) -> Dict[str, Dict[str, List[str]]]:
+    """Compare the live indexes against the registry.
+
+    Reports registered indexes that are missing (or exist with different keys)
+    and unregistered indexes that exist in the database. Collections without
+    drift are omitted.
+    """
+    report = {}
+    for collection_name, index_models in INDEX_REGISTRY.items():
+        expected = {
+            model.document["name"]: _key_spec(model.document["key"])
+            for model in index_models
+        }
+        live = {}
+        async for index_doc in database[collection_name].list_indexes():
+            if index_doc["name"] == "_id_":
+                continue
+            live[index_doc["name"]] = _key_spec(index_doc["key"])
+
+        missing = sorted(name for name in expected if name not in live)
+        changed = sorted(
+            name for name in expected
+            if name in live and live[name] != expected[name]
+        )
+        extra = sorted(name for name in live if name not in expected)
+
+        if missing or changed or extra:
+            report[collection_name] = {"missing": missing, "changed": changed, "extra": extra}
+    return report
@@ -0,0 +1,334 @@
+import functools
+import inspect
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+from bson import encode as bson_encode
+from pymongo import monitoring
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# METRICS_ENABLED=false removes the middleware and the Mongo listener, so
+# nothing is recorded or paid for beyond setting current_method
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() not in ("0", "false", "no")
+# Sizing a reply means re-encoding it to BSON on the executor thread, which
+# for a full cursor batch costs about as much as decoding it did; opt in with
+# METRICS_REPLY_BYTES=true
+METRICS_REPLY_BYTES = os.environ.get("METRICS_REPLY_BYTES", "false").lower() in ("1", "true", "yes")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans cache hits through slow aggregations
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Label for requests that matched no route, so unknown paths do not create series
+UNMATCHED_ROUTE = "<unmatched>"
+# Label for Mongo commands issued outside any Database method
+UNATTRIBUTED = "<none>"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric(ABC):
+    """A named family of series keyed by label values; safe to update from executor threads"""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    @abstractmethod
+    def render(self) -> List[str]:
+        ...
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}" for labels, value in values
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: Tuple[str, ...] = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: non-cumulative bucket counts (last is +Inf), sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = [(labels, list(counts), total[0]) for labels, (counts, total) in self._series.items()]
+        lines = self.header()
+        for labels, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.register(Gauge(
+    "http_requests_in_flight", "Requests currently being handled"
+))
+HTTP_RESPONSES = REGISTRY.register(Counter(
+    "http_responses_total", "Responses sent, by route template and status", ("method", "route", "status")
+))
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "Time from request start to the last body byte", ("method", "route")
+))
+HTTP_REQUEST_MONGO_DURATION = REGISTRY.register(Histogram(
+    "http_request_mongo_seconds", "Time a request spent waiting on Mongo commands", ("method", "route")
+))
+HTTP_REQUEST_SERIALIZE_DURATION = REGISTRY.register(Histogram(
+    "http_request_serialize_seconds", "Time a request spent encoding JSON responses", ("method", "route")
+))
+MONGO_COMMAND_DURATION = REGISTRY.register(Histogram(
+    "mongo_command_duration_seconds", "Mongo command round trips, by issuing Database method", ("method", "command")
+))
+MONGO_COMMAND_FAILURES = REGISTRY.register(Counter(
+    "mongo_command_failures_total", "Mongo commands that returned an error", ("method", "command")
+))
+MONGO_DOCUMENTS_RETURNED = REGISTRY.register(Counter(
+    "mongo_command_documents_returned_total", "Documents returned in cursor batches and findAndModify replies",
+    ("method", "command")
+))
+MONGO_REPLY_BYTES = REGISTRY.register(Counter(
+    "mongo_command_reply_bytes_total", "BSON size of command replies; only with METRICS_REPLY_BYTES",
+    ("method", "command")
+))
+
+MONGO_POOL_IN_USE = REGISTRY.register(Gauge(
+    "mongo_pool_connections_in_use", "Connections checked out of the Mongo pool"
+))
+MONGO_POOL_WAITERS = REGISTRY.register(Gauge(
+    "mongo_pool_waiters", "Checkouts waiting for a Mongo pool connection"
+))
+MONGO_POOL_CHECKOUT_DURATION = REGISTRY.register(Histogram(
+    "mongo_pool_checkout_seconds", "Time to check a connection out of the Mongo pool"
+))
+MONGO_POOL_CHECKOUT_FAILURES = REGISTRY.register(Counter(
+    "mongo_pool_checkout_failures_total", "Pool checkouts that failed, by reason", ("reason",)
+))
+
+
+class RequestTimings:
+    """Time spent in Mongo and JSON encoding by the current request.
+
+    Motor copies the context into its executor threads, so the listener sees
+    the same instance the middleware created.
+    """
+
+    __slots__ = ("mongo", "serialize")
+
+    def __init__(self):
+        self.mongo = 0.0
+        self.serialize = 0.0
+
+
+# The Database method issuing Mongo commands in this context
+current_method: ContextVar[str] = ContextVar("current_method", default=UNATTRIBUTED)
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("current_timings", default=None)
+
+
+def record_serialization(seconds: float) -> None:
+    timings = current_timings.get()
+    if timings is not None:
+        timings.serialize += seconds
+
+
+def traced_methods(cls):
+    """Class decorator attributing Mongo commands to the public coroutine method that issued them"""
+    for name, attribute in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(attribute):
+            continue
+        setattr(cls, name, _traced(name, attribute))
+    return cls
+
+
+def _traced(name: str, method):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        token = current_method.set(name)
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            current_method.reset(token)
+
+    return wrapper
+
+
+def _documents_returned(reply) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch") or cursor.get("nextBatch") or ())
+    if "value" in reply:
+        return int(reply["value"] is not None)
+    return 0
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Per-method command latency, documents and reply bytes.
+
+    Runs in the thread that issued the command; the Database method and the
+    request's timings come from the context Motor copied into that thread.
+    """
+
+    def __init__(self, reply_bytes: bool = False):
+        self.reply_bytes = reply_bytes
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        labels = (current_method.get(), event.command_name)
+        seconds = event.duration_micros / 1e6
+        MONGO_COMMAND_DURATION.observe(labels, seconds)
+        reply = event.reply
+        if reply:
+            documents = _documents_returned(reply)
+            if documents:
+                MONGO_DOCUMENTS_RETURNED.inc(labels, documents)
+            if self.reply_bytes:
+                # pymongo publishes decoded replies; re-encoding is the only way to size them
+                MONGO_REPLY_BYTES.inc(labels, len(bson_encode(reply)))
+        timings = current_timings.get()
+        if timings is not None:
+            timings.mongo += seconds
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        labels = (current_method.get(), event.command_name)
+        seconds = event.duration_micros / 1e6
+        MONGO_COMMAND_DURATION.observe(labels, seconds)
+        MONGO_COMMAND_FAILURES.inc(labels)
+        timings = current_timings.get()
+        if timings is not None:
+            timings.mongo += seconds
+
+
+def command_listeners() -> List[monitoring.CommandListener]:
+    """Listeners to pass to the Mongo client as event_listeners"""
+    return [MongoCommandListener(reply_bytes=METRICS_REPLY_BYTES)] if METRICS_ENABLED else []
+
+
+class MetricsMiddleware:
+    """Per-route latency histograms, response counts and the in-flight gauge.
+
+    Requests are labelled with the matched route template (e.g.
+    /api/venues/{venue_id}), never the raw path.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            current_timings.reset(token)
+            # The router records the matched route on the shared scope
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", UNMATCHED_ROUTE))
+            HTTP_REQUEST_DURATION.observe(labels, elapsed)
+            HTTP_REQUEST_MONGO_DURATION.observe(labels, timings.mongo)
+            HTTP_REQUEST_SERIALIZE_DURATION.observe(labels, timings.serialize)
+            HTTP_RESPONSES.inc(labels + (status,))
@@ -0,0 +1,47 @@
+"""One-off data migrations that must not run automatically at startup.
+
+    python migrate.py archive-duplicate-user-documents
+
+archive-duplicate-user-documents keeps the most recently updated budget,
+guest list and timeline per user and moves the others to
+`<collection>_duplicates`, then builds the unique user_id indexes the API
+refuses to start without. Review the archived documents and merge anything
+worth keeping by hand.
+"""
+import argparse
+import asyncio
+from database import database_from_env
+from indexes import missing_user_unique
+
+
+async def archive_duplicate_user_documents():
+    db = database_from_env()
+    try:
+        archived = await db.archive_duplicate_user_documents()
+        for collection_name, count in archived.items():
+            print(f"archived {count} documents to {collection_name}_duplicates")
+        if not archived:
+            print("no duplicate planning documents found")
+        failed = await db.ensure_indexes()
+        missing = missing_user_unique(failed)
+        if missing:
+            raise SystemExit(f"unique user_id indexes still failed to build: {missing}")
+        print("unique user_id indexes are in place")
+    finally:
+        await db.close()
+
+
+MIGRATIONS = {
+    "archive-duplicate-user-documents": archive_duplicate_user_documents,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("migration", choices=sorted(MIGRATIONS))
+    args = parser.parse_args()
+    asyncio.run(MIGRATIONS[args.migration]())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
 import uuid
 
@@ -52,6 +52,19 @@ class UserUpdate(BaseModel):
     email: Optional[str] = None
     profile_image: Optional[str] = None
 
+class SortOrder(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+class ListView(str, Enum):
+    CARD = "card"
+    FULL = "full"
+
+class VenueSortField(str, Enum):
+    PRICE = "price"
+    CAPACITY = "capacity"
+    CREATED_AT = "created_at"
+
 # Venue Models
 class Venue(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -71,6 +84,9 @@ class Venue(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+class VenueWithDistance(Venue):
+    distance_km: float
+
 class VenueCreate(BaseModel):
     name: str
     location: str
@@ -89,6 +105,8 @@ class VenueFilters(BaseModel):
     availability: Optional[AvailabilityStatus] = None
     pincode: Optional[str] = None
     search_query: Optional[str] = None
+    available_on: Optional[date] = None
+    available_until: Optional[date] = None  # free on every day from available_on to this day
 
 # Service Models
 class ServiceProvider(BaseModel):
@@ -137,6 +155,13 @@ class BookingCreate(BaseModel):
     services: List[BookingService] = []
     special_requests: Optional[str] = None
 
+class VenueAvailability(BaseModel):
+    venue_id: str
+    from_date: date
+    to_date: date
+    booked: str  # one character per day from from_date: '1' booked, '0' free
+    booked_ranges: List[List[date]] = []  # inclusive [start, end] runs of booked days
+
 class BookingUpdate(BaseModel):
     status: Optional[BookingStatus] = None
     special_requests: Optional[str] = None
@@ -153,6 +178,7 @@ class WeddingBudget(BaseModel):
     user_id: str
     total_budget: float
     categories: List[BudgetCategory]
+    version: int = 0  # bumped on every save; send it back to detect concurrent edits
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -166,10 +192,37 @@ class Guest(BaseModel):
     invited: bool = False
     confirmed: bool = False
 
+class GuestUpdate(BaseModel):
+    name: Optional[str] = None
+    relation: Optional[str] = None
+    phone: Optional[str] = None
+    address: Optional[str] = None
+    category: Optional[str] = None
+    invited: Optional[bool] = None
+    confirmed: Optional[bool] = None
+
+class GuestBulkUpdate(BaseModel):
+    guest_ids: List[str]
+    invited: Optional[bool] = None
+    confirmed: Optional[bool] = None
+
+class GuestImportError(BaseModel):
+    row: int
+    error: str
+
+class GuestImportReport(BaseModel):
+    received: int = 0
+    imported: int = 0
+    updated: int = 0
+    duplicates: int = 0
+    error_count: int = 0
+    errors: List[GuestImportError] = []
+
 class GuestList(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     user_id: str
     guests: List[Guest] = []
+    version: int = 0
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -185,6 +238,7 @@ class WeddingTimeline(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     user_id: str
     items: List[TimelineItem] = []
+    version: int = 0
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -195,13 +249,15 @@ class ChatMessage(BaseModel):
     message: str
     sender_type: str  # 'user' or 'bot' or 'agent'
     timestamp: datetime = Field(default_factory=datetime.utcnow)
+    seq: int = 0  # position within the ticket, assigned when stored
 
 class SupportTicket(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     user_id: Optional[str] = None
     subject: str
     status: str = "open"  # open, in_progress, resolved
-    messages: List[ChatMessage] = []
+    messages: List[ChatMessage] = []  # only populated on creation; history is paged separately
+    message_count: int = 0
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -217,6 +273,15 @@ class FAQ(BaseModel):
     category: str = "general"
     order: int = 0
 
+class FAQMatch(BaseModel):
+    faq: FAQ
+    score: float
+    confidence: float  # score relative to the best achievable for the query, 0-1
+
+# Adapters for parsing cached JSON arrays in one pass
+ServiceList = TypeAdapter(List[Service])
+FAQList = TypeAdapter(List[FAQ])
+
 # Request/Response Models
 class APIResponse(BaseModel):
     success: bool
@@ -230,4 +295,5 @@ class PaginatedResponse(BaseModel):
     total: int = 0
     page: int = 1
     per_page: int = 10
-    total_pages: int = 0
\ No newline at end of file
+    total_pages: int = 0
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -0,0 +1,76 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+ASCENDING = 1
+DESCENDING = -1
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "$date" in value:
+        return datetime.fromisoformat(value["$date"])
+    return value
+
+
+def encode_cursor(sort_field: str, direction: int, last_value: Any, last_id: str) -> str:
+    """Build an opaque cursor pointing just past the given row"""
+    payload = {
+        "f": sort_field,
+        "d": direction,
+        "v": _encode_value(last_value),
+        "id": last_id
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_field: str, direction: int) -> Dict[str, Any]:
+    """Decode a cursor, checking it was issued for the requested ordering"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value = _decode_value(payload["v"])
+        last_id = payload["id"]
+        issued_field = payload["f"]
+        issued_direction = payload["d"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+
+    if issued_field != sort_field or issued_direction != direction:
+        raise ValueError("Cursor does not match the requested sort order")
+    return {"value": value, "id": last_id}
+
+
+def keyset_filter(sort_field: str, direction: int, last_value: Any, last_id: str) -> Dict[str, Any]:
+    """Filter selecting rows strictly after (last_value, last_id) in sort order"""
+    op = "$gt" if direction == ASCENDING else "$lt"
+    return {
+        "$or": [
+            {sort_field: {op: last_value}},
+            {sort_field: last_value, "id": {op: last_id}}
+        ]
+    }
+
+
+def sort_spec(sort_field: str, direction: int) -> Dict[str, int]:
+    """Sort on the cursor field with `id` as the unique tie-breaker"""
+    return {sort_field: direction, "id": direction}
+
+
+def next_cursor(rows: list, limit: int, sort_field: str, direction: int) -> Optional[str]:
+    """Trim the look-ahead row fetched past `limit` and return the cursor if any.
+
+    Callers fetch `limit + 1` rows; the extra row only signals another page.
+    """
+    if len(rows) <= limit:
+        return None
+    del rows[limit:]
+    last = rows[-1]
+    return encode_cursor(sort_field, direction, last[sort_field], last["id"])
@@ -0,0 +1,172 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict
+from pymongo import monitoring
+from metrics import MONGO_POOL_CHECKOUT_DURATION, MONGO_POOL_CHECKOUT_FAILURES, MONGO_POOL_IN_USE, MONGO_POOL_WAITERS
+
+# pymongo's own default, reported when MONGO_MAX_POOL_SIZE is unset
+DEFAULT_MAX_POOL_SIZE = 100
+# Recent checkouts kept per server for the latency percentiles in /api/ready
+CHECKOUT_SAMPLES = 1000
+
+# Environment variable -> (AsyncIOMotorClient option, parser)
+_CLIENT_OPTIONS = {
+    "MONGO_MAX_POOL_SIZE": ("maxPoolSize", int),
+    "MONGO_MIN_POOL_SIZE": ("minPoolSize", int),
+    "MONGO_MAX_IDLE_TIME_MS": ("maxIdleTimeMS", int),
+    "MONGO_WAIT_QUEUE_TIMEOUT_MS": ("waitQueueTimeoutMS", int),
+    "MONGO_SERVER_SELECTION_TIMEOUT_MS": ("serverSelectionTimeoutMS", int),
+    "MONGO_CONNECT_TIMEOUT_MS": ("connectTimeoutMS", int),
+    "MONGO_COMPRESSORS": ("compressors", str),
+}
+
+
+def client_options_from_env() -> Dict[str, Any]:
+    """Motor client keyword options from MONGO_* variables; unset ones keep the driver default.
+
+    MONGO_COMPRESSORS is a comma-separated preference list, e.g.
+    "zstd,snappy,zlib"; zstd and snappy need their optional packages.
+    """
+    options = {}
+    for variable, (option, parse) in _CLIENT_OPTIONS.items():
+        value = os.environ.get(variable)
+        if value:
+            try:
+                options[option] = parse(value)
+            except ValueError:
+                raise RuntimeError(f"{variable} must be a {parse.__name__}, got {value!r}")
+    return options
+
+
+def _percentile(sorted_samples, pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[min(len(sorted_samples) - 1, int(pct / 100 * len(sorted_samples)))]
+
+
+class _ServerPool:
+    __slots__ = ("in_use", "waiters", "open", "checkouts", "failures", "cleared", "samples")
+
+    def __init__(self):
+        self.in_use = 0
+        self.waiters = 0
+        self.open = 0
+        self.checkouts = 0
+        self.failures: Dict[str, int] = {}
+        self.cleared = 0
+        # Checkout latencies in seconds
+        self.samples: Deque[float] = deque(maxlen=CHECKOUT_SAMPLES)
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """Connection pool occupancy and checkout latency per server.
+
+    A checkout's started and checked-out events fire on the same thread, so
+    the wait is timed with a thread-local start time. waiters counts
+    checkouts in progress, which is the wait-queue depth when the pool is
+    exhausted.
+    """
+
+    def __init__(self, max_pool_size: int = DEFAULT_MAX_POOL_SIZE):
+        self.max_pool_size = max_pool_size
+        self._servers: Dict[str, _ServerPool] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _server(self, address) -> _ServerPool:
+        key = f"{address[0]}:{address[1]}"
+        server = self._servers.get(key)
+        if server is None:
+            server = self._servers.setdefault(key, _ServerPool())
+        return server
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent) -> None:
+        self._local.started = time.perf_counter()
+        with self._lock:
+            self._server(event.address).waiters += 1
+        MONGO_POOL_WAITERS.inc()
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        waited = time.perf_counter() - getattr(self._local, "started", time.perf_counter())
+        with self._lock:
+            server = self._server(event.address)
+            server.waiters -= 1
+            server.in_use += 1
+            server.checkouts += 1
+            server.samples.append(waited)
+        MONGO_POOL_WAITERS.dec()
+        MONGO_POOL_IN_USE.inc()
+        MONGO_POOL_CHECKOUT_DURATION.observe((), waited)
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        with self._lock:
+            server = self._server(event.address)
+            server.waiters -= 1
+            server.failures[event.reason] = server.failures.get(event.reason, 0) + 1
+        MONGO_POOL_WAITERS.dec()
+        MONGO_POOL_CHECKOUT_FAILURES.inc((event.reason,))
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        with self._lock:
+            self._server(event.address).in_use -= 1
+        MONGO_POOL_IN_USE.dec()
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        with self._lock:
+            self._server(event.address).open += 1
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        with self._lock:
+            self._server(event.address).open -= 1
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        with self._lock:
+            self._server(event.address).cleared += 1
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def in_use(self) -> int:
+        """Connections checked out across all servers, i.e. commands in flight"""
+        with self._lock:
+            return sum(server.in_use for server in self._servers.values())
+
+    def exhausted(self, max_waiters: int) -> bool:
+        """Whether some server's pool is fully checked out with more than max_waiters queued"""
+        if self.max_pool_size <= 0:
+            # maxPoolSize=0 means unbounded
+            return False
+        with self._lock:
+            return any(
+                server.in_use >= self.max_pool_size and server.waiters > max_waiters
+                for server in self._servers.values()
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        servers = {}
+        with self._lock:
+            for key, server in self._servers.items():
+                samples = sorted(server.samples)
+                servers[key] = {
+                    "in_use": server.in_use,
+                    "waiting": server.waiters,
+                    "open": server.open,
+                    "checkouts": server.checkouts,
+                    "checkout_failures": dict(server.failures),
+                    "pool_cleared": server.cleared,
+                    "checkout_p50_ms": round(_percentile(samples, 50) * 1000, 3),
+                    "checkout_p99_ms": round(_percentile(samples, 99) * 1000, 3),
+                    "checkout_max_ms": round((samples[-1] if samples else 0.0) * 1000, 3),
+                }
+        return {"max_pool_size": self.max_pool_size, "servers": servers}
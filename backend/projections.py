@@ -0,0 +1,92 @@
+from typing import Any, Dict, Iterable, Optional, Type
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+from models import ListView
+
+# Upper bound on names accepted in one fields= parameter
+MAX_REQUESTED_FIELDS = 20
+
+
+class Projection:
+    """The subset of a document a list read returns.
+
+    `fields` are included whole; `slices` keep only the first n elements of
+    an array field (e.g. one thumbnail out of all venue images). The same
+    projection is applied in find() queries and aggregation pipelines, so
+    the trimmed fields never leave MongoDB.
+    """
+
+    def __init__(self, fields: Iterable[str], slices: Optional[Dict[str, int]] = None):
+        self.slices = dict(slices or {})
+        self.fields = tuple(dict.fromkeys(f for f in fields if f not in self.slices))
+
+    def including(self, *fields: str) -> "Projection":
+        """Copy that also returns fields the query needs, e.g. the keyset sort field"""
+        missing = [f for f in fields if f not in self.fields and f not in self.slices]
+        if not missing:
+            return self
+        return Projection(self.fields + tuple(missing), self.slices)
+
+    def find(self) -> Dict[str, Any]:
+        projection = {"_id": 0}
+        projection.update({field: 1 for field in self.fields})
+        projection.update({field: {"$slice": count} for field, count in self.slices.items()})
+        return projection
+
+    def stage(self) -> Dict[str, Any]:
+        projection = {"_id": 0}
+        projection.update({field: 1 for field in self.fields})
+        projection.update({field: {"$slice": [f"${field}", count]} for field, count in self.slices.items()})
+        return {"$project": projection}
+
+
+# Compact list cards: what listings and map pins render
+VENUE_CARD = Projection(
+    ("id", "name", "location", "pincode", "coordinates", "price", "capacity", "rating", "reviews", "availability"),
+    slices={"images": 1}
+)
+BOOKING_CARD = Projection(
+    ("id", "venue_id", "venue_name", "venue_location", "event_date", "guest_count", "total_amount", "status", "created_at")
+)
+SERVICE_CARD = Projection(
+    ("id", "name", "icon", "providers.id", "providers.name", "providers.rating", "providers.price_range")
+)
+
+
+def parse_projection(
+    model: Type[BaseModel],
+    card: Projection,
+    view: ListView,
+    fields: Optional[str]
+) -> Optional[Projection]:
+    """Resolve view/fields query parameters; None means full documents.
+
+    fields= takes precedence over view= and accepts top-level field names of
+    the model. The id is always returned.
+    """
+    if fields:
+        requested = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = sorted(set(requested) - set(model.model_fields))
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        if len(requested) > MAX_REQUESTED_FIELDS:
+            raise ValueError(f"At most {MAX_REQUESTED_FIELDS} fields may be requested")
+        return Projection(["id"] + requested)
+    if view == ListView.CARD:
+        return card
+    return None
+
+
+def projection_params(model: Type[BaseModel], card: Projection):
+    """FastAPI dependency reading view= and fields= for a list endpoint"""
+
+    def dependency(
+        view: ListView = Query(ListView.FULL, description="card for compact list items, full for whole documents"),
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return; overrides view")
+    ) -> Optional[Projection]:
+        try:
+            return parse_projection(model, card, view, fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return dependency
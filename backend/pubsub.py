@@ -0,0 +1,162 @@
+import asyncio
+import os
+import logging
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Messages buffered per subscriber before the oldest are dropped
+DEFAULT_QUEUE_SIZE = 100
+
+
+def ticket_channel(ticket_id: str) -> str:
+    return f"ticket:{ticket_id}"
+
+
+class Subscription:
+    """One subscriber's view of a channel; iterate to receive messages"""
+
+    def __init__(self, queue: "asyncio.Queue[bytes]"):
+        self.queue = queue
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Next message, or None if nothing arrives within timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> bytes:
+        return await self.queue.get()
+
+
+class PubSubBackend(ABC):
+    """Fan-out of serialized messages to every subscriber of a channel"""
+
+    @abstractmethod
+    async def publish(self, channel: str, message: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def subscribe(self, channel: str):
+        ...
+
+    def stats(self) -> Dict[str, int]:
+        return {}
+
+    async def close(self) -> None:
+        pass
+
+
+class InProcessPubSub(PubSubBackend):
+    """Pub/sub within one event loop.
+
+    Idle subscribers cost one queue each and nothing else; a publish is a
+    put_nowait per subscriber. Slow consumers lose their oldest messages
+    rather than blocking the publisher.
+    """
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._channels: Dict[str, Set["asyncio.Queue[bytes]"]] = {}
+        self.published = 0
+        self.dropped = 0
+
+    async def publish(self, channel: str, message: bytes) -> None:
+        self.deliver(channel, message)
+
+    def deliver(self, channel: str, message: bytes) -> None:
+        self.published += 1
+        for queue in self._channels.get(channel, ()):
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(message)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[Subscription]:
+        queue: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize=self.queue_size)
+        self._channels.setdefault(channel, set()).add(queue)
+        try:
+            yield Subscription(queue)
+        finally:
+            subscribers = self._channels.get(channel)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._channels[channel]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "channels": len(self._channels),
+            "subscribers": sum(len(queues) for queues in self._channels.values()),
+            "published": self.published,
+            "dropped": self.dropped,
+        }
+
+
+class RedisPubSub(PubSubBackend):
+    """Cross-worker pub/sub over any client with the redis.asyncio API.
+
+    Each process holds a single pattern subscription and relays what it
+    receives to its local subscribers, so connections per worker stay at one
+    no matter how many chats are open.
+    """
+
+    def __init__(self, client, prefix: str = "hallbook:", queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.client = client
+        self.prefix = prefix
+        self.local = InProcessPubSub(queue_size=queue_size)
+        self._listener: Optional[asyncio.Task] = None
+
+    async def publish(self, channel: str, message: bytes) -> None:
+        await self.client.publish(self.prefix + channel, message)
+
+    def _ensure_listener(self):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._relay())
+
+    async def _relay(self):
+        pubsub = self.client.pubsub()
+        await pubsub.psubscribe(self.prefix + "*")
+        try:
+            async for event in pubsub.listen():
+                if event.get("type") != "pmessage":
+                    continue
+                channel = event["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                self.local.deliver(channel[len(self.prefix):], event["data"])
+        finally:
+            await pubsub.close()
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[Subscription]:
+        self._ensure_listener()
+        async with self.local.subscribe(channel) as subscription:
+            yield subscription
+
+    def stats(self) -> Dict[str, int]:
+        return self.local.stats()
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+
+
+def build_pubsub() -> PubSubBackend:
+    """Create the pub/sub backend selected by PUBSUB_BACKEND (memory or redis)"""
+    backend = os.environ.get("PUBSUB_BACKEND", "memory").lower()
+    if backend == "redis":
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("PUBSUB_BACKEND=redis requires the 'redis' package")
+        logger.info("Using Redis pub/sub for support chat")
+        return RedisPubSub(redis.from_url(os.environ.get("REDIS_URL", "redis://localhost:6379/0")))
+    return InProcessPubSub()
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from models import APIResponse
+from database import Database
+from dependencies import get_db
+from serialization import envelope
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+@router.get("/indexes", response_model=APIResponse)
+async def get_index_drift(db: Database = Depends(get_db)):
+    """Report indexes missing from or extra to the declared registry"""
+    try:
+        drift = await db.index_drift()
+        return envelope("No index drift detected" if not drift else "Index drift detected", drift)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/cache", response_model=APIResponse)
+async def get_cache_stats(db: Database = Depends(get_db)):
+    """Catalog cache hit, miss and eviction counters"""
+    return envelope("Cache statistics retrieved successfully", db.cache.stats())
+
+@router.get("/realtime", response_model=APIResponse)
+async def get_realtime_stats(db: Database = Depends(get_db)):
+    """Open support chat subscriptions and pub/sub delivery counters"""
+    return envelope("Realtime statistics retrieved successfully", db.pubsub.stats())
+
+@router.get("/slow-queries", response_model=APIResponse)
+async def get_slow_queries(
+    limit: int = Query(20, ge=1, le=100, description="Number of query shapes to return"),
+    window_minutes: int = Query(60, ge=1, le=1440, description="Only count slow operations this recent"),
+    db: Database = Depends(get_db)
+):
+    """Query shapes ranked by time spent in slow operations, with sampled explain results"""
+    report = db.slow_queries.report(limit=limit, window_seconds=window_minutes * 60)
+    return envelope("Slow query report retrieved successfully", report)
@@ -1,70 +1,77 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
-from models import Booking, BookingCreate, BookingUpdate, BookingStatus, APIResponse
-from database import db
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from models import Booking, BookingCreate, BookingUpdate, BookingStatus, APIResponse, PaginatedResponse
+from database import Database, BookingConflictError
+from dependencies import get_db
+from serialization import envelope, paginated_envelope
+from projections import BOOKING_CARD, Projection, projection_params
 
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
 @router.post("/", response_model=APIResponse)
-async def create_booking(booking: BookingCreate):
+async def create_booking(booking: BookingCreate, db: Database = Depends(get_db)):
     """Create a new booking"""
     try:
         created_booking = await db.create_booking(booking)
-        return APIResponse(
-            success=True,
-            message="Booking created successfully",
-            data=created_booking.dict()
-        )
+        return envelope("Booking created successfully", created_booking)
+    except BookingConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/user/{user_id}", response_model=APIResponse)
-async def get_user_bookings(user_id: str):
-    """Get all bookings for a user"""
+@router.get("/user/{user_id}", response_model=PaginatedResponse)
+async def get_user_bookings(
+    user_id: str,
+    limit: int = Query(50, ge=1, le=200, description="Bookings per page"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page"),
+    projection: Optional[Projection] = Depends(projection_params(Booking, BOOKING_CARD)),
+    db: Database = Depends(get_db)
+):
+    """Get a user's bookings, newest first, one page at a time"""
     try:
-        bookings = await db.get_user_bookings(user_id)
-        return APIResponse(
-            success=True,
-            message="Bookings retrieved successfully",
-            data=[booking.dict() for booking in bookings]
+        bookings, total, next_cursor = await db.get_user_bookings_page(
+            user_id, limit=limit, cursor=cursor, projection=projection
+        )
+        return paginated_envelope(
+            "Bookings retrieved successfully",
+            bookings,
+            total=total,
+            per_page=limit,
+            next_cursor=next_cursor
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{booking_id}", response_model=APIResponse)
-async def get_booking(booking_id: str):
+async def get_booking(booking_id: str, db: Database = Depends(get_db)):
     """Get a specific booking by ID"""
     try:
         booking = await db.get_booking(booking_id)
         if not booking:
             raise HTTPException(status_code=404, detail="Booking not found")
         
-        return APIResponse(
-            success=True,
-            message="Booking retrieved successfully",
-            data=booking.dict()
-        )
+        return envelope("Booking retrieved successfully", booking)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/{booking_id}/status", response_model=APIResponse)
-async def update_booking_status(booking_id: str, status: BookingStatus):
+async def update_booking_status(booking_id: str, status: BookingStatus, db: Database = Depends(get_db)):
     """Update booking status"""
     try:
         updated_booking = await db.update_booking_status(booking_id, status)
         if not updated_booking:
             raise HTTPException(status_code=404, detail="Booking not found")
         
-        return APIResponse(
-            success=True,
-            message="Booking status updated successfully",
-            data=updated_booking.dict()
-        )
+        return envelope("Booking status updated successfully", updated_booking)
     except HTTPException:
         raise
+    except BookingConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
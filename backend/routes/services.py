@@ -1,31 +1,32 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import Optional
 from models import Service, APIResponse
-from database import db
+from database import Database
+from dependencies import get_db
+from serialization import envelope
+from http_cache import conditional_envelope
+from projections import SERVICE_CARD, Projection, projection_params
 
 router = APIRouter(prefix="/services", tags=["services"])
 
 @router.get("/", response_model=APIResponse)
-async def get_services():
-    """Get all services with their providers"""
+async def get_services(
+    request: Request,
+    projection: Optional[Projection] = Depends(projection_params(Service, SERVICE_CARD)),
+    db: Database = Depends(get_db)
+):
+    """Get all services with their providers; honours If-None-Match / If-Modified-Since"""
     try:
-        services = await db.get_services()
-        return APIResponse(
-            success=True,
-            message="Services retrieved successfully",
-            data=[service.dict() for service in services]
-        )
+        services_json = await db.get_services_json(projection)
+        return conditional_envelope(request, "Services retrieved successfully", services_json)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/", response_model=APIResponse)
-async def create_service(service: Service):
+async def create_service(service: Service, db: Database = Depends(get_db)):
     """Create a new service"""
     try:
         created_service = await db.create_service(service)
-        return APIResponse(
-            success=True,
-            message="Service created successfully",
-            data=created_service.dict()
-        )
+        return envelope("Service created successfully", created_service)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,63 +1,140 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
-from models import SupportTicket, SupportTicketCreate, ChatMessage, FAQ, APIResponse
-from database import db
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+import orjson
+from models import SupportTicket, SupportTicketCreate, ChatMessage, FAQ, APIResponse, PaginatedResponse
+from database import Database
+from dependencies import get_db
+from serialization import envelope, paginated_envelope
+from http_cache import conditional_envelope
+from pubsub import ticket_channel
+
+# Comment frames keep idle SSE connections open through proxies
+SSE_KEEPALIVE_SECONDS = 15
+# Most messages replayed to a reconnecting stream; older ones are in the paged history
+SSE_REPLAY_LIMIT = 500
 
 router = APIRouter(prefix="/support", tags=["support"])
 
 @router.post("/tickets", response_model=APIResponse)
-async def create_support_ticket(ticket: SupportTicketCreate):
+async def create_support_ticket(ticket: SupportTicketCreate, db: Database = Depends(get_db)):
     """Create a new support ticket"""
     try:
         created_ticket = await db.create_support_ticket(ticket)
-        return APIResponse(
-            success=True,
-            message="Support ticket created successfully",
-            data=created_ticket.dict()
-        )
+        return envelope("Support ticket created successfully", created_ticket)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/tickets/{ticket_id}/messages", response_model=APIResponse)
-async def add_message_to_ticket(ticket_id: str, message: ChatMessage):
+async def add_message_to_ticket(ticket_id: str, message: ChatMessage, db: Database = Depends(get_db)):
     """Add a message to an existing support ticket"""
     try:
-        updated_ticket = await db.add_message_to_ticket(ticket_id, message)
-        if not updated_ticket:
+        added_message = await db.add_message_to_ticket(ticket_id, message)
+        if not added_message:
             raise HTTPException(status_code=404, detail="Support ticket not found")
         
-        return APIResponse(
-            success=True,
-            message="Message added successfully",
-            data=updated_ticket.dict()
+        return envelope("Message added successfully", added_message)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/tickets/{ticket_id}/messages", response_model=PaginatedResponse)
+async def get_ticket_messages(
+    ticket_id: str,
+    before: Optional[str] = Query(None, description="next_cursor from the previous page, to load older messages"),
+    limit: int = Query(50, ge=1, le=200, description="Messages per page"),
+    db: Database = Depends(get_db)
+):
+    """Get a ticket's chat history, newest page first"""
+    try:
+        page = await db.get_ticket_messages(ticket_id, before=before, limit=limit)
+        if page is None:
+            raise HTTPException(status_code=404, detail="Support ticket not found")
+
+        messages, total, next_cursor = page
+        return paginated_envelope(
+            "Messages retrieved successfully",
+            messages,
+            total=total,
+            per_page=limit,
+            next_cursor=next_cursor
         )
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _message_event(seq: int, message_json: bytes) -> bytes:
+    # The id comes back as Last-Event-ID when the browser reconnects
+    return b"id: %d\nevent: message\ndata: %s\n\n" % (seq, message_json)
+
+@router.get("/tickets/{ticket_id}/events")
+async def stream_ticket_events(
+    ticket_id: str,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    db: Database = Depends(get_db)
+):
+    """Server-sent events stream of new messages on a ticket; resumes after Last-Event-ID"""
+    if not await db.ticket_exists(ticket_id):
+        raise HTTPException(status_code=404, detail="Support ticket not found")
+    try:
+        after_seq = int(last_event_id) if last_event_id else None
+    except ValueError:
+        after_seq = None
+
+    async def event_stream():
+        # Waiting on the bus costs no database reads, however long the chat idles
+        async with db.pubsub.subscribe(ticket_channel(ticket_id)) as subscription:
+            yield b"retry: 3000\n\n"
+            # Subscribed before replaying, so a message posted in between is
+            # either replayed or delivered live, and skipped if both
+            replayed_seq = 0
+            if after_seq is not None:
+                for message in await db.get_ticket_messages_after(ticket_id, after_seq, SSE_REPLAY_LIMIT):
+                    replayed_seq = message.seq
+                    yield _message_event(message.seq, message.model_dump_json().encode())
+            while True:
+                message = await subscription.get(timeout=SSE_KEEPALIVE_SECONDS)
+                if message is None:
+                    yield b": keepalive\n\n"
+                    continue
+                seq = orjson.loads(message).get("seq", 0)
+                if seq > replayed_seq:
+                    yield _message_event(seq, message)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/faqs", response_model=APIResponse)
-async def get_faqs():
-    """Get all frequently asked questions"""
+async def get_faqs(request: Request, db: Database = Depends(get_db)):
+    """Get all frequently asked questions; honours If-None-Match / If-Modified-Since"""
     try:
-        faqs = await db.get_faqs()
-        return APIResponse(
-            success=True,
-            message="FAQs retrieved successfully",
-            data=[faq.dict() for faq in faqs]
-        )
+        faqs_json = await db.get_faqs_json()
+        return conditional_envelope(request, "FAQs retrieved successfully", faqs_json)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/faqs/search", response_model=APIResponse)
+async def search_faqs(
+    q: str = Query(..., min_length=1, max_length=500, description="Question text"),
+    limit: int = Query(5, ge=1, le=20),
+    db: Database = Depends(get_db)
+):
+    """Rank FAQs against a question using the in-memory index"""
+    matches = db.search_faqs(q, limit=limit)
+    return envelope(f"Found {len(matches)} matching FAQs", matches)
+
 @router.post("/faqs", response_model=APIResponse)
-async def create_faq(faq: FAQ):
+async def create_faq(faq: FAQ, db: Database = Depends(get_db)):
     """Create a new FAQ"""
     try:
         created_faq = await db.create_faq(faq)
-        return APIResponse(
-            success=True,
-            message="FAQ created successfully",
-            data=created_faq.dict()
-        )
+        return envelope("FAQ created successfully", created_faq)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,53 +1,43 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from models import User, UserCreate, UserUpdate, APIResponse
-from database import db
+from database import Database
+from dependencies import get_db
+from serialization import envelope
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.post("/", response_model=APIResponse)
-async def create_user(user: UserCreate):
+async def create_user(user: UserCreate, db: Database = Depends(get_db)):
     """Create a new user"""
     try:
         created_user = await db.create_user(user)
-        return APIResponse(
-            success=True,
-            message="User created successfully",
-            data=created_user.dict()
-        )
+        return envelope("User created successfully", created_user)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{user_id}", response_model=APIResponse)
-async def get_user(user_id: str):
+async def get_user(user_id: str, db: Database = Depends(get_db)):
     """Get user by ID"""
     try:
         user = await db.get_user(user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        return APIResponse(
-            success=True,
-            message="User retrieved successfully",
-            data=user.dict()
-        )
+        return envelope("User retrieved successfully", user)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/{user_id}", response_model=APIResponse)
-async def update_user(user_id: str, user_update: UserUpdate):
+async def update_user(user_id: str, user_update: UserUpdate, db: Database = Depends(get_db)):
     """Update user information"""
     try:
         updated_user = await db.update_user(user_id, user_update)
         if not updated_user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        return APIResponse(
-            success=True,
-            message="User updated successfully",
-            data=updated_user.dict()
-        )
+        return envelope("User updated successfully", updated_user)
     except HTTPException:
         raise
     except Exception as e:
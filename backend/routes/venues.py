@@ -1,74 +1,166 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from typing import List, Optional
-from models import Venue, VenueCreate, VenueFilters, APIResponse, PaginatedResponse
-from database import db
+from datetime import date
+from models import (
+    Venue, VenueCreate, VenueFilters, VenueSortField, SortOrder, APIResponse, PaginatedResponse
+)
+from projections import VENUE_CARD, Projection, projection_params
+from database import Database, MAX_AVAILABILITY_DAYS
+from pagination import ASCENDING, DESCENDING
+from dependencies import get_db
+from serialization import envelope, paginated_envelope
+from http_cache import conditional_envelope
 
 router = APIRouter(prefix="/venues", tags=["venues"])
 
-@router.get("/", response_model=PaginatedResponse)
-async def get_venues(
+venue_projection = projection_params(Venue, VENUE_CARD)
+
+def venue_filters(
     budget: Optional[float] = Query(None, description="Maximum budget"),
     capacity: Optional[int] = Query(None, description="Minimum capacity"),
     availability: Optional[str] = Query(None, description="Availability status"),
     pincode: Optional[str] = Query(None, description="Pincode filter"),
-    search_query: Optional[str] = Query(None, description="Search in name and location"),
-    page: int = Query(1, ge=1, description="Page number"),
-    per_page: int = Query(10, ge=1, le=50, description="Items per page")
-):
-    """Get venues with optional filters and pagination"""
+    search_query: Optional[str] = Query(None, description="Prefix search on name and location words"),
+    available_on: Optional[date] = Query(None, description="Only venues free on this day (YYYY-MM-DD)"),
+    available_until: Optional[date] = Query(None, description="With available_on, free on every day up to this one")
+) -> VenueFilters:
+    """Shared venue filter query parameters"""
+    if available_until:
+        if not available_on:
+            raise HTTPException(status_code=400, detail="available_until requires available_on")
+        days = (available_until - available_on).days + 1
+        if days < 1 or days > MAX_AVAILABILITY_DAYS:
+            raise HTTPException(status_code=400, detail="Invalid availability date range")
     try:
-        filters = VenueFilters(
+        return VenueFilters(
             budget=budget,
             capacity=capacity,
             availability=availability,
             pincode=pincode,
-            search_query=search_query
+            search_query=search_query,
+            available_on=available_on,
+            available_until=available_until
         )
-        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/", response_model=PaginatedResponse)
+async def get_venues(
+    filters: VenueFilters = Depends(venue_filters),
+    page: int = Query(1, ge=1, description="Page number"),
+    per_page: int = Query(10, ge=1, le=50, description="Items per page"),
+    estimate_total: bool = Query(False, description="Use the fast estimated total for unfiltered listings"),
+    sort_by: Optional[VenueSortField] = Query(None, description="Sort field; defaults to relevance when searching, else created_at"),
+    sort_order: SortOrder = Query(SortOrder.ASC, description="Sort direction"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page; overrides page"),
+    projection: Optional[Projection] = Depends(venue_projection),
+    db: Database = Depends(get_db)
+):
+    """Get venues with optional filters and pagination"""
+    try:
         skip = (page - 1) * per_page
-        venues = await db.get_venues(filters, skip=skip, limit=per_page)
-        total = await db.get_venues_count(filters)
-        total_pages = (total + per_page - 1) // per_page
-        
-        return PaginatedResponse(
-            success=True,
-            message="Venues retrieved successfully",
-            data=[venue.dict() for venue in venues],
+        venues, total, next_cursor = await db.get_venues_page(
+            filters,
+            skip=skip,
+            limit=per_page,
+            estimate_total=estimate_total,
+            sort_by=sort_by.value if sort_by else None,
+            direction=ASCENDING if sort_order == SortOrder.ASC else DESCENDING,
+            cursor=cursor,
+            projection=projection
+        )
+        return paginated_envelope(
+            "Venues retrieved successfully",
+            venues,
             total=total,
             page=page,
             per_page=per_page,
-            total_pages=total_pages
+            next_cursor=next_cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/nearby", response_model=APIResponse)
+async def get_venues_nearby(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude of the search centre"),
+    lng: float = Query(..., ge=-180, le=180, description="Longitude of the search centre"),
+    radius_km: float = Query(5, gt=0, le=50, description="Search radius in kilometres"),
+    limit: int = Query(100, ge=1, le=500, description="Maximum venues returned"),
+    filters: VenueFilters = Depends(venue_filters),
+    projection: Optional[Projection] = Depends(venue_projection),
+    db: Database = Depends(get_db)
+):
+    """Get venues near a point, nearest first"""
+    try:
+        venues = await db.get_venues_nearby(lat, lng, radius_km, filters, limit=limit, projection=projection)
+        return envelope("Nearby venues retrieved successfully", venues)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/viewport", response_model=APIResponse)
+async def get_venues_in_viewport(
+    south: float = Query(..., ge=-90, le=90, description="Southern edge latitude"),
+    west: float = Query(..., ge=-180, le=180, description="Western edge longitude"),
+    north: float = Query(..., ge=-90, le=90, description="Northern edge latitude"),
+    east: float = Query(..., ge=-180, le=180, description="Eastern edge longitude"),
+    limit: int = Query(100, ge=1, le=500, description="Maximum venues returned"),
+    filters: VenueFilters = Depends(venue_filters),
+    projection: Optional[Projection] = Depends(venue_projection),
+    db: Database = Depends(get_db)
+):
+    """Get venues inside the visible map area, nearest to its centre first"""
+    if south > north or west > east:
+        raise HTTPException(status_code=400, detail="Invalid viewport bounds")
+    try:
+        venues = await db.get_venues_in_viewport(
+            south, west, north, east, filters, limit=limit, projection=projection
         )
+        return envelope("Venues in viewport retrieved successfully", venues)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{venue_id}", response_model=APIResponse)
-async def get_venue(venue_id: str):
-    """Get a specific venue by ID"""
+async def get_venue(venue_id: str, request: Request, db: Database = Depends(get_db)):
+    """Get a specific venue by ID; honours If-None-Match / If-Modified-Since"""
     try:
-        venue = await db.get_venue(venue_id)
-        if not venue:
+        venue_json = await db.get_venue_json(venue_id)
+        if not venue_json:
             raise HTTPException(status_code=404, detail="Venue not found")
         
-        return APIResponse(
-            success=True,
-            message="Venue retrieved successfully",
-            data=venue.dict()
-        )
+        return conditional_envelope(request, "Venue retrieved successfully", venue_json)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/{venue_id}/availability", response_model=APIResponse)
+async def get_venue_availability(
+    venue_id: str,
+    from_date: date = Query(..., alias="from", description="First day (YYYY-MM-DD)"),
+    to_date: date = Query(..., alias="to", description="Last day, inclusive (YYYY-MM-DD)"),
+    db: Database = Depends(get_db)
+):
+    """Get which days a venue is booked between two dates"""
+    try:
+        if not await db.get_venue_json(venue_id):
+            raise HTTPException(status_code=404, detail="Venue not found")
+
+        availability = await db.get_venue_availability(venue_id, from_date, to_date)
+        return envelope("Venue availability retrieved successfully", availability)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/", response_model=APIResponse)
-async def create_venue(venue: VenueCreate):
+async def create_venue(venue: VenueCreate, db: Database = Depends(get_db)):
     """Create a new venue"""
     try:
         created_venue = await db.create_venue(venue)
-        return APIResponse(
-            success=True,
-            message="Venue created successfully",
-            data=created_venue.dict()
-        )
+        return envelope("Venue created successfully", created_venue)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
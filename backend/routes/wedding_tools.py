@@ -1,18 +1,31 @@
-from fastapi import APIRouter, HTTPException
-from models import WeddingBudget, GuestList, WeddingTimeline, APIResponse
-from database import db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from models import (
+    WeddingBudget, GuestList, Guest, GuestUpdate, GuestBulkUpdate, WeddingTimeline, APIResponse
+)
+from database import Database, VersionConflictError
+from dependencies import get_db
+from serialization import envelope
+from guest_io import IMPORT_FORMATS, import_guests, export_guests
 
 router = APIRouter(prefix="/wedding-tools", tags=["wedding-tools"])
 
+def _expected_version(document) -> Optional[int]:
+    """Version the client last read, if it sent one; omitting it means last write wins"""
+    if "version" in document.model_fields_set:
+        return document.version
+    return None
+
 # Budget endpoints
 @router.get("/budget/{user_id}", response_model=APIResponse)
-async def get_wedding_budget(user_id: str):
+async def get_wedding_budget(user_id: str, db: Database = Depends(get_db)):
     """Get wedding budget for a user"""
     try:
         budget = await db.get_user_wedding_budget(user_id)
         if not budget:
-            # Return default budget structure if none exists
-            default_budget = WeddingBudget(
+            # Return default budget structure if none exists; it is saved on first PUT
+            budget = WeddingBudget(
                 user_id=user_id,
                 total_budget=800000,
                 categories=[
@@ -24,71 +37,146 @@ async def get_wedding_budget(user_id: str):
                     {"name": "Miscellaneous", "budgeted": 30000, "spent": 0.0, "color": "#95A5A6"}
                 ]
             )
-            budget = await db.create_or_update_wedding_budget(default_budget)
         
-        return APIResponse(
-            success=True,
-            message="Wedding budget retrieved successfully",
-            data=budget.dict()
-        )
+        return envelope("Wedding budget retrieved successfully", budget)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/budget/{user_id}", response_model=APIResponse)
-async def update_wedding_budget(user_id: str, budget: WeddingBudget):
+async def update_wedding_budget(user_id: str, budget: WeddingBudget, db: Database = Depends(get_db)):
     """Update wedding budget for a user"""
     try:
         budget.user_id = user_id  # Ensure user_id matches
-        updated_budget = await db.create_or_update_wedding_budget(budget)
-        return APIResponse(
-            success=True,
-            message="Wedding budget updated successfully",
-            data=updated_budget.dict()
-        )
+        updated_budget = await db.create_or_update_wedding_budget(budget, expected_version=_expected_version(budget))
+        return envelope("Wedding budget updated successfully", updated_budget)
+    except VersionConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # Guest list endpoints
 @router.get("/guests/{user_id}", response_model=APIResponse)
-async def get_guest_list(user_id: str):
+async def get_guest_list(user_id: str, db: Database = Depends(get_db)):
     """Get guest list for a user"""
     try:
         guest_list = await db.get_user_guest_list(user_id)
         if not guest_list:
-            # Create empty guest list if none exists
+            # Return an empty guest list if none exists
             guest_list = GuestList(user_id=user_id, guests=[])
-            guest_list = await db.create_or_update_guest_list(guest_list)
         
-        return APIResponse(
-            success=True,
-            message="Guest list retrieved successfully",
-            data=guest_list.dict()
-        )
+        return envelope("Guest list retrieved successfully", guest_list)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/guests/{user_id}", response_model=APIResponse)
-async def update_guest_list(user_id: str, guest_list: GuestList):
+async def update_guest_list(user_id: str, guest_list: GuestList, db: Database = Depends(get_db)):
     """Update guest list for a user"""
     try:
         guest_list.user_id = user_id  # Ensure user_id matches
-        updated_guest_list = await db.create_or_update_guest_list(guest_list)
-        return APIResponse(
-            success=True,
-            message="Guest list updated successfully",
-            data=updated_guest_list.dict()
+        updated_guest_list = await db.create_or_update_guest_list(guest_list, expected_version=_expected_version(guest_list))
+        return envelope("Guest list updated successfully", updated_guest_list)
+    except VersionConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/guests/{user_id}/items", response_model=APIResponse)
+async def add_guests(user_id: str, guests: List[Guest], db: Database = Depends(get_db)):
+    """Add one or more guests without resending the whole list"""
+    try:
+        added_guests = await db.add_guests(user_id, guests)
+        return envelope("Guests added successfully", added_guests)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.patch("/guests/{user_id}/items/{guest_id}", response_model=APIResponse)
+async def update_guest(user_id: str, guest_id: str, guest_update: GuestUpdate, db: Database = Depends(get_db)):
+    """Update fields of a single guest"""
+    try:
+        updated_guest = await db.update_guest(user_id, guest_id, guest_update)
+        if not updated_guest:
+            raise HTTPException(status_code=404, detail="Guest not found")
+
+        return envelope("Guest updated successfully", updated_guest)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.delete("/guests/{user_id}/items/{guest_id}", response_model=APIResponse)
+async def remove_guest(user_id: str, guest_id: str, db: Database = Depends(get_db)):
+    """Remove a single guest"""
+    try:
+        if not await db.remove_guest(user_id, guest_id):
+            raise HTTPException(status_code=404, detail="Guest not found")
+
+        return envelope("Guest removed successfully", {"id": guest_id})
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/guests/{user_id}/bulk-update", response_model=APIResponse)
+async def bulk_update_guests(user_id: str, bulk_update: GuestBulkUpdate, db: Database = Depends(get_db)):
+    """Set invited/confirmed on many guests at once"""
+    try:
+        if not await db.bulk_update_guests(user_id, bulk_update):
+            raise HTTPException(status_code=404, detail="Guest list not found")
+
+        return envelope("Guests updated successfully", bulk_update)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/guests/{user_id}/import", response_model=APIResponse)
+async def import_guest_list(
+    user_id: str,
+    request: Request,
+    format: str = Query("csv", description="Upload format: csv (with header row) or ndjson"),
+    db: Database = Depends(get_db)
+):
+    """Stream a CSV or NDJSON file of guests into the list, reporting per-row errors"""
+    if format not in IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(IMPORT_FORMATS)}")
+    try:
+        report = await import_guests(db, user_id, request.stream(), format)
+        return envelope(
+            "Guest import completed" if not report.error_count else "Guest import completed with errors",
+            report,
+            success=report.error_count == 0
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/guests/{user_id}/export")
+async def export_guest_list(
+    user_id: str,
+    format: str = Query("csv", description="Download format: csv or ndjson"),
+    db: Database = Depends(get_db)
+):
+    """Stream the guest list as CSV or NDJSON"""
+    if format not in IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(IMPORT_FORMATS)}")
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export_guests(db, user_id, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="guests-{user_id}.{format}"'}
+    )
+
 # Timeline endpoints
 @router.get("/timeline/{user_id}", response_model=APIResponse)
-async def get_wedding_timeline(user_id: str):
+async def get_wedding_timeline(user_id: str, db: Database = Depends(get_db)):
     """Get wedding timeline for a user"""
     try:
         timeline = await db.get_user_wedding_timeline(user_id)
         if not timeline:
-            # Create default timeline if none exists
+            # Return default timeline if none exists
             from datetime import datetime, timedelta
             default_items = [
                 {
@@ -117,26 +205,19 @@ async def get_wedding_timeline(user_id: str):
                 }
             ]
             timeline = WeddingTimeline(user_id=user_id, items=default_items)
-            timeline = await db.create_or_update_wedding_timeline(timeline)
         
-        return APIResponse(
-            success=True,
-            message="Wedding timeline retrieved successfully",
-            data=timeline.dict()
-        )
+        return envelope("Wedding timeline retrieved successfully", timeline)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/timeline/{user_id}", response_model=APIResponse)
-async def update_wedding_timeline(user_id: str, timeline: WeddingTimeline):
+async def update_wedding_timeline(user_id: str, timeline: WeddingTimeline, db: Database = Depends(get_db)):
     """Update wedding timeline for a user"""
     try:
         timeline.user_id = user_id  # Ensure user_id matches
-        updated_timeline = await db.create_or_update_wedding_timeline(timeline)
-        return APIResponse(
-            success=True,
-            message="Wedding timeline updated successfully",
-            data=updated_timeline.dict()
-        )
+        updated_timeline = await db.create_or_update_wedding_timeline(timeline, expected_version=_expected_version(timeline))
+        return envelope("Wedding timeline updated successfully", updated_timeline)
+    except VersionConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,99 @@
+import re
+import unicodedata
+from typing import Any, Dict, List
+
+# Prefixes shorter than this are too unselective to be worth indexing
+MIN_PREFIX_LENGTH = 2
+# Longer query tokens are truncated to the longest stored prefix
+MAX_PREFIX_LENGTH = 15
+
+# Relevance weights applied when ranking search results
+NAME_MATCH_WEIGHT = 3
+LOCATION_MATCH_WEIGHT = 1
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and strip accents so 'Café' and 'cafe' match"""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized alphanumeric tokens, preserving order"""
+    return _TOKEN_RE.findall(normalize_text(text))
+
+
+def _prefixes(token: str) -> List[str]:
+    upper = min(len(token), MAX_PREFIX_LENGTH)
+    if upper < MIN_PREFIX_LENGTH:
+        return [token]
+    return [token[:i] for i in range(MIN_PREFIX_LENGTH, upper + 1)]
+
+
+def build_search_fields(name: str, location: str) -> Dict[str, List[str]]:
+    """Derive the indexed search fields stored alongside a venue document.
+
+    `search_terms` holds every edge n-gram of every name/location token and
+    carries the multikey index used for matching. `search_name` and
+    `search_location` keep the whole tokens for relevance ranking.
+    """
+    name_tokens = tokenize(name)
+    location_tokens = tokenize(location)
+
+    terms = set()
+    for token in name_tokens + location_tokens:
+        terms.update(_prefixes(token))
+
+    return {
+        "search_terms": sorted(terms),
+        "search_name": sorted(set(name_tokens)),
+        "search_location": sorted(set(location_tokens)),
+    }
+
+
+def query_terms(search_query: str) -> List[str]:
+    """Turn a user search string into the terms matched against `search_terms`"""
+    terms = []
+    for token in tokenize(search_query):
+        token = token[:MAX_PREFIX_LENGTH]
+        # Single characters match almost everything and are not indexed as prefixes
+        if len(token) < MIN_PREFIX_LENGTH:
+            continue
+        if token not in terms:
+            terms.append(token)
+    return terms
+
+
+def search_filter(terms: List[str]) -> Dict[str, Any]:
+    """Every query term must be a prefix of some name or location token.
+
+    A query with no usable terms (e.g. "a" or "5") matches nothing rather
+    than the whole catalog.
+    """
+    if not terms:
+        return {"search_terms": {"$in": []}}
+    if len(terms) == 1:
+        return {"search_terms": terms[0]}
+    return {"search_terms": {"$all": terms}}
+
+
+def relevance_stage(terms: List[str]) -> Dict[str, Any]:
+    """$addFields stage scoring whole-word hits, weighting name over location"""
+    return {
+        "$addFields": {
+            "_score": {
+                "$add": [
+                    {"$multiply": [
+                        NAME_MATCH_WEIGHT,
+                        {"$size": {"$setIntersection": [{"$ifNull": ["$search_name", []]}, terms]}}
+                    ]},
+                    {"$multiply": [
+                        LOCATION_MATCH_WEIGHT,
+                        {"$size": {"$setIntersection": [{"$ifNull": ["$search_location", []]}, terms]}}
+                    ]}
+                ]
+            }
+        }
+    }
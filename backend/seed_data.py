@@ -1,11 +1,434 @@
-from database import initialize_database
+"""Seed data for development and performance testing.
+
+    python seed_data.py                 # the demo halls, services and FAQs
+    python seed_data.py --synthetic --venues 200000 --users 200000 --bookings 400000 \\
+        --guest-lists 2000 --tickets 20000 --processes 4 --drop
+
+Synthetic data is deterministic: every id is derived from --seed and the row
+number, so bookings, guest lists and tickets can reference venues and users
+without holding them in memory, and two runs with the same seed produce
+identical data. Documents are streamed to Mongo in unordered insert_many
+batches, and --processes splits every collection's rows between that many
+generator processes.
+"""
+from database import (
+    FAQS_CACHE_KEY, SERVICES_CACHE_KEY, SERVICES_CARD_CACHE_KEY, Database, database_from_env, event_day,
+    venue_document
+)
+import argparse
 import asyncio
+import multiprocessing
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import BulkWriteError
 from models import *
+from pool import client_options_from_env
+
+DEFAULT_BATCH_SIZE = 1000
+DUPLICATE_KEY = 11000
+
+# Collections a synthetic load replaces when run with --drop
+SEEDED_COLLECTIONS = (
+    "users", "venues", "bookings", "venue_reservations", "services", "wedding_budgets",
+    "guest_lists", "wedding_timelines", "support_tickets", "support_messages", "faqs"
+)
+
+LOCALITIES = [
+    ("Banjara Hills", "500034"), ("Jubilee Hills", "500033"), ("Gachibowli", "500032"),
+    ("Madhapur", "500081"), ("Kondapur", "500084"), ("Kukatpally", "500072"),
+    ("Ameerpet", "500016"), ("Begumpet", "500016"), ("Secunderabad", "500003"),
+    ("Dilsukhnagar", "500060"), ("LB Nagar", "500074"), ("Uppal", "500039"),
+    ("Mehdipatnam", "500028"), ("Tolichowki", "500008"), ("Attapur", "500048"),
+    ("Chandrayangutta", "500005"), ("Bandlaguda Jagir", "500086"), ("Miyapur", "500049"),
+    ("Kompally", "500014"), ("Shamshabad", "501218"),
+]
+NAME_PREFIXES = ["Sri", "Royal", "Golden", "Grand", "Lakshmi", "Imperial", "Marigold", "Pearl", "Nizam", "Silver"]
+NAME_SUFFIXES = ["Function Hall", "Convention", "Banquet", "Gardens", "Palace", "Kalyana Mandapam", "Event Centre"]
+AMENITIES = ["Air Conditioning", "Parking", "Sound System", "Stage", "Green Rooms", "Catering", "Generator", "Valet", "Lawn"]
+FIRST_NAMES = ["Aarav", "Ananya", "Farhan", "Kavya", "Rahul", "Sana", "Vikram", "Priya", "Imran", "Divya"]
+LAST_NAMES = ["Reddy", "Rao", "Khan", "Sharma", "Naidu", "Ali", "Gupta", "Varma", "Siddiqui", "Iyer"]
+RELATIONS = ["Family", "Friend", "Colleague", "Neighbour"]
+
+# Bounding box of greater Hyderabad
+LAT_RANGE = (17.25, 17.55)
+LNG_RANGE = (78.30, 78.62)
+
+
+class Scale(NamedTuple):
+    venues: int = 1000
+    users: int = 1000
+    bookings: int = 1000
+    guest_lists: int = 100
+    guests_per_list: int = 100
+    tickets: int = 200
+    messages_per_ticket: int = 5
+
+
+class SyntheticDataset:
+    """Generates each collection's documents for one scale and seed"""
+
+    # Collection -> (Scale field giving its row count, method generating row n)
+    ROWS = {
+        "venues": ("venues", "venue"),
+        "users": ("users", "user"),
+        "bookings": ("bookings", "booking"),
+        "venue_reservations": ("bookings", "reservation"),
+        "guest_lists": ("guest_lists", "guest_list"),
+        "support_tickets": ("tickets", "ticket"),
+        "support_messages": ("tickets", "messages"),
+    }
+
+    def __init__(self, scale: Scale, seed: int = 42):
+        self.scale = scale
+        self.seed = seed
+        self.namespace = uuid.uuid5(uuid.NAMESPACE_URL, f"hallbook-bench:{seed}")
+        self.epoch = datetime(2025, 1, 1)
+
+    def id(self, kind: str, number: int) -> str:
+        return str(uuid.uuid5(self.namespace, f"{kind}:{number}"))
+
+    def _rng(self, kind: str, number: int) -> random.Random:
+        return random.Random(f"{self.seed}:{kind}:{number}")
+
+    def _phone(self, rng: random.Random) -> str:
+        return f"+91 9{rng.randrange(10 ** 9):09d}"
+
+    def _venue_identity(self, rng: random.Random, number: int):
+        locality, pincode = rng.choice(LOCALITIES)
+        name = f"{rng.choice(NAME_PREFIXES)} {rng.choice(NAME_SUFFIXES)} {number}"
+        return name, locality, pincode
 
-async def seed_venues():
+    def venue(self, number: int) -> Dict[str, Any]:
+        rng = self._rng("venue", number)
+        name, locality, pincode = self._venue_identity(rng, number)
+        lat, lng = rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE)
+        created = self.epoch + timedelta(minutes=number)
+        # Stored exactly as create_venue stores it, search and geo fields included
+        return venue_document(Venue(
+            id=self.id("venue", number),
+            name=name,
+            location=locality,
+            pincode=pincode,
+            coordinates=Coordinates(lat=lat, lng=lng),
+            price=float(rng.randrange(20, 300) * 1000),
+            capacity=rng.randrange(100, 2000, 50),
+            rating=round(rng.uniform(3.0, 5.0), 1),
+            reviews=rng.randrange(0, 500),
+            availability=rng.choices(["available", "booked", "maintenance"], [85, 10, 5])[0],
+            images=[f"https://images.example.com/venues/{number}/{i}.jpg" for i in range(rng.randrange(2, 7))],
+            amenities=rng.sample(AMENITIES, rng.randrange(3, len(AMENITIES))),
+            description=f"{name} in {locality}, ideal for weddings, receptions and family functions.",
+            contact=ContactInfo(phone=self._phone(rng), email=f"venue{number}@example.com"),
+            created_at=created,
+            updated_at=created
+        ))
+
+    def user(self, number: int) -> Dict[str, Any]:
+        rng = self._rng("user", number)
+        created = self.epoch + timedelta(minutes=number)
+        return {
+            "id": self.id("user", number),
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "phone": self._phone(rng),
+            "email": f"user{number}@example.com",
+            "profile_image": None,
+            "created_at": created,
+            "updated_at": created,
+        }
+
+    def booking(self, number: int) -> Dict[str, Any]:
+        # Booking n takes venue n % venues on day n // venues, so (venue, day) never repeats
+        rng = self._rng("booking", number)
+        venue_number = number % self.scale.venues
+        venue_name, venue_location, _ = self._venue_identity(self._rng("venue", venue_number), venue_number)
+        event_date = self.epoch + timedelta(days=30 + number // self.scale.venues)
+        created = self.epoch + timedelta(seconds=number)
+        return {
+            "id": self.id("booking", number),
+            "user_id": self.id("user", rng.randrange(self.scale.users)),
+            "venue_id": self.id("venue", venue_number),
+            "venue_name": venue_name,
+            "venue_location": venue_location,
+            "event_date": event_date,
+            "guest_count": rng.randrange(50, 1500),
+            "total_amount": float(rng.randrange(20, 300) * 1000),
+            "booking_date": created,
+            "status": self._booking_status(number),
+            "services": [],
+            "special_requests": None,
+            "created_at": created,
+            "updated_at": created,
+        }
+
+    def _booking_status(self, number: int) -> str:
+        # Its own stream, so reservation() can check it without building the booking
+        rng = self._rng("booking_status", number)
+        return rng.choices(["pending", "confirmed", "cancelled", "completed"], [30, 50, 10, 10])[0]
+
+    def reservation(self, number: int) -> Optional[Dict[str, Any]]:
+        """The venue_reservations entry booking(number) holds; cancelled bookings hold none"""
+        if self._booking_status(number) == "cancelled":
+            return None
+        event_date = self.epoch + timedelta(days=30 + number // self.scale.venues)
+        return {
+            "venue_id": self.id("venue", number % self.scale.venues),
+            "event_day": event_day(event_date),
+            "booking_id": self.id("booking", number),
+            "created_at": self.epoch + timedelta(seconds=number),
+        }
+
+    def guest_list(self, number: int) -> Dict[str, Any]:
+        rng = self._rng("guest_list", number)
+        guests = [
+            {
+                "id": self.id(f"guest:{number}", i),
+                "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "relation": rng.choice(RELATIONS),
+                "phone": self._phone(rng),
+                "address": None,
+                "category": rng.choice(["Family", "Friends", "Work"]),
+                "invited": rng.random() < 0.7,
+                "confirmed": rng.random() < 0.4,
+            }
+            for i in range(self.scale.guests_per_list)
+        ]
+        return {
+            "id": self.id("guest_list", number),
+            "user_id": self.id("user", number),
+            "guests": guests,
+            "version": 1,
+            "created_at": self.epoch,
+            "updated_at": self.epoch,
+        }
+
+    def ticket(self, number: int) -> Dict[str, Any]:
+        created = self.epoch + timedelta(hours=number)
+        return {
+            "id": self.id("ticket", number),
+            "user_id": self.id("user", number % self.scale.users),
+            "subject": f"Question about booking {number}",
+            "status": "open",
+            "messages": [],
+            "message_count": self.scale.messages_per_ticket,
+            "last_seq": self.scale.messages_per_ticket,
+            "created_at": created,
+            "updated_at": created,
+        }
+
+    def messages(self, number: int) -> List[Dict[str, Any]]:
+        ticket_id = self.id("ticket", number)
+        created = self.epoch + timedelta(hours=number)
+        return [
+            {
+                "id": self.id(f"message:{number}", i),
+                "ticket_id": ticket_id,
+                "user_id": None if i % 2 else self.id("user", number % self.scale.users),
+                "message": f"Message {i} on ticket {number}",
+                "sender_type": "agent" if i % 2 else "user",
+                "timestamp": created + timedelta(minutes=i),
+                "seq": i + 1,
+            }
+            for i in range(self.scale.messages_per_ticket)
+        ]
+
+    def rows(self, collection: str) -> int:
+        if collection == "guest_lists":
+            # At most one list per user
+            return min(self.scale.guest_lists, self.scale.users)
+        return getattr(self.scale, self.ROWS[collection][0])
+
+    def documents(self, collection: str, start: int, stop: int) -> Iterator[Dict[str, Any]]:
+        """The documents for rows start..stop-1 of a ROWS collection"""
+        make = getattr(self, self.ROWS[collection][1])
+        for number in range(start, stop):
+            doc = make(number)
+            if isinstance(doc, list):
+                yield from doc
+            elif doc is not None:
+                yield doc
+
+    def services(self) -> List[Dict[str, Any]]:
+        names = ["Catering", "Decoration", "Photography", "Music & DJ", "Mehendi", "Makeup", "Transport", "Priest"]
+        return [
+            {
+                "id": self.id("service", s),
+                "name": name,
+                "icon": name.lower().split()[0],
+                "providers": [
+                    {
+                        "id": self.id(f"provider:{s}", p),
+                        "name": f"{name} Provider {p}",
+                        "rating": round(3.5 + (p % 15) / 10, 1),
+                        "price_range": f"₹{(p + 1) * 5000}-{(p + 2) * 5000}",
+                        "speciality": f"{name} for weddings",
+                        "services": [f"{name} package {k}" for k in range(3)],
+                        "contact": {"phone": f"+91 98{s:02d}{p:06d}", "email": f"provider{s}-{p}@example.com"},
+                    }
+                    for p in range(6)
+                ],
+            }
+            for s, name in enumerate(names)
+        ]
+
+    def faqs(self) -> List[Dict[str, Any]]:
+        topics = [
+            ("How do I book a function hall?", "Pick a hall, choose a date and services, and confirm the booking."),
+            ("Can I cancel my booking?", "Yes. Full refund 7 days prior, 50% for 3-7 days, none within 3 days."),
+            ("What payment methods do you accept?", "UPI, credit and debit cards, and net banking."),
+            ("Are the prices negotiable?", "Prices are fixed to keep them transparent."),
+            ("Do you provide catering services?", "Yes, including traditional Hyderabadi cuisine."),
+            ("Is parking available at venues?", "Most venues list parking under amenities."),
+        ]
+        return [
+            {"id": self.id("faq", i), "question": q, "answer": a, "category": "general", "order": i}
+            for i, (q, a) in enumerate(topics)
+        ]
+
+
+def _batches(docs: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch = []
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def _insert_batch(collection, batch: List[Dict[str, Any]]) -> int:
+    try:
+        result = await collection.insert_many(batch, ordered=False)
+    except BulkWriteError as e:
+        # Rows an earlier run with the same seed already inserted are skipped;
+        # unordered inserts still write the rest of the batch
+        if e.details.get("writeConcernErrors") or any(
+            error.get("code") != DUPLICATE_KEY for error in e.details.get("writeErrors", [])
+        ):
+            raise
+        return e.details.get("nInserted", 0)
+    return len(result.inserted_ids)
+
+
+async def insert_documents(collection, docs: Iterator[Dict[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Write docs in unordered insert_many batches and return how many were inserted.
+
+    Each batch is written on Motor's executor while the next one is
+    generated, so generation and the round trip overlap.
+    """
+    inserted = 0
+    pending = None
+    for batch in _batches(docs, batch_size):
+        if pending is not None:
+            inserted += await pending
+        pending = asyncio.ensure_future(_insert_batch(collection, batch))
+        # Let the insert start before generating the next batch
+        await asyncio.sleep(0)
+    if pending is not None:
+        inserted += await pending
+    return inserted
+
+
+async def _insert_rows(
+    database,
+    dataset: SyntheticDataset,
+    batch_size: int,
+    part: int = 0,
+    parts: int = 1,
+    log=None
+) -> Dict[str, int]:
+    """Insert part `part` of `parts` equal row ranges of every ROWS collection"""
+    counts = {}
+    for collection in SyntheticDataset.ROWS:
+        rows = dataset.rows(collection)
+        start, stop = rows * part // parts, rows * (part + 1) // parts
+        started = time.perf_counter()
+        counts[collection] = await insert_documents(
+            database[collection], dataset.documents(collection, start, stop), batch_size
+        )
+        if log:
+            log(f"seeded {counts[collection]:>9} {collection} in {time.perf_counter() - started:.1f}s")
+    return counts
+
+
+async def _seed_part(mongo_url: str, db_name: str, scale: Scale, seed: int, batch_size: int, part: int, parts: int):
+    # A plain client: the Database's slow-query log would report every batch
+    client = AsyncIOMotorClient(mongo_url, **client_options_from_env())
+    try:
+        return await _insert_rows(client[db_name], SyntheticDataset(scale, seed=seed), batch_size, part, parts)
+    finally:
+        client.close()
+
+
+def _seed_part_process(*args) -> Dict[str, int]:
+    return asyncio.run(_seed_part(*args))
+
+
+async def seed_synthetic(
+    db: Database,
+    dataset: SyntheticDataset,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    processes: int = 1,
+    drop: bool = False,
+    log=print
+) -> Dict[str, int]:
+    """Load a synthetic dataset, then build the indexes.
+
+    After drop, indexes are built after the load, which is much faster than
+    maintaining them during millions of inserts. Without drop, the unique
+    indexes are built first, so rows already present from an earlier run with
+    the same seed, including one interrupted before its indexes were built,
+    are skipped rather than inserted twice. With processes > 1, each process
+    generates and inserts its share of every collection through its own
+    client to db.mongo_url.
+    """
+    if drop:
+        for name in SEEDED_COLLECTIONS:
+            await db.db.drop_collection(name)
+    else:
+        failed = await db.ensure_indexes(unique_only=True)
+        if failed:
+            raise RuntimeError(f"Unique indexes could not be built, so existing rows would be duplicated: {failed}")
+
+    started = time.perf_counter()
+    if processes > 1:
+        loop = asyncio.get_running_loop()
+        # Spawned rather than forked: the parent's Motor client is not fork-safe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+            parts = await asyncio.gather(*(
+                loop.run_in_executor(
+                    pool, _seed_part_process, db.mongo_url, db.db.name, dataset.scale, dataset.seed,
+                    batch_size, part, processes
+                )
+                for part in range(processes)
+            ))
+        counts = {collection: sum(part[collection] for part in parts) for collection in SyntheticDataset.ROWS}
+        for collection, count in counts.items():
+            log(f"seeded {count:>9} {collection}")
+    else:
+        counts = await _insert_rows(db.db, dataset, batch_size, log=log)
+    counts["services"] = await insert_documents(db.services, iter(dataset.services()), batch_size)
+    counts["faqs"] = await insert_documents(db.faqs, iter(dataset.faqs()), batch_size)
+    await db.cache.delete(SERVICES_CACHE_KEY, SERVICES_CARD_CACHE_KEY, FAQS_CACHE_KEY)
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    log(f"seeded {total} documents in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f} docs/s)")
+
+    started = time.perf_counter()
+    failed = await db.ensure_indexes()
+    log(f"built indexes in {time.perf_counter() - started:.1f}s" + (f" (failed: {failed})" if failed else ""))
+    return counts
+
+
+
+async def seed_venues(db: Database):
     """Seed initial venue data"""
-    db = initialize_database()
-    
     venues_data = [
         VenueCreate(
             name="R K Function Hall",
@@ -69,15 +492,13 @@ async def seed_venues():
         )
     ]
     
-    for venue_data in venues_data:
-        await db.create_venue(venue_data)
+    docs = [venue_document(Venue(**venue_data.dict())) for venue_data in venues_data]
+    await insert_documents(db.venues, iter(docs))
     
     print("Venues seeded successfully!")
 
-async def seed_services():
+async def seed_services(db: Database):
     """Seed initial service data"""
-    db = initialize_database()
-    
     services_data = [
         Service(
             name="Catering Services",
@@ -153,12 +574,12 @@ async def seed_services():
         )
     ]
     
-    for service in services_data:
-        await db.create_service(service)
+    await insert_documents(db.services, (service.dict() for service in services_data))
+    await db.cache.delete(SERVICES_CACHE_KEY, SERVICES_CARD_CACHE_KEY)
     
     print("Services seeded successfully!")
 
-async def seed_faqs():
+async def seed_faqs(db: Database):
     """Seed FAQ data"""
     faqs_data = [
         FAQ(
@@ -199,20 +620,70 @@ async def seed_faqs():
         )
     ]
     
-    for faq in faqs_data:
-        await db.create_faq(faq)
+    await insert_documents(db.faqs, (faq.dict() for faq in faqs_data))
+    await db.cache.delete(FAQS_CACHE_KEY)
     
     print("FAQs seeded successfully!")
 
+
 async def seed_all():
     """Seed all initial data"""
+    db = database_from_env()
     try:
-        await seed_venues()
-        await seed_services()
-        await seed_faqs()
+        await seed_venues(db)
+        await seed_services(db)
+        await seed_faqs(db)
         print("All seed data created successfully!")
     except Exception as e:
         print(f"Error seeding data: {e}")
+    finally:
+        await db.close()
+
+
+async def seed_scale(scale: Scale, seed: int, batch_size: int, processes: int, drop: bool):
+    """Seed a synthetic dataset into MONGO_URL / DB_NAME"""
+    db = database_from_env()
+    try:
+        await seed_synthetic(
+            db, SyntheticDataset(scale, seed=seed), batch_size=batch_size, processes=processes, drop=drop
+        )
+    finally:
+        await db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", action="store_true", help="Generate a synthetic dataset instead of the demo data")
+    defaults = Scale()
+    parser.add_argument("--venues", type=int, default=defaults.venues)
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--bookings", type=int, default=defaults.bookings)
+    parser.add_argument("--guest-lists", type=int, default=defaults.guest_lists)
+    parser.add_argument("--guests-per-list", type=int, default=defaults.guests_per_list)
+    parser.add_argument("--tickets", type=int, default=defaults.tickets)
+    parser.add_argument("--messages-per-ticket", type=int, default=defaults.messages_per_ticket)
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic dataset")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Documents per insert_many")
+    parser.add_argument("--processes", type=int, default=1, help="Generator processes, each with its own client")
+    parser.add_argument("--drop", action="store_true", help="Drop the seeded collections first")
+    args = parser.parse_args()
+
+    if not args.synthetic:
+        asyncio.run(seed_all())
+        return
+    if min(args.venues, args.users, args.tickets, args.batch_size, args.processes) < 1:
+        parser.error("--venues, --users, --tickets, --batch-size and --processes must be at least 1")
+    scale = Scale(
+        venues=args.venues,
+        users=args.users,
+        bookings=args.bookings,
+        guest_lists=args.guest_lists,
+        guests_per_list=args.guests_per_list,
+        tickets=args.tickets,
+        messages_per_ticket=args.messages_per_ticket
+    )
+    asyncio.run(seed_scale(scale, args.seed, args.batch_size, args.processes, args.drop))
+
 
 if __name__ == "__main__":
-    asyncio.run(seed_all())
\ No newline at end of file
+    main()
@@ -0,0 +1,74 @@
+import time
+from typing import Any, Optional
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from documents import ReadView
+from metrics import record_serialization
+
+
+def _default(value: Any) -> Any:
+    # Read views are already plain documents; models are dumped by pydantic-core
+    # without re-validation. orjson encodes datetimes, dates and enums natively
+    if isinstance(value, ReadView):
+        return value.doc
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson; accepts Pydantic models anywhere in the content"""
+
+    def render(self, content: Any) -> bytes:
+        started = time.perf_counter()
+        body = dumps(content)
+        record_serialization(time.perf_counter() - started)
+        return body
+
+
+def envelope(message: str, data: Any = None, success: bool = True, **extra: Any) -> FastJSONResponse:
+    """Build the APIResponse envelope straight from models, skipping response_model validation.
+
+    Extra keyword arguments become top-level fields, e.g. the PaginatedResponse
+    page metadata.
+    """
+    return FastJSONResponse({"success": success, "message": message, "data": data, **extra})
+
+
+def paginated_envelope(
+    message: str,
+    data: list,
+    total: int,
+    per_page: int,
+    page: int = 1,
+    next_cursor: Optional[str] = None
+) -> FastJSONResponse:
+    """PaginatedResponse envelope with total_pages derived from total and per_page"""
+    return envelope(
+        message,
+        data,
+        total=total,
+        page=page,
+        per_page=per_page,
+        total_pages=(total + per_page - 1) // per_page,
+        next_cursor=next_cursor
+    )
+
+
+def json_envelope(message: str, data_json: bytes, success: bool = True) -> Response:
+    """Wrap pre-serialized JSON data in the APIResponse envelope without re-encoding it"""
+    body = b"".join([
+        b'{"success":', b"true" if success else b"false",
+        b',"message":', orjson.dumps(message),
+        b',"data":', data_json,
+        b"}"
+    ])
+    return Response(content=body, media_type="application/json")
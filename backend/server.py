@@ -1,23 +1,83 @@
-from fastapi import FastAPI, APIRouter
+from fastapi import FastAPI, APIRouter, Depends, HTTPException
+from fastapi.responses import Response
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from contextlib import asynccontextmanager
 import os
+import asyncio
 import logging
 from pathlib import Path
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# Initialize database
-from database import initialize_database
-db = initialize_database()
+from database import Database, database_from_env
+from dependencies import get_db
+from indexes import missing_user_unique
+from serialization import FastJSONResponse
+from http_cache import CompressionMiddleware
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, METRICS_ENABLED, REGISTRY, MetricsMiddleware
 
 # Import routes
-from routes import venues, users, bookings, services, wedding_tools, support
+from routes import venues, users, bookings, services, wedding_tools, support, admin
+
+# Seconds shutdown waits for in-flight Mongo commands before closing the client
+DRAIN_TIMEOUT_SECONDS = float(os.environ.get("DRAIN_TIMEOUT_SECONDS", 10))
+
+async def prepare_database(db: Database):
+    """Indexes, one-off backfills and the FAQ index, run once per worker before it serves"""
+    failed = await db.ensure_indexes()
+    missing = missing_user_unique(failed)
+    if missing:
+        # Without them a stale-version save inserts a second document instead
+        # of conflicting, so versioned writes would lose updates
+        raise RuntimeError(
+            f"Unique user_id indexes could not be built: {missing}. Duplicate planning documents "
+            "from older releases are the usual cause; archive them with "
+            "`python migrate.py archive-duplicate-user-documents`, then restart."
+        )
+    if failed:
+        logger.error(f"Index provisioning failed: {failed}")
+    drift = await db.index_drift()
+    if drift:
+        logger.warning(f"Index drift detected: {drift}")
+    backfilled = await db.backfill_venue_derived_fields()
+    if backfilled:
+        logger.info(f"Backfilled search and geo fields on {backfilled} venues")
+    reservations = await db.backfill_venue_reservations()
+    if reservations["claimed"] or reservations["conflicts"]:
+        logger.info(f"Backfilled venue reservations: {reservations}")
+    if await db.support_tickets.find_one({"messages.0": {"$exists": True}}, {"_id": 1}):
+        migrated = await db.migrate_embedded_ticket_messages()
+        logger.info(f"Moved {migrated} embedded support messages to support_messages")
+    if await db.support_messages.find_one({"seq": {"$exists": False}}, {"_id": 1}):
+        numbered = await db.backfill_message_seq()
+        logger.info(f"Numbered {numbered} support messages")
+    indexed_faqs = await db.build_faq_index()
+    logger.info(f"Indexed {indexed_faqs} FAQs for the support bot")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Created here rather than at import, so with --preload or --workers every
+    # process opens its own Motor client after the fork
+    logger.info(f"Hyderabad HallBook API starting up (pid {os.getpid()})...")
+    db = database_from_env()
+    app.state.db = db
+    try:
+        await prepare_database(db)
+        yield
+    finally:
+        # The server has stopped accepting requests and waited for open ones
+        logger.info("Hyderabad HallBook API shutting down...")
+        await db.close(drain_timeout=DRAIN_TIMEOUT_SECONDS)
 
 # Create the main app without a prefix
-app = FastAPI(title="Hyderabad HallBook API", version="1.0.0")
+app = FastAPI(
+    title="Hyderabad HallBook API",
+    version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
+)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -29,6 +89,7 @@ api_router.include_router(bookings.router)
 api_router.include_router(services.router)
 api_router.include_router(wedding_tools.router)
 api_router.include_router(support.router)
+api_router.include_router(admin.router)
 
 # Health check endpoint
 @api_router.get("/")
@@ -37,11 +98,51 @@ async def root():
 
 @api_router.get("/health")
 async def health_check():
+    """Liveness: the process is serving requests; never touches the database"""
     return {"status": "healthy", "service": "hyderabad-hallbook-api"}
 
+# Deadline for the readiness ping, and how many queued checkouts an exhausted
+# pool may have before the instance reports itself not ready
+READY_TIMEOUT_SECONDS = float(os.environ.get("READY_TIMEOUT_SECONDS", 2.0))
+READY_MAX_POOL_WAITERS = int(os.environ.get("READY_MAX_POOL_WAITERS", 10))
+
+@api_router.get("/ready")
+async def readiness_check(db: Database = Depends(get_db)):
+    """Readiness: Mongo's primary answers a ping in time and the connection pool is not exhausted"""
+    checks = {"pool": db.pool_stats.stats()}
+    ready = True
+    try:
+        checks["mongo_ping_ms"] = round(await db.ping(READY_TIMEOUT_SECONDS), 3)
+    except asyncio.TimeoutError:
+        ready = False
+        checks["mongo_error"] = f"ping timed out after {READY_TIMEOUT_SECONDS}s"
+    except Exception as e:
+        ready = False
+        checks["mongo_error"] = str(e)
+    if db.pool_stats.exhausted(READY_MAX_POOL_WAITERS):
+        ready = False
+        checks["pool_error"] = "connection pool exhausted"
+    return FastJSONResponse(
+        {"status": "ready" if ready else "not ready", **checks},
+        status_code=200 if ready else 503
+    )
+
+@api_router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Request and Mongo command metrics in Prometheus text format"""
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(content=REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
 # Include the router in the main app
 app.include_router(api_router)
 
+app.add_middleware(CompressionMiddleware)
+
+# Wraps compression, so request latency includes gzip time
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -56,12 +157,3 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
-
-@app.on_event("startup")
-async def startup_event():
-    logger.info("Hyderabad HallBook API starting up...")
-    
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.info("Hyderabad HallBook API shutting down...")
-    await db.close()
\ No newline at end of file
@@ -0,0 +1,316 @@
+import logging
+import os
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import orjson
+from pymongo import monitoring
+from metrics import current_method
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOW_QUERY_MS = 100.0
+# Fraction of slow operations whose shape is considered for explain
+DEFAULT_EXPLAIN_SAMPLE_RATE = 0.25
+DEFAULT_EXPLAINS_PER_MINUTE = 6
+# A shape is explained again only after this long
+EXPLAIN_COOLDOWN_SECONDS = 600
+# The report covers slow operations seen in this window
+REPORT_WINDOW_SECONDS = 3600
+MAX_SHAPES = 500
+MAX_SAMPLES_PER_SHAPE = 1000
+
+# Read commands explain can run without side effects
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct"}
+# Session and transport fields explain rejects or does not need
+_UNEXPLAINABLE_FIELDS = {"lsid", "txnNumber", "readConcern", "writeConcern", "$db", "$clusterTime", "$readPreference"}
+# Plan stages that read an index rather than the whole collection
+_INDEX_STAGES = {"IXSCAN", "COUNT_SCAN", "DISTINCT_SCAN", "IDHACK", "EXPRESS_IXSCAN", "GEO_NEAR_2DSPHERE", "TEXT_MATCH"}
+
+
+# Keys whose values are expressions, where "$field" strings are field paths
+_EXPRESSION_KEYS = {"$expr"}
+# Keys whose values are queries or literals, where "$..." strings are user data
+_LITERAL_KEYS = {"$match", "$literal"}
+
+
+def _in_expression(key: str, expressions: bool) -> bool:
+    if key in _EXPRESSION_KEYS:
+        return True
+    if key in _LITERAL_KEYS:
+        return False
+    return expressions
+
+
+def redact(value: Any, expressions: bool = False) -> Any:
+    """Replace literal values with "?", keeping field names and operators.
+
+    "$field" paths are kept only where they are expressions (aggregation
+    pipelines and $expr); in queries, $match and $literal a string starting
+    with "$" is a literal like any other. Lists of sub-documents ($and, $or,
+    pipelines) keep their structure; lists of values collapse to a single "?".
+    """
+    if isinstance(value, dict):
+        return {key: redact(item, _in_expression(key, expressions)) for key, item in value.items()}
+    if isinstance(value, list):
+        if value and all(isinstance(item, dict) for item in value):
+            return [redact(item, expressions) for item in value]
+        return "?"
+    if expressions and isinstance(value, str) and value.startswith("$"):
+        return value
+    return "?"
+
+
+def query_shape(command_name: str, command: Dict[str, Any]) -> Dict[str, Any]:
+    """The redacted parts of a command that identify its query pattern"""
+    if command_name == "find":
+        return {"filter": redact(command.get("filter", {})), "sort": list(command.get("sort", {}))}
+    if command_name == "aggregate":
+        return {"pipeline": redact(command.get("pipeline", []), expressions=True)}
+    if command_name in ("count", "distinct"):
+        return {"query": redact(command.get("query", {})), "key": command.get("key")}
+    if command_name == "findAndModify":
+        update = command.get("update", {})
+        # A pipeline update uses expressions; a classic one sets literals
+        return {"query": redact(command.get("query", {})), "update": redact(update, isinstance(update, list))}
+    if command_name in ("update", "delete"):
+        statements = command.get(command_name + "s") or [{}]
+        return {"q": redact(statements[0].get("q", {})), "statements": len(statements)}
+    return {}
+
+
+def _collection(command_name: str, command: Dict[str, Any]) -> str:
+    target = command.get(command_name)
+    if isinstance(target, str):
+        return target
+    return str(command.get("collection", ""))
+
+
+def _find_key(document: Any, key: str) -> Optional[Dict[str, Any]]:
+    # Aggregate explains nest the query planner under stages[0].$cursor
+    if isinstance(document, dict):
+        if key in document:
+            return document[key]
+        children = document.values()
+    elif isinstance(document, list):
+        children = document
+    else:
+        return None
+    for child in children:
+        found = _find_key(child, key)
+        if found is not None:
+            return found
+    return None
+
+
+def _plan_stages(plan: Any, stages: List[Tuple[str, Optional[str]]]) -> List[Tuple[str, Optional[str]]]:
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append((plan["stage"], plan.get("indexName")))
+        for key in ("inputStage", "queryPlan"):
+            _plan_stages(plan.get(key), stages)
+        for child in plan.get("inputStages", ()):
+            _plan_stages(child, stages)
+    return stages
+
+
+def summarize_explain(explain: Dict[str, Any]) -> Dict[str, Any]:
+    """Docs examined vs returned and the indexes the winning plan used"""
+    execution = _find_key(explain, "executionStats") or {}
+    planner = _find_key(explain, "queryPlanner") or {}
+    stages = _plan_stages(planner.get("winningPlan"), [])
+    indexes = sorted({index for stage, index in stages if index})
+    return {
+        "docs_examined": execution.get("totalDocsExamined"),
+        "keys_examined": execution.get("totalKeysExamined"),
+        "returned": execution.get("nReturned"),
+        "execution_ms": execution.get("executionTimeMillis"),
+        "index_used": any(stage in _INDEX_STAGES for stage, _ in stages),
+        "indexes": indexes,
+        "plan": [stage for stage, _ in stages],
+        "explained_at": datetime.utcnow(),
+    }
+
+
+class ShapeStats:
+    __slots__ = ("method", "command", "collection", "shape", "samples", "explain", "explained_at")
+
+    def __init__(self, method: str, command: str, collection: str, shape: Dict[str, Any]):
+        self.method = method
+        self.command = command
+        self.collection = collection
+        self.shape = shape
+        # (unix time, milliseconds) of recent slow executions
+        self.samples: Deque[Tuple[float, float]] = deque(maxlen=MAX_SAMPLES_PER_SHAPE)
+        self.explain: Optional[Dict[str, Any]] = None
+        self.explained_at = 0.0
+
+
+class SlowQueryLog(monitoring.CommandListener):
+    """Logs Mongo commands slower than threshold_ms and aggregates them by query shape.
+
+    A sample of slow read shapes is re-run through explain("executionStats")
+    to record docs examined vs returned and index use. Explains run one at a
+    time on a background thread, at most explains_per_minute overall and once
+    per shape per EXPLAIN_COOLDOWN_SECONDS, so a burst of slow queries cannot
+    turn into a burst of extra load.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = DEFAULT_SLOW_QUERY_MS,
+        explain_sample_rate: float = DEFAULT_EXPLAIN_SAMPLE_RATE,
+        explains_per_minute: int = DEFAULT_EXPLAINS_PER_MINUTE
+    ):
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.explains_per_minute = explains_per_minute
+        # Synchronous pymongo client used for explains; set once the Motor client exists
+        self.client = None
+        self.slow_operations = 0
+        self.explains = 0
+        # In-flight commands by (connection, request id): (database, command)
+        self._started: Dict[Tuple[Any, int], Tuple[str, Dict[str, Any]]] = {}
+        self._shapes: "OrderedDict[str, ShapeStats]" = OrderedDict()
+        self._explain_times: Deque[float] = deque()
+        self._explain_pending = False
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name != "explain":
+            self._started[(event.connection_id, event.request_id)] = (event.database_name, event.command)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finished(event)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finished(event)
+
+    def _finished(self, event) -> None:
+        started = self._started.pop((event.connection_id, event.request_id), None)
+        duration_ms = event.duration_micros / 1000
+        if started is None or duration_ms < self.threshold_ms:
+            return
+        database_name, command = started
+        self.record(current_method.get(), event.command_name, database_name, command, duration_ms)
+
+    def record(
+        self,
+        method: str,
+        command_name: str,
+        database_name: str,
+        command: Dict[str, Any],
+        duration_ms: float
+    ) -> None:
+        collection = _collection(command_name, command)
+        shape = query_shape(command_name, command)
+        key = orjson.dumps([method, command_name, collection, shape], option=orjson.OPT_SORT_KEYS).decode()
+        now = time.time()
+        with self._lock:
+            self.slow_operations += 1
+            stats = self._shapes.get(key)
+            if stats is None:
+                stats = self._shapes[key] = ShapeStats(method, command_name, collection, shape)
+                if len(self._shapes) > MAX_SHAPES:
+                    self._shapes.popitem(last=False)
+            else:
+                self._shapes.move_to_end(key)
+            stats.samples.append((now, duration_ms))
+            explain = self._should_explain(stats, command_name, command, now)
+        logger.warning(
+            f"Slow {command_name} on {collection} from {method}: {duration_ms:.1f}ms, "
+            f"shape {key}"
+        )
+        if explain:
+            self._executor.submit(self._explain, stats, key, database_name, command)
+
+    def _should_explain(self, stats: ShapeStats, command_name: str, command: Dict[str, Any], now: float) -> bool:
+        # Called with the lock held
+        if self.client is None or command_name not in EXPLAINABLE_COMMANDS or self._explain_pending:
+            return False
+        if command_name == "aggregate" and any("$out" in stage or "$merge" in stage for stage in command.get("pipeline", [])):
+            return False
+        if now - stats.explained_at < EXPLAIN_COOLDOWN_SECONDS or random.random() >= self.explain_sample_rate:
+            return False
+        while self._explain_times and now - self._explain_times[0] > 60:
+            self._explain_times.popleft()
+        if len(self._explain_times) >= self.explains_per_minute:
+            return False
+        self._explain_times.append(now)
+        stats.explained_at = now
+        self._explain_pending = True
+        return True
+
+    def _explain(self, stats: ShapeStats, key: str, database_name: str, command: Dict[str, Any]) -> None:
+        explained = {field: value for field, value in command.items() if field not in _UNEXPLAINABLE_FIELDS}
+        try:
+            result = self.client[database_name].command(
+                {"explain": explained, "verbosity": "executionStats"}
+            )
+            summary = summarize_explain(result)
+        except Exception as e:
+            logger.warning(f"Explain failed for slow query shape {key}: {e}")
+            return
+        finally:
+            with self._lock:
+                self._explain_pending = False
+        with self._lock:
+            stats.explain = summary
+            self.explains += 1
+        logger.warning(
+            f"Explain for {stats.method} ({stats.command} on {stats.collection}): "
+            f"examined {summary['docs_examined']} docs / {summary['keys_examined']} keys, "
+            f"returned {summary['returned']}, "
+            f"index used: {', '.join(summary['indexes']) if summary['index_used'] else 'none'}"
+        )
+
+    def report(self, limit: int = 20, window_seconds: float = REPORT_WINDOW_SECONDS) -> Dict[str, Any]:
+        """Query shapes ranked by total slow time within the window"""
+        cutoff = time.time() - window_seconds
+        rows = []
+        with self._lock:
+            for stats in self._shapes.values():
+                recent = [ms for seen, ms in stats.samples if seen >= cutoff]
+                if not recent:
+                    continue
+                rows.append({
+                    "method": stats.method,
+                    "command": stats.command,
+                    "collection": stats.collection,
+                    "shape": stats.shape,
+                    "count": len(recent),
+                    "total_ms": round(sum(recent), 1),
+                    "mean_ms": round(sum(recent) / len(recent), 1),
+                    "max_ms": round(max(recent), 1),
+                    "last_seen": datetime.utcfromtimestamp(stats.samples[-1][0]),
+                    "explain": stats.explain,
+                })
+            totals = {"slow_operations": self.slow_operations, "explains": self.explains}
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return {
+            "threshold_ms": self.threshold_ms,
+            "window_seconds": window_seconds,
+            **totals,
+            "shapes": rows[:limit],
+        }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def build_slow_query_log() -> SlowQueryLog:
+    """Create the slow-query log configured by SLOW_QUERY_MS (0 disables it)"""
+    return SlowQueryLog(
+        threshold_ms=float(os.environ.get("SLOW_QUERY_MS", DEFAULT_SLOW_QUERY_MS)),
+        explain_sample_rate=float(os.environ.get("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", DEFAULT_EXPLAIN_SAMPLE_RATE)),
+        explains_per_minute=int(os.environ.get("SLOW_QUERY_EXPLAINS_PER_MINUTE", DEFAULT_EXPLAINS_PER_MINUTE))
+    )
@@ -0,0 +1,21 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Backend modules import each other as top-level modules, as they do under `python server.py`
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """A Database on the in-memory Motor stand-in, with the registered indexes built"""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    import database
+    monkeypatch.setattr(database, "AsyncIOMotorClient", mongomock_motor.AsyncMongoMockClient)
+    db = database.Database("mongodb://localhost:27017", "hallbook_test")
+    asyncio.run(db.ensure_indexes())
+    return db
@@ -0,0 +1,123 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from database import BookingConflictError, event_day
+from models import BookingCreate, BookingStatus, ContactInfo, Coordinates, VenueCreate
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+@pytest.mark.parametrize("event_date, day", [
+    (datetime(2025, 2, 28, 18, 29), "2025-02-28"),
+    (datetime(2025, 2, 28, 18, 30), "2025-03-01"),
+    (datetime(2025, 3, 1, 0, 0, tzinfo=IST), "2025-03-01"),
+    (datetime(2025, 2, 28, 23, 59, tzinfo=IST), "2025-02-28"),
+    (datetime(2025, 2, 28, 20, 0, tzinfo=timezone.utc), "2025-03-01"),
+    (datetime(2025, 2, 28, 12, 0, tzinfo=timezone(timedelta(hours=-8))), "2025-03-01"),
+])
+def test_event_day_is_the_india_calendar_day(event_date, day):
+    assert event_day(event_date) == day
+
+
+def test_naive_and_aware_values_of_one_instant_share_a_day():
+    aware = datetime(2025, 3, 1, 1, 0, tzinfo=IST)
+    stored = aware.astimezone(timezone.utc).replace(tzinfo=None)
+    assert event_day(aware) == event_day(stored) == "2025-03-01"
+
+
+async def _venue(db) -> str:
+    venue = await db.create_venue(VenueCreate(
+        name="Golden Palace Banquet",
+        location="Bandlaguda Jagir",
+        pincode="500005",
+        coordinates=Coordinates(lat=17.359, lng=78.476),
+        price=55000.0,
+        capacity=800,
+        images=[],
+        amenities=[],
+        description="",
+        contact=ContactInfo(phone="+91 9876543212", email="golden.palace@example.com")
+    ))
+    return venue.id
+
+
+def _booking(venue_id: str, event_date: datetime, user_id: str = "user-1") -> BookingCreate:
+    return BookingCreate(user_id=user_id, venue_id=venue_id, event_date=event_date)
+
+
+# The same India day, 1 March 2025, expressed in two time zones
+MORNING_IST = datetime(2025, 3, 1, 10, 0, tzinfo=IST)
+EVENING_BEFORE_UTC = datetime(2025, 2, 28, 20, 0, tzinfo=timezone.utc)
+
+
+def test_second_booking_for_the_same_day_conflicts(db):
+    async def check():
+        venue_id = await _venue(db)
+        await db.create_booking(_booking(venue_id, MORNING_IST))
+        with pytest.raises(BookingConflictError):
+            await db.create_booking(_booking(venue_id, EVENING_BEFORE_UTC, user_id="user-2"))
+        await db.create_booking(_booking(venue_id, MORNING_IST + timedelta(days=1), user_id="user-2"))
+        assert await db.bookings.count_documents({}) == 2
+    asyncio.run(check())
+
+
+def test_cancel_releases_the_day(db):
+    async def check():
+        venue_id = await _venue(db)
+        first = await db.create_booking(_booking(venue_id, MORNING_IST))
+        cancelled = await db.update_booking_status(first.id, BookingStatus.CANCELLED)
+        assert cancelled.status == BookingStatus.CANCELLED
+        assert await db.venue_reservations.count_documents({}) == 0
+        second = await db.create_booking(_booking(venue_id, EVENING_BEFORE_UTC, user_id="user-2"))
+        reservation = await db.venue_reservations.find_one({"venue_id": venue_id})
+        assert (reservation["event_day"], reservation["booking_id"]) == ("2025-03-01", second.id)
+    asyncio.run(check())
+
+
+def test_reactivation_reclaims_a_free_day(db):
+    async def check():
+        venue_id = await _venue(db)
+        booking = await db.create_booking(_booking(venue_id, MORNING_IST))
+        await db.update_booking_status(booking.id, BookingStatus.CANCELLED)
+        confirmed = await db.update_booking_status(booking.id, BookingStatus.CONFIRMED)
+        assert confirmed.status == BookingStatus.CONFIRMED
+        reservation = await db.venue_reservations.find_one({"booking_id": booking.id})
+        assert reservation["event_day"] == "2025-03-01"
+    asyncio.run(check())
+
+
+def test_reactivation_fails_once_the_day_is_taken(db):
+    async def check():
+        venue_id = await _venue(db)
+        first = await db.create_booking(_booking(venue_id, MORNING_IST))
+        await db.update_booking_status(first.id, BookingStatus.CANCELLED)
+        await db.create_booking(_booking(venue_id, EVENING_BEFORE_UTC, user_id="user-2"))
+        with pytest.raises(BookingConflictError):
+            await db.update_booking_status(first.id, BookingStatus.CONFIRMED)
+        stored = await db.get_booking(first.id)
+        assert stored.status == BookingStatus.CANCELLED
+    asyncio.run(check())
+
+
+def test_backfill_claims_only_bookings_without_a_reservation(db):
+    async def check():
+        venue_id = await _venue(db)
+        await db.create_booking(_booking(venue_id, MORNING_IST))
+        # Written by an older worker that did not claim days
+        legacy = (await db.create_booking(_booking(venue_id, MORNING_IST + timedelta(days=1)))).dict()
+        await db.venue_reservations.delete_one({"booking_id": legacy["id"]})
+        double = {**legacy, "id": "double-booked", "created_at": legacy["created_at"] + timedelta(seconds=1)}
+        await db.bookings.insert_one(double)
+        await db.bookings.insert_one({
+            **legacy, "id": "cancelled", "status": BookingStatus.CANCELLED,
+            "event_date": MORNING_IST + timedelta(days=2)
+        })
+
+        assert await db.backfill_venue_reservations() == {"claimed": 1, "conflicts": 1}
+        reservation = await db.venue_reservations.find_one({"event_day": "2025-03-02"})
+        assert reservation["booking_id"] == legacy["id"]
+        assert await db.venue_reservations.count_documents({}) == 2
+        assert await db.backfill_venue_reservations() == {"claimed": 0, "conflicts": 1}
+    asyncio.run(check())
@@ -0,0 +1,71 @@
+import pytest
+
+from faq_index import DEFAULT_AUTO_REPLY_CONFIDENCE, FAQIndex, faq_tokens
+from models import FAQ
+
+FAQS = [
+    FAQ(question="How do I book a function hall?", answer="Browse the map, select a hall, choose your date and services, and pay online.", category="booking", order=1),
+    FAQ(question="Can I cancel my booking?", answer="Yes. Full refund 7 days prior, 50% refund for 3-7 days, and no refund within 3 days of the event.", category="booking", order=2),
+    FAQ(question="Is parking available at the venues?", answer="Most halls offer free parking; the venue page lists parking and valet under amenities.", category="venues", order=3),
+    FAQ(question="What payment methods do you accept?", answer="We accept UPI, credit cards, debit cards and net banking.", category="payment", order=4),
+]
+
+
+@pytest.fixture
+def index():
+    index = FAQIndex()
+    index.build(FAQS)
+    return index
+
+
+def test_stopwords_are_dropped():
+    assert faq_tokens("How do I book a hall?") == ["book", "hall"]
+
+
+def test_single_term_matches_its_faq_with_high_confidence(index):
+    [(faq, score, confidence)] = index.search("parking")
+    assert faq.order == 3
+    assert score > 0
+    assert confidence >= DEFAULT_AUTO_REPLY_CONFIDENCE
+    assert index.best_answer("parking").order == 3
+
+
+def test_results_are_ranked_by_score(index):
+    matches = index.search("cancel booking refund")
+    assert matches[0][0].order == 2
+    scores = [score for _, score, _ in matches]
+    assert scores == sorted(scores, reverse=True)
+    assert index.best_answer("cancel booking refund").order == 2
+
+
+@pytest.mark.parametrize("query", ["how do i", "what is the", ""])
+def test_stopword_only_query_matches_nothing(index, query):
+    assert index.search(query) == []
+    assert index.best_answer(query) is None
+
+
+def test_query_without_known_terms_matches_nothing(index):
+    assert index.search("weather forecast") == []
+
+
+def test_unknown_terms_lower_confidence_below_the_bar(index):
+    [(faq, _, confidence)] = index.search("parking helicopter spaceship lunar")
+    assert faq.order == 3
+    assert confidence < DEFAULT_AUTO_REPLY_CONFIDENCE
+    assert index.best_answer("parking helicopter spaceship lunar") is None
+
+
+def test_min_confidence_is_the_bar(index):
+    [(_, _, confidence)] = index.search("refund on cancellation")
+    assert index.best_answer("refund on cancellation", min_confidence=confidence).order == 2
+    assert index.best_answer("refund on cancellation", min_confidence=confidence + 0.01) is None
+
+
+def test_added_faq_is_searchable(index):
+    index.add(FAQ(question="Do you provide decorators?", answer="Decoration partners are listed under services.", category="services", order=5))
+    assert len(index) == 5
+    assert index.best_answer("decorators").order == 5
+
+
+def test_empty_index_matches_nothing():
+    assert FAQIndex().search("parking") == []
@@ -0,0 +1,142 @@
+import asyncio
+
+import pytest
+
+from guest_io import import_guests, iter_csv_records, iter_lines, normalize_phone
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+def _lines(*chunks: bytes):
+    async def collect():
+        return [line async for line in iter_lines(_chunks(*chunks))]
+    return asyncio.run(collect())
+
+
+def _records(*chunks: bytes):
+    async def collect():
+        return [record async for record in iter_csv_records(iter_lines(_chunks(*chunks)))]
+    return asyncio.run(collect())
+
+
+def test_lines_split_across_chunks():
+    assert _lines(b"name,rel", b"ation\nAsha,Fri", b"end\n") == ["name,relation", "Asha,Friend"]
+
+
+def test_lines_keep_a_utf8_character_split_between_chunks():
+    encoded = "Zoë\nŚri\n".encode()
+    split = encoded.index("ë".encode()) + 1
+    assert _lines(encoded[:split], encoded[split:]) == ["Zoë", "Śri"]
+
+
+def test_lines_strip_crlf_and_bom():
+    assert _lines(b"\xef\xbb\xbfname,relation\r\nAsha,Friend\r\n") == ["name,relation", "Asha,Friend"]
+
+
+def test_bom_split_across_chunks():
+    assert _lines(b"\xef\xbb", b"\xbfname\n") == ["name"]
+
+
+def test_last_line_without_newline():
+    assert _lines(b"a\nb") == ["a", "b"]
+
+
+def test_header_is_lowercased_and_values_stripped():
+    assert _records(b"Name , Relation\n Asha , Friend \n") == [(1, {"name": "Asha", "relation": "Friend"})]
+
+
+def test_quoted_field_spanning_lines():
+    body = b'name,relation,address\nAsha,Friend,"12 Main Road\r\nBanjara Hills"\nRavi,Family,\n'
+    assert _records(body) == [
+        (1, {"name": "Asha", "relation": "Friend", "address": "12 Main Road\nBanjara Hills"}),
+        (2, {"name": "Ravi", "relation": "Family", "address": ""}),
+    ]
+
+
+def test_quoted_field_spanning_chunks():
+    body = b'name,relation,address\nAsha,Friend,"Flat 4,\nJubilee Hills"\n'
+    split = body.index(b"Jubilee")
+    assert _records(body[:split], body[split:]) == [
+        (1, {"name": "Asha", "relation": "Friend", "address": "Flat 4,\nJubilee Hills"}),
+    ]
+
+
+def test_doubled_quotes_are_escapes():
+    body = b'name,relation\n"Asha ""Ammu"" Rao",Friend\n"Line ""one""\nand two",Family\n'
+    assert _records(body) == [
+        (1, {"name": 'Asha "Ammu" Rao', "relation": "Friend"}),
+        (2, {"name": 'Line "one"\nand two', "relation": "Family"}),
+    ]
+
+
+def test_blank_lines_are_skipped():
+    assert _records(b"name,relation\n\nAsha,Friend\n\r\n") == [(1, {"name": "Asha", "relation": "Friend"})]
+
+
+def test_unterminated_quote_is_reported():
+    records = _records(b'name,relation\nAsha,"Friend\n')
+    assert len(records) == 1
+    row_number, error = records[0]
+    assert row_number == 1
+    assert isinstance(error, ValueError)
+
+
+@pytest.mark.parametrize("phone, key", [
+    ("+91 98765 43210", "9876543210"),
+    ("098765-43210", "9876543210"),
+    ("9876543210", "9876543210"),
+    ("", None),
+    ("n/a", None),
+])
+def test_normalize_phone(phone, key):
+    assert normalize_phone(phone) == key
+
+
+class FakeGuestDB:
+    def __init__(self, phones):
+        self.phones = phones
+        self.batches = []
+
+    async def get_guest_phones(self, user_id):
+        return self.phones
+
+    async def apply_guest_import_batch(self, user_id, new_guests, updates):
+        self.batches.append((list(new_guests), list(updates)))
+
+
+def _import(db, body: bytes, chunk_size: int = 500):
+    return asyncio.run(import_guests(db, "user-1", _chunks(body), "csv", chunk_size=chunk_size))
+
+
+def test_import_dedupes_phones_within_the_upload_and_against_the_list():
+    db = FakeGuestDB([{"id": "guest-1", "phone": "+91 98765 43210"}])
+    body = (
+        b"name,relation,phone\n"
+        b"Asha,Friend,9876543210\n"
+        b"Ravi,Family,+91 91234 56789\n"
+        b"Ravi again,Family,0912 345 6789\n"
+        b"No phone,Colleague,\n"
+    )
+    report = _import(db, body)
+    assert (report.received, report.imported, report.updated, report.duplicates) == (4, 2, 1, 1)
+    [(new_guests, updates)] = db.batches
+    assert [guest.name for guest in new_guests] == ["Ravi", "No phone"]
+    assert [(guest_id, guest.name) for guest_id, guest in updates] == [("guest-1", "Asha")]
+
+
+def test_import_reports_invalid_rows_and_flushes_in_chunks():
+    db = FakeGuestDB([])
+    body = b"name,relation,invited\nAsha,Friend,yes\n,Family,no\nRavi,Family,0\nMeena,Friend,x\n"
+    report = _import(db, body, chunk_size=2)
+    assert (report.received, report.imported, report.error_count) == (4, 3, 1)
+    assert report.errors[0].row == 2
+    assert [len(new_guests) for new_guests, _ in db.batches] == [2, 1]
+    assert [guest.invited for new_guests, _ in db.batches for guest in new_guests] == [True, False, True]
+
+
+def test_import_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        asyncio.run(import_guests(FakeGuestDB([]), "user-1", _chunks(b""), "xlsx"))
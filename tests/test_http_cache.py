@@ -0,0 +1,88 @@
+from email.utils import formatdate
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from cache import CachedJSON
+from http_cache import CompressionMiddleware, is_not_modified
+
+ENTRY = CachedJSON(b'{"data":[]}', "abc123", 1_700_000_000)
+
+
+def _request(**headers: str) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+@pytest.mark.parametrize("header", [
+    'W/"abc123"',
+    '"abc123"',
+    '"other", W/"abc123"',
+    '  W/"zzz" ,"abc123"  ',
+    "*",
+])
+def test_if_none_match_matches_weakly(header):
+    assert is_not_modified(_request(if_none_match=header), ENTRY)
+
+
+@pytest.mark.parametrize("header", ['W/"abc124"', '"other", "more"', "abc123", ""])
+def test_if_none_match_mismatch(header):
+    assert not is_not_modified(_request(if_none_match=header), ENTRY)
+
+
+def test_if_modified_since_at_or_after_last_modified():
+    assert is_not_modified(_request(if_modified_since=formatdate(ENTRY.last_modified, usegmt=True)), ENTRY)
+    assert is_not_modified(_request(if_modified_since=formatdate(ENTRY.last_modified + 60, usegmt=True)), ENTRY)
+
+
+def test_if_modified_since_before_last_modified():
+    assert not is_not_modified(_request(if_modified_since=formatdate(ENTRY.last_modified - 1, usegmt=True)), ENTRY)
+
+
+@pytest.mark.parametrize("header", ["yesterday", "", "Mon, 99 Foo 2024 25:00:00 GMT"])
+def test_malformed_if_modified_since_is_ignored(header):
+    assert not is_not_modified(_request(if_modified_since=header), ENTRY)
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    current_date = formatdate(ENTRY.last_modified + 60, usegmt=True)
+    assert not is_not_modified(_request(if_none_match='"stale"', if_modified_since=current_date), ENTRY)
+
+
+def test_no_validators():
+    assert not is_not_modified(_request(), ENTRY)
+
+
+@pytest.fixture
+def compressed_client():
+    app = FastAPI()
+
+    @app.get("/text")
+    def text():
+        return PlainTextResponse("hallbook " * 500)
+
+    @app.get("/events")
+    def events():
+        async def stream():
+            yield b"retry: 3000\n\n"
+            yield b"id: 1\nevent: message\ndata: {}\n\n"
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    app.add_middleware(CompressionMiddleware)
+    return TestClient(app)
+
+
+def test_large_bodies_are_gzipped(compressed_client):
+    response = compressed_client.get("/text", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == "hallbook " * 500
+
+
+@pytest.mark.parametrize("accept", ["*/*", "text/event-stream"])
+def test_event_streams_are_never_gzipped(compressed_client, accept):
+    response = compressed_client.get("/events", headers={"Accept-Encoding": "gzip", "Accept": accept})
+    assert "content-encoding" not in response.headers
+    assert response.text == "retry: 3000\n\nid: 1\nevent: message\ndata: {}\n\n"
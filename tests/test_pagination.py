@@ -0,0 +1,67 @@
+from datetime import datetime
+
+import pytest
+
+from pagination import ASCENDING, DESCENDING, decode_cursor, encode_cursor, keyset_filter, next_cursor, sort_spec
+
+
+def test_cursor_round_trip_keeps_value_and_id():
+    cursor = encode_cursor("price", ASCENDING, 25000.0, "venue-1")
+    assert decode_cursor(cursor, "price", ASCENDING) == {"value": 25000.0, "id": "venue-1"}
+
+
+def test_cursor_round_trip_keeps_datetimes():
+    created = datetime(2025, 3, 1, 18, 30, 15, 123000)
+    cursor = encode_cursor("created_at", DESCENDING, created, "booking-1")
+    position = decode_cursor(cursor, "created_at", DESCENDING)
+    assert position["value"] == created
+    assert isinstance(position["value"], datetime)
+
+
+def test_cursor_is_url_safe_without_padding():
+    cursor = encode_cursor("name", ASCENDING, "Sri Lakshmi Convention ??>>", "id/with+chars")
+    assert "=" not in cursor
+    assert "+" not in cursor and "/" not in cursor
+
+
+@pytest.mark.parametrize("field, direction", [("capacity", ASCENDING), ("price", DESCENDING)])
+def test_cursor_for_another_sort_is_rejected(field, direction):
+    cursor = encode_cursor("price", ASCENDING, 1000, "venue-1")
+    with pytest.raises(ValueError, match="does not match"):
+        decode_cursor(cursor, field, direction)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "eyJmIjoicHJpY2UifQ", "!!!"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor, "price", ASCENDING)
+
+
+def test_keyset_filter_ascending():
+    assert keyset_filter("price", ASCENDING, 500, "b") == {
+        "$or": [{"price": {"$gt": 500}}, {"price": 500, "id": {"$gt": "b"}}]
+    }
+
+
+def test_keyset_filter_descending():
+    assert keyset_filter("seq", DESCENDING, 7, "m") == {
+        "$or": [{"seq": {"$lt": 7}}, {"seq": 7, "id": {"$lt": "m"}}]
+    }
+
+
+def test_sort_spec_breaks_ties_on_id():
+    assert list(sort_spec("created_at", DESCENDING).items()) == [("created_at", DESCENDING), ("id", DESCENDING)]
+
+
+def test_next_cursor_trims_look_ahead_row():
+    rows = [{"id": str(n), "price": n * 100} for n in range(4)]
+    cursor = next_cursor(rows, 3, "price", ASCENDING)
+    assert [row["id"] for row in rows] == ["0", "1", "2"]
+    assert decode_cursor(cursor, "price", ASCENDING) == {"value": 200, "id": "2"}
+
+
+@pytest.mark.parametrize("count", [0, 2, 3])
+def test_next_cursor_is_none_on_last_page(count):
+    rows = [{"id": str(n), "price": n} for n in range(count)]
+    assert next_cursor(rows, 3, "price", ASCENDING) is None
+    assert len(rows) == count
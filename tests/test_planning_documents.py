@@ -0,0 +1,137 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pymongo.errors import DuplicateKeyError
+
+from database import VersionConflictError
+from models import WeddingBudget
+from routes import wedding_tools
+
+
+def _budget(total: float, user_id: str = "user-1") -> WeddingBudget:
+    return WeddingBudget(user_id=user_id, total_budget=total, categories=[])
+
+
+async def _stored(db, user_id: str = "user-1"):
+    docs = await db.wedding_budgets.find({"user_id": user_id}, {"_id": 0}).to_list(length=None)
+    assert len(docs) == 1
+    return docs[0]
+
+
+@pytest.mark.parametrize("expected_version", [0, None])
+def test_first_save_creates_version_1(db, expected_version):
+    async def check():
+        saved = await db.create_or_update_wedding_budget(_budget(1000), expected_version=expected_version)
+        assert (saved.version, saved.total_budget) == (1, 1000)
+        assert (await _stored(db))["version"] == 1
+    asyncio.run(check())
+
+
+def test_save_at_the_current_version_bumps_it(db):
+    async def check():
+        first = await db.create_or_update_wedding_budget(_budget(1000), expected_version=0)
+        await db._upsert_user_document(db.wedding_budgets, _budget(2000), expected_version=1)
+        stored = await _stored(db)
+        assert (stored["version"], stored["total_budget"], stored["id"]) == (2, 2000, first.id)
+    asyncio.run(check())
+
+
+@pytest.mark.parametrize("stale_version", [0, 1, 5])
+def test_stale_version_conflicts_and_changes_nothing(db, stale_version):
+    async def check():
+        await db.create_or_update_wedding_budget(_budget(1000))
+        await db.create_or_update_wedding_budget(_budget(2000))
+        with pytest.raises(VersionConflictError):
+            await db.create_or_update_wedding_budget(_budget(3000), expected_version=stale_version)
+        stored = await _stored(db)
+        assert (stored["version"], stored["total_budget"]) == (2, 2000)
+    asyncio.run(check())
+
+
+def test_without_a_version_last_write_wins(db):
+    async def check():
+        await db.create_or_update_wedding_budget(_budget(1000))
+        saved = await db.create_or_update_wedding_budget(_budget(2000))
+        assert (saved.version, saved.total_budget) == (2, 2000)
+    asyncio.run(check())
+
+
+def test_document_saved_before_versioning_matches_version_0(db):
+    async def check():
+        await db.wedding_budgets.insert_one({"id": "legacy", "user_id": "user-1", "total_budget": 500, "categories": []})
+        await db._upsert_user_document(db.wedding_budgets, _budget(600), expected_version=0)
+        stored = await _stored(db)
+        assert (stored["id"], stored["version"], stored["total_budget"]) == ("legacy", 1, 600)
+        with pytest.raises(VersionConflictError):
+            await db.create_or_update_wedding_budget(_budget(700), expected_version=0)
+    asyncio.run(check())
+
+
+def _racing_first_save(db, monkeypatch, races: int):
+    """Make the first `races` upserts lose the insert race to another request"""
+    upsert = db._update_and_return
+    calls = []
+
+    async def update_and_return(*args, **kwargs):
+        calls.append(args[1])
+        if len(calls) <= races:
+            raise DuplicateKeyError("E11000 duplicate key error")
+        return await upsert(*args, **kwargs)
+
+    monkeypatch.setattr(db, "_update_and_return", update_and_return)
+    return calls
+
+
+def test_unversioned_save_retries_after_losing_the_insert_race(db, monkeypatch):
+    calls = _racing_first_save(db, monkeypatch, races=1)
+    saved = asyncio.run(db.create_or_update_wedding_budget(_budget(1000)))
+    assert saved.total_budget == 1000
+    assert calls == [{"user_id": "user-1"}, {"user_id": "user-1"}]
+
+
+def test_unversioned_save_gives_up_after_one_retry(db, monkeypatch):
+    calls = _racing_first_save(db, monkeypatch, races=2)
+    with pytest.raises(VersionConflictError):
+        asyncio.run(db.create_or_update_wedding_budget(_budget(1000)))
+    assert len(calls) == 2
+
+
+def test_versioned_save_does_not_retry_a_duplicate_key(db, monkeypatch):
+    calls = _racing_first_save(db, monkeypatch, races=1)
+    with pytest.raises(VersionConflictError):
+        asyncio.run(db.create_or_update_wedding_budget(_budget(1000), expected_version=0))
+    assert len(calls) == 1
+
+
+def test_stale_version_is_a_409(db):
+    app = FastAPI()
+    app.include_router(wedding_tools.router)
+    app.state.db = db
+    client = TestClient(app)
+    body = {"total_budget": 1000, "categories": [], "user_id": "user-1"}
+
+    assert client.put("/wedding-tools/budget/user-1", json={**body, "version": 0}).status_code == 200
+    assert client.put("/wedding-tools/budget/user-1", json=body).status_code == 200
+    response = client.put("/wedding-tools/budget/user-1", json={**body, "version": 1})
+    assert response.status_code == 409
+
+
+def test_archive_keeps_the_newest_document_per_user(db):
+    async def check():
+        await db.wedding_budgets.drop_indexes()
+        await db.wedding_budgets.insert_many([
+            {**_budget(1000).dict(), "id": "old", "updated_at": datetime(2025, 1, 1)},
+            {**_budget(2000).dict(), "id": "new", "updated_at": datetime(2025, 2, 1)},
+            {**_budget(3000, user_id="user-2").dict(), "id": "only"},
+        ])
+        assert await db.archive_duplicate_user_documents() == {"wedding_budgets": 1}
+        assert sorted([doc["id"] async for doc in db.wedding_budgets.find()]) == ["new", "only"]
+        archived = await db.db.wedding_budgets_duplicates.find().to_list(length=None)
+        assert [doc["id"] for doc in archived] == ["old"]
+        assert "archived_at" in archived[0]
+        assert await db.archive_duplicate_user_documents() == {}
+        assert not await db.ensure_indexes()
+    asyncio.run(check())
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from database import venue_document
+from models import ContactInfo, Coordinates, Venue, VenueFilters
+from search import build_search_fields, query_terms, search_filter
+
+
+def test_search_fields_hold_prefixes_and_whole_tokens():
+    fields = build_search_fields("Café Royal", "Banjara Hills")
+    assert {"ca", "caf", "cafe", "ro", "royal", "ba", "banjara", "hi", "hills"} <= set(fields["search_terms"])
+    assert fields["search_name"] == ["cafe", "royal"]
+    assert fields["search_location"] == ["banjara", "hills"]
+
+
+def test_query_terms_drop_single_characters_and_repeats():
+    assert query_terms("Royal a ROYAL 5 pa") == ["royal", "pa"]
+
+
+@pytest.mark.parametrize("search_query", ["a", "5", "a b 7", "!!", "  "])
+def test_query_without_usable_terms_has_none(search_query):
+    assert query_terms(search_query) == []
+
+
+def test_search_filter_requires_every_term():
+    assert search_filter(["royal"]) == {"search_terms": "royal"}
+    assert search_filter(["royal", "pa"]) == {"search_terms": {"$all": ["royal", "pa"]}}
+
+
+def test_search_filter_without_terms_matches_nothing():
+    assert search_filter([]) == {"search_terms": {"$in": []}}
+
+
+def _venue(name: str) -> dict:
+    return venue_document(Venue(
+        name=name,
+        location="Banjara Hills",
+        pincode="500034",
+        coordinates=Coordinates(lat=17.41, lng=78.44),
+        price=50000.0,
+        capacity=500,
+        description="",
+        contact=ContactInfo(phone="+91 9876543210", email="hall@example.com")
+    ))
+
+
+@pytest.mark.parametrize("search_query, names", [
+    (None, ["Royal Palace", "Sri Convention"]),
+    ("roy", ["Royal Palace"]),
+    ("a", []),
+    ("5", []),
+])
+def test_venue_listing_search(db, search_query, names):
+    async def check():
+        await db.venues.insert_many([_venue("Royal Palace"), _venue("Sri Convention")])
+        venues, total, _ = await db.get_venues_page(VenueFilters(search_query=search_query), sort_by="name")
+        assert [venue.name for venue in venues] == names
+        assert total == len(names)
+    asyncio.run(check())
@@ -0,0 +1,105 @@
+import logging
+import re
+from datetime import datetime
+
+import orjson
+import pytest
+
+from slow_queries import SlowQueryLog, query_shape, redact
+
+# Values a logged shape must never contain
+SECRETS = ["Asha Rao", "9876543210", "asha@example.com", "$ecret", "17.4123", "424242", "2025-03-01"]
+
+
+def _leaks(shape) -> list:
+    text = orjson.dumps(shape).decode()
+    return [secret for secret in SECRETS if secret in text]
+
+
+def test_scalars_are_redacted():
+    assert redact({
+        "name": "Asha Rao", "phone": "9876543210", "capacity": 424242, "price": 17.4123,
+        "confirmed": True, "deleted_at": None, "event_date": datetime(2025, 3, 1),
+        "search_name": re.compile("^asha"),
+    }) == {
+        "name": "?", "phone": "?", "capacity": "?", "price": "?",
+        "confirmed": "?", "deleted_at": "?", "event_date": "?", "search_name": "?",
+    }
+
+
+def test_operators_and_nested_documents_keep_their_structure():
+    assert redact({
+        "$or": [{"price": {"$gt": 424242}}, {"price": 424242, "id": {"$gt": "venue-1"}}],
+        "coordinates": {"lat": 17.4123, "lng": 78.4},
+        "search_terms": {"$all": ["asha", "rao"]},
+    }) == {
+        "$or": [{"price": {"$gt": "?"}}, {"price": "?", "id": {"$gt": "?"}}],
+        "coordinates": {"lat": "?", "lng": "?"},
+        "search_terms": {"$all": "?"},
+    }
+
+
+def test_dollar_strings_are_literals_in_queries():
+    assert redact({"email": "$ecret", "name": {"$in": ["$ecret"]}}) == {"email": "?", "name": {"$in": "?"}}
+
+
+def test_field_paths_are_kept_only_in_expressions():
+    pipeline = [
+        {"$match": {"user_id": "$ecret", "$expr": {"$eq": "$owner_id"}}},
+        {"$project": {"total": "$total_amount", "note": {"$literal": "$ecret"}}},
+    ]
+    assert redact(pipeline, expressions=True) == [
+        {"$match": {"user_id": "?", "$expr": {"$eq": "$owner_id"}}},
+        {"$project": {"total": "$total_amount", "note": {"$literal": "?"}}},
+    ]
+
+
+@pytest.mark.parametrize("command_name, command", [
+    ("find", {"find": "users", "filter": {"email": "asha@example.com", "phone": "9876543210"}, "sort": {"created_at": -1}}),
+    ("aggregate", {"aggregate": "venues", "pipeline": [
+        {"$geoNear": {"near": {"type": "Point", "coordinates": [78.4, 17.4123]}, "distanceField": "distance"}},
+        {"$match": {"search_terms": {"$all": ["Asha Rao"]}, "capacity": {"$gte": 424242}}},
+        {"$addFields": {"label": {"$concat": ["$name", "Asha Rao"]}}},
+    ]}),
+    ("count", {"count": "bookings", "query": {"event_date": {"$gte": datetime(2025, 3, 1)}}}),
+    ("distinct", {"distinct": "support_messages", "key": "ticket_id", "query": {"user_id": "$ecret"}}),
+    ("findAndModify", {
+        "findAndModify": "guest_lists",
+        "query": {"user_id": "9876543210", "version": 424242},
+        "update": {"$set": {"guests": [{"name": "Asha Rao", "phone": "9876543210"}], "note": "$ecret"}},
+    }),
+    ("findAndModify", {
+        "findAndModify": "support_tickets",
+        "query": {"id": "asha@example.com"},
+        "update": [{"$set": {"last_seq": {"$add": ["$last_seq", 424242]}, "note": {"$literal": "$ecret"}}}],
+    }),
+    ("update", {"update": "venues", "updates": [{"q": {"name": "Asha Rao"}, "u": {"$set": {"price": 424242}}}]}),
+    ("delete", {"delete": "venue_reservations", "deletes": [{"q": {"booking_id": "9876543210"}, "limit": 1}]}),
+])
+def test_query_shapes_contain_no_literals(command_name, command):
+    shape = query_shape(command_name, command)
+    assert shape
+    assert _leaks(shape) == []
+
+
+def test_shape_keeps_what_identifies_the_query():
+    shape = query_shape("find", {"find": "users", "filter": {"email": "asha@example.com"}, "sort": {"created_at": -1}})
+    assert shape == {"filter": {"email": "?"}, "sort": ["created_at"]}
+    shape = query_shape("aggregate", {"aggregate": "venues", "pipeline": [{"$project": {"total": "$price"}}]})
+    assert shape == {"pipeline": [{"$project": {"total": "$price"}}]}
+
+
+def test_logged_and_reported_slow_queries_contain_no_literals(caplog):
+    log = SlowQueryLog(threshold_ms=1)
+    command = {"find": "users", "filter": {"email": "asha@example.com", "name": "Asha Rao"}, "limit": 424242}
+    with caplog.at_level(logging.WARNING, logger="slow_queries"):
+        log.record("get_user", "find", "hallbook", command, 250.0)
+        log.record("get_user", "find", "hallbook", {**command, "filter": {"email": "x@example.com", "name": "Ravi"}}, 150.0)
+    log.close()
+
+    assert caplog.records
+    assert [secret for secret in SECRETS if secret in caplog.text] == []
+    report = log.report()
+    [row] = report["shapes"]
+    assert row["count"] == 2
+    assert _leaks(row["shape"]) == []